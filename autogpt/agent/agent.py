@@ -3,6 +3,7 @@ import signal
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 from colorama import Fore, Style
 
@@ -10,10 +11,10 @@ from autogpt.config import Config
 from autogpt.config.ai_config import AIConfig
 from autogpt.json_utils.utilities import extract_json_from_response, validate_json
 from autogpt.llm.chat import chat_with_ai
+from autogpt.llm.prompt_cache import PromptCache
 from autogpt.llm.providers.openai import OPEN_AI_CHAT_MODELS
 from autogpt.llm.utils import count_string_tokens
 from autogpt.logs import (
-    FULL_MESSAGE_HISTORY_FILE_NAME,
     NEXT_ACTION_FILE_NAME,
     USER_INPUT_FILE_NAME,
     LogCycleHandler,
@@ -21,6 +22,8 @@ from autogpt.logs import (
     print_assistant_thoughts,
     remove_ansi_escape,
 )
+from autogpt.logs.memory_tracker import MemoryTracker
+from autogpt.logs.tracing import tracer
 from autogpt.memory.message_history import MessageHistory
 from autogpt.memory.vector import VectorMemory
 from autogpt.models.command_registry import CommandRegistry
@@ -78,11 +81,13 @@ class Agent:
         self.config = config
         self.ai_config = ai_config
         self.system_prompt = system_prompt
+        self.prompt_cache = PromptCache()
         self.triggering_prompt = triggering_prompt
         self.workspace = Workspace(workspace_directory, config.restrict_to_workspace)
         self.created_at = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.cycle_count = 0
         self.log_cycle_handler = LogCycleHandler()
+        self.memory_tracker: Optional[MemoryTracker] = None
         self.smart_token_limit = OPEN_AI_CHAT_MODELS.get(config.smart_llm).max_tokens
 
     def start_interaction_loop(self):
@@ -109,16 +114,22 @@ class Agent:
 
         signal.signal(signal.SIGINT, signal_handler)
 
+        cycle_span = None
         while True:
+            if cycle_span:
+                cycle_span.end()
+            if self.memory_tracker:
+                # Report on the cycle that just ended, 0 being the startup
+                self.memory_tracker.on_cycle(self.cycle_count, self)
             # Discontinue if continuous limit is reached
             self.cycle_count += 1
+            cycle_span = tracer.span("agent.cycle", cycle=self.cycle_count).start()
             self.log_cycle_handler.log_count_within_cycle = 0
-            self.log_cycle_handler.log_cycle(
+            self.log_cycle_handler.log_message_history(
                 self.ai_config.ai_name,
                 self.created_at,
                 self.cycle_count,
-                [m.raw() for m in self.history],
-                FULL_MESSAGE_HISTORY_FILE_NAME,
+                self.history.messages,
             )
             if (
                 self.config.continuous_mode
@@ -151,10 +162,10 @@ class Agent:
                 logger.error(f"Exception while validating assistant reply JSON: {e}")
                 assistant_reply_json = {}
 
-            for plugin in self.config.plugins:
-                if not plugin.can_handle_post_planning():
-                    continue
-                assistant_reply_json = plugin.post_planning(assistant_reply_json)
+            plugin_hooks = self.config.plugin_hooks
+            for plugin in plugin_hooks.handlers("post_planning"):
+                with plugin_hooks.run("post_planning", plugin):
+                    assistant_reply_json = plugin.post_planning(assistant_reply_json)
 
             # Print Assistant thoughts
             if assistant_reply_json != {}:
@@ -261,18 +272,19 @@ class Agent:
                     f"{Fore.CYAN}AUTHORISED COMMANDS LEFT: {Style.RESET_ALL}{self.next_action_count}"
                 )
 
+            cycle_span.set_attribute("command", command_name)
+
             # Execute command
             if command_name is not None and command_name.lower().startswith("error"):
                 result = f"Could not execute command: {arguments}"
             elif command_name == "human_feedback":
                 result = f"Human feedback: {user_input}"
             else:
-                for plugin in self.config.plugins:
-                    if not plugin.can_handle_pre_command():
-                        continue
-                    command_name, arguments = plugin.pre_command(
-                        command_name, arguments
-                    )
+                for plugin in plugin_hooks.handlers("pre_command"):
+                    with plugin_hooks.run("pre_command", plugin):
+                        command_name, arguments = plugin.pre_command(
+                            command_name, arguments
+                        )
                 command_result = execute_command(
                     command_name=command_name,
                     arguments=arguments,
@@ -290,10 +302,9 @@ class Agent:
                     result = f"Failure: command {command_name} returned too much output. \
                         Do not execute this command again with the same arguments."
 
-                for plugin in self.config.plugins:
-                    if not plugin.can_handle_post_command():
-                        continue
-                    result = plugin.post_command(command_name, result)
+                for plugin in plugin_hooks.handlers("post_command"):
+                    with plugin_hooks.run("post_command", plugin):
+                        result = plugin.post_command(command_name, result)
                 if self.next_action_count > 0:
                     self.next_action_count -= 1
 
@@ -307,3 +318,6 @@ class Agent:
                 logger.typewriter_log(
                     "SYSTEM: ", Fore.YELLOW, "Unable to execute command"
                 )
+
+        if cycle_span:
+            cycle_span.end()
@@ -5,6 +5,7 @@ from typing import Dict
 from autogpt.agent.agent import Agent
 from autogpt.config import Config
 from autogpt.llm import ChatModelResponse
+from autogpt.logs.tracing import tracer
 
 
 def is_valid_int(value: str) -> bool:
@@ -78,6 +79,7 @@ def extract_command(
         return "Error:", str(e)
 
 
+@tracer.traced("execute_command")
 def execute_command(
     command_name: str,
     arguments: dict[str, str],
@@ -93,6 +95,7 @@ def execute_command(
     Returns:
         str: The result of the command
     """
+    tracer.current_span().set_attribute("command", command_name)
     try:
         # Execute a native command with the same name or alias, if it exists
         if command := agent.command_registry.get_command(command_name):
@@ -83,6 +83,25 @@ import click
     multiple=True,
     help="AI goal override; may be used multiple times to pass multiple goals",
 )
+@click.option(
+    "--trace",
+    "trace_file",
+    type=click.Path(dir_okay=False),
+    help="Record tracing spans and write them to this file on exit, as Chrome trace"
+    " events, or as JSON lines if the file name ends with .jsonl",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Sample the agent's stack to profile its CPU time per cycle, phase and"
+    " command; results are written to the logs directory on exit",
+)
+@click.option(
+    "--track-memory",
+    is_flag=True,
+    help="Report memory growth per cycle using tracemalloc, and warn about large"
+    " growth; reports are written to the logs directory on exit",
+)
 @click.pass_context
 def main(
     ctx: click.Context,
@@ -104,6 +123,9 @@ def main(
     ai_name: Optional[str],
     ai_role: Optional[str],
     ai_goal: tuple[str],
+    trace_file: Optional[str],
+    profile: bool,
+    track_memory: bool,
 ) -> None:
     """
     Welcome to AutoGPT an experimental open-source application showcasing the capabilities of the GPT-4 pushing the boundaries of AI.
@@ -133,6 +155,9 @@ def main(
             ai_name,
             ai_role,
             ai_goal,
+            trace_file,
+            profile,
+            track_memory,
         )
 
 
@@ -3,20 +3,38 @@ import os
 import subprocess
 from pathlib import Path
 
-import docker
-from docker.errors import DockerException, ImageNotFound
-from docker.models.containers import Container as DockerContainer
+from docker.errors import DockerException
 
 from autogpt.agent.agent import Agent
 from autogpt.command_decorator import command
 from autogpt.config import Config
 from autogpt.logs import logger
+from autogpt.models.command import ConfigPredicate
+from autogpt.processing.text import truncate_text
 
 from .decorators import sanitize_path_arg
+from .execute_code_utils import (
+    PROCESS_TIMEOUT,
+    SANDBOX_OUTPUT_LIMIT,
+    SANDBOX_TIMEOUT,
+    get_sandbox_pool,
+    run_process,
+)
 
 ALLOWLIST_CONTROL = "allowlist"
 DENYLIST_CONTROL = "denylist"
 
+# The part of the agent's context that a command's output may take up
+OUTPUT_CONTEXT_FRACTION = 0.25
+
+
+def truncate_output(
+    output: str, agent: Agent, fraction: float = OUTPUT_CONTEXT_FRACTION
+) -> str:
+    """Truncate command output to fit in a fraction of the agent's context"""
+    max_tokens = int(agent.smart_token_limit * fraction)
+    return truncate_text(output, agent.config.smart_llm, max_tokens)
+
 
 @command(
     "execute_python_code",
@@ -106,66 +124,28 @@ def execute_python_file(filename: str, agent: Agent) -> str:
         logger.debug(
             f"Auto-GPT is running in a Docker container; executing {file_path} directly..."
         )
-        result = subprocess.run(
+        result = run_process(
             ["python", str(file_path)],
-            capture_output=True,
-            encoding="utf8",
             cwd=agent.config.workspace_path,
+            timeout=SANDBOX_TIMEOUT,
         )
+        if result.timed_out:
+            return f"Error: Execution timed out after {SANDBOX_TIMEOUT} seconds"
         if result.returncode == 0:
-            return result.stdout
+            return truncate_output(result.stdout, agent)
         else:
-            return f"Error: {result.stderr}"
+            return f"Error: {truncate_output(result.stderr, agent)}"
 
     logger.debug("Auto-GPT is not running in a Docker container")
     try:
-        client = docker.from_env()
-        # You can replace this with the desired Python image/version
-        # You can find available Python images on Docker Hub:
-        # https://hub.docker.com/_/python
-        image_name = "python:3-alpine"
-        try:
-            client.images.get(image_name)
-            logger.debug(f"Image '{image_name}' found locally")
-        except ImageNotFound:
-            logger.info(
-                f"Image '{image_name}' not found locally, pulling from Docker Hub..."
-            )
-            # Use the low-level API to stream the pull response
-            low_level_client = docker.APIClient()
-            for line in low_level_client.pull(image_name, stream=True, decode=True):
-                # Print the status and progress, if available
-                status = line.get("status")
-                progress = line.get("progress")
-                if status and progress:
-                    logger.info(f"{status}: {progress}")
-                elif status:
-                    logger.info(status)
-
-        logger.debug(f"Running {file_path} in a {image_name} container...")
-        container: DockerContainer = client.containers.run(
-            image_name,
+        pool = get_sandbox_pool(agent.config.workspace_path)
+        logger.debug(f"Running {file_path} in a {pool.image} container...")
+        result = pool.run(
             ["python", str(file_path.relative_to(agent.workspace.root))],
-            volumes={
-                agent.config.workspace_path: {
-                    "bind": "/workspace",
-                    "mode": "ro",
-                }
-            },
-            working_dir="/workspace",
-            stderr=True,
-            stdout=True,
-            detach=True,
-        )  # type: ignore
-
-        container.wait()
-        logs = container.logs().decode("utf-8")
-        container.remove()
-
-        # print(f"Execution complete. Output: {output}")
-        # print(f"Logs: {logs}")
-
-        return logs
+            timeout=SANDBOX_TIMEOUT,
+            output_limit=SANDBOX_OUTPUT_LIMIT,
+        )
+        return truncate_output(str(result), agent)
 
     except DockerException as e:
         logger.warn(
@@ -208,7 +188,7 @@ def validate_command(command: str, config: Config) -> bool:
             "required": True,
         }
     },
-    enabled=lambda config: config.execute_local_commands,
+    enabled=ConfigPredicate("execute_local_commands"),
     disabled_reason="You are not allowed to run local shell commands. To execute"
     " shell commands, EXECUTE_LOCAL_COMMANDS must be set to 'True' "
     "in your config file: .env - do not attempt to bypass the restriction.",
@@ -226,21 +206,22 @@ def execute_shell(command_line: str, agent: Agent) -> str:
         logger.info(f"Command '{command_line}' not allowed")
         return "Error: This Shell Command is not allowed."
 
-    current_dir = Path.cwd()
-    # Change dir into workspace if necessary
-    if not current_dir.is_relative_to(agent.config.workspace_path):
-        os.chdir(agent.config.workspace_path)
-
     logger.info(
-        f"Executing command '{command_line}' in working directory '{os.getcwd()}'"
+        f"Executing command '{command_line}' in working directory '{agent.config.workspace_path}'"
     )
 
-    result = subprocess.run(command_line, capture_output=True, shell=True)
-    output = f"STDOUT:\n{result.stdout}\nSTDERR:\n{result.stderr}"
-
-    # Change back to whatever the prior working dir was
-
-    os.chdir(current_dir)
+    result = run_process(
+        command_line,
+        cwd=agent.config.workspace_path,
+        timeout=PROCESS_TIMEOUT,
+        shell=True,
+    )
+    # Leave room for both streams in the agent's context
+    stdout = truncate_output(result.stdout, agent, fraction=OUTPUT_CONTEXT_FRACTION / 2)
+    stderr = truncate_output(result.stderr, agent, fraction=OUTPUT_CONTEXT_FRACTION / 2)
+    output = f"STDOUT:\n{stdout}\nSTDERR:\n{stderr}"
+    if result.timed_out:
+        output += f"\nThe command timed out after {PROCESS_TIMEOUT} seconds"
     return output
 
 
@@ -254,7 +235,7 @@ def execute_shell(command_line: str, agent: Agent) -> str:
             "required": True,
         }
     },
-    lambda config: config.execute_local_commands,
+    ConfigPredicate("execute_local_commands"),
     "You are not allowed to run local shell commands. To execute"
     " shell commands, EXECUTE_LOCAL_COMMANDS must be set to 'True' "
     "in your config. Do not attempt to bypass the restriction.",
@@ -273,24 +254,19 @@ def execute_shell_popen(command_line, agent: Agent) -> str:
         logger.info(f"Command '{command_line}' not allowed")
         return "Error: This Shell Command is not allowed."
 
-    current_dir = os.getcwd()
-    # Change dir into workspace if necessary
-    if agent.config.workspace_path not in current_dir:
-        os.chdir(agent.config.workspace_path)
-
     logger.info(
-        f"Executing command '{command_line}' in working directory '{os.getcwd()}'"
+        f"Executing command '{command_line}' in working directory '{agent.config.workspace_path}'"
     )
 
     do_not_show_output = subprocess.DEVNULL
     process = subprocess.Popen(
-        command_line, shell=True, stdout=do_not_show_output, stderr=do_not_show_output
+        command_line,
+        shell=True,
+        stdout=do_not_show_output,
+        stderr=do_not_show_output,
+        cwd=agent.config.workspace_path,
     )
 
-    # Change back to whatever the prior working dir was
-
-    os.chdir(current_dir)
-
     return f"Subprocess started with PID:'{str(process.pid)}'"
 
 
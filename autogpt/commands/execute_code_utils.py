@@ -0,0 +1,406 @@
+"""Execution engines for code and shell commands: local processes with bounded
+output capture, and a pool of warm Docker containers"""
+from __future__ import annotations
+
+import atexit
+import os
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import docker
+from docker.errors import ImageNotFound
+
+from autogpt.logs import logger
+
+# You can replace this with the desired Python image/version
+# You can find available Python images on Docker Hub:
+# https://hub.docker.com/_/python
+SANDBOX_IMAGE = "python:3-alpine"
+SANDBOX_POOL_SIZE = 2
+SANDBOX_MAX_RUNS = 25
+SANDBOX_TIMEOUT = 120
+SANDBOX_OUTPUT_LIMIT = 64 * 1024
+SANDBOX_WORKDIR = "/workspace"
+
+PROCESS_TIMEOUT = 300
+PROCESS_CAPTURE_HEAD = 32 * 1024
+PROCESS_CAPTURE_TAIL = 32 * 1024
+PROCESS_READ_SIZE = 64 * 1024
+
+
+class HeadTailBuffer:
+    """Output buffer that keeps only the first and last bytes written to it"""
+
+    def __init__(
+        self,
+        head_size: int = PROCESS_CAPTURE_HEAD,
+        tail_size: int = PROCESS_CAPTURE_TAIL,
+    ):
+        self.head_size = head_size
+        self.tail_size = tail_size
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def write(self, data: bytes) -> None:
+        with self._lock:
+            self.total += len(data)
+            if len(self.head) < self.head_size:
+                n = self.head_size - len(self.head)
+                self.head += data[:n]
+                data = data[n:]
+            if data:
+                self.tail += data
+                if len(self.tail) > self.tail_size:
+                    del self.tail[: len(self.tail) - self.tail_size]
+
+    @property
+    def omitted(self) -> int:
+        return self.total - len(self.head) - len(self.tail)
+
+    def getvalue(self) -> str:
+        with self._lock:
+            head, tail, omitted = bytes(self.head), bytes(self.tail), self.omitted
+        if omitted:
+            return (
+                head.decode("utf-8", errors="replace")
+                + f"\n... [{omitted} bytes omitted] ...\n"
+                + tail.decode("utf-8", errors="replace")
+            )
+        return (head + tail).decode("utf-8", errors="replace")
+
+
+@dataclass
+class ProcessResult:
+    returncode: Optional[int]
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+
+
+def _pump(stream, buffer: HeadTailBuffer) -> None:
+    with stream:
+        while chunk := stream.read1(PROCESS_READ_SIZE):
+            buffer.write(chunk)
+
+
+def _kill(process: subprocess.Popen) -> None:
+    try:
+        if os.name == "posix":
+            # Also kill any children, e.g. of a shell
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_process(
+    args: str | list[str],
+    cwd: str | os.PathLike,
+    timeout: float = PROCESS_TIMEOUT,
+    shell: bool = False,
+    head_size: int = PROCESS_CAPTURE_HEAD,
+    tail_size: int = PROCESS_CAPTURE_TAIL,
+) -> ProcessResult:
+    """Run a process in a given working directory, with a wall-clock timeout.
+
+    Its output is streamed into buffers that keep only the start and end of it,
+    so a command that produces lots of output can't exhaust memory.
+
+    Args:
+        args: The command to run
+        cwd: The working directory to run the command in
+        timeout: The number of seconds after which the process is killed
+        shell: Whether to run the command through the shell
+        head_size: The number of bytes to keep from the start of each output stream
+        tail_size: The number of bytes to keep from the end of each output stream
+
+    Returns:
+        ProcessResult: The exit code and (truncated) output of the process
+    """
+    process = subprocess.Popen(
+        args,
+        cwd=cwd,
+        shell=shell,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=os.name == "posix",
+    )
+    stdout, stderr = HeadTailBuffer(head_size, tail_size), HeadTailBuffer(
+        head_size, tail_size
+    )
+    readers = [
+        threading.Thread(target=_pump, args=(process.stdout, stdout), daemon=True),
+        threading.Thread(target=_pump, args=(process.stderr, stderr), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    timed_out = False
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        _kill(process)
+        process.wait()
+    finally:
+        for reader in readers:
+            # Don't wait forever on orphaned processes that keep the pipes open
+            reader.join(timeout=1)
+
+    return ProcessResult(
+        None if timed_out else process.returncode,
+        stdout.getvalue(),
+        stderr.getvalue(),
+        timed_out,
+    )
+
+
+@dataclass
+class ExecutionResult:
+    output: str
+    exit_code: Optional[int]
+    timed_out: bool = False
+    truncated: bool = False
+
+    def __str__(self) -> str:
+        output = self.output
+        if self.truncated:
+            output += "\n[Output truncated]"
+        if self.timed_out:
+            output += "\n[Execution timed out]"
+        return output
+
+
+def ensure_image(client: docker.DockerClient, image_name: str) -> None:
+    """Pull a Docker image if it isn't available locally"""
+    try:
+        client.images.get(image_name)
+        logger.debug(f"Image '{image_name}' found locally")
+    except ImageNotFound:
+        logger.info(
+            f"Image '{image_name}' not found locally, pulling from Docker Hub..."
+        )
+        # Use the low-level API to stream the pull response
+        for line in client.api.pull(image_name, stream=True, decode=True):
+            # Print the status and progress, if available
+            status = line.get("status")
+            progress = line.get("progress")
+            if status and progress:
+                logger.info(f"{status}: {progress}")
+            elif status:
+                logger.info(status)
+
+
+class SandboxContainer:
+    """A long-running container that executes commands via `docker exec`"""
+
+    def __init__(self, client: docker.DockerClient, container):
+        self.client = client
+        self.container = container
+        self.runs = 0
+        self.healthy = True
+
+    def exec(
+        self,
+        command: list[str],
+        timeout: float = SANDBOX_TIMEOUT,
+        output_limit: int = SANDBOX_OUTPUT_LIMIT,
+    ) -> ExecutionResult:
+        """Execute a command in the container.
+
+        The command is killed when it runs longer than `timeout` seconds, and output
+        beyond `output_limit` bytes is discarded. When the output limit is hit,
+        the command may still be running, so the container must not be reused.
+        """
+        self.runs += 1
+        exec_id = self.client.api.exec_create(
+            self.container.id,
+            ["timeout", "-s", "KILL", str(int(timeout)), *command],
+            workdir=SANDBOX_WORKDIR,
+        )["Id"]
+
+        started_at = time.monotonic()
+        output = bytearray()
+        truncated = False
+        for chunk in self.client.api.exec_start(exec_id, stream=True):
+            output += chunk
+            if len(output) > output_limit:
+                del output[output_limit:]
+                truncated = True
+                self.healthy = False
+                break
+        elapsed = time.monotonic() - started_at
+
+        exit_code = (
+            None if truncated else self.client.api.exec_inspect(exec_id)["ExitCode"]
+        )
+        timed_out = not truncated and elapsed >= timeout
+        if timed_out:
+            self.healthy = False
+        return ExecutionResult(
+            output.decode("utf-8", errors="replace"), exit_code, timed_out, truncated
+        )
+
+    def remove(self) -> None:
+        try:
+            self.container.remove(force=True)
+        except Exception as e:
+            logger.warn(f"Could not remove sandbox container: {e}")
+
+
+class SandboxPool:
+    """Pool of pre-started sandbox containers with the workspace mounted read-only.
+
+    Containers are recycled after `max_runs` executions, or as soon as an execution
+    leaves them in an unknown state, e.g. after a timeout. Replacements are started
+    in the background, so that executions don't have to wait for a container.
+    """
+
+    def __init__(
+        self,
+        workspace_path: str,
+        client: Optional[docker.DockerClient] = None,
+        image: str = SANDBOX_IMAGE,
+        size: int = SANDBOX_POOL_SIZE,
+        max_runs: int = SANDBOX_MAX_RUNS,
+    ):
+        self.workspace_path = workspace_path
+        self.image = image
+        self.size = size
+        self.max_runs = max_runs
+        self._client = client
+        self._idle: list[SandboxContainer] = []
+        self._n_busy = 0
+        self._lock = threading.Lock()
+        self._starter = ThreadPoolExecutor(1, thread_name_prefix="sandbox-starter")
+        self._image_checked = False
+        self._closed = False
+
+    @property
+    def client(self) -> docker.DockerClient:
+        if self._client is None:
+            self._client = docker.from_env()
+        return self._client
+
+    def warm_up(self) -> Optional[Future]:
+        """Start containers in the background until the pool is full"""
+        with self._lock:
+            if self._closed:
+                return None
+            return self._starter.submit(self._fill)
+
+    def run(
+        self,
+        command: list[str],
+        timeout: float = SANDBOX_TIMEOUT,
+        output_limit: int = SANDBOX_OUTPUT_LIMIT,
+    ) -> ExecutionResult:
+        """Execute a command in one of the pool's containers"""
+        sandbox = self._acquire()
+        try:
+            return sandbox.exec(command, timeout, output_limit)
+        except Exception:
+            sandbox.healthy = False
+            raise
+        finally:
+            self._release(sandbox)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        self._starter.shutdown(wait=True, cancel_futures=True)
+        for sandbox in idle:
+            sandbox.remove()
+
+    def _start_container(self) -> SandboxContainer:
+        if not self._image_checked:
+            ensure_image(self.client, self.image)
+            self._image_checked = True
+
+        logger.debug(f"Starting {self.image} sandbox container...")
+        container = self.client.containers.run(
+            self.image,
+            ["sleep", "infinity"],
+            volumes={
+                self.workspace_path: {
+                    "bind": SANDBOX_WORKDIR,
+                    "mode": "ro",
+                }
+            },
+            working_dir=SANDBOX_WORKDIR,
+            detach=True,
+        )  # type: ignore
+        return SandboxContainer(self.client, container)
+
+    def _fill(self) -> None:
+        while True:
+            with self._lock:
+                if self._closed or len(self._idle) + self._n_busy >= self.size:
+                    return
+            sandbox = self._start_container()
+            with self._lock:
+                if not self._closed:
+                    self._idle.append(sandbox)
+                    continue
+            sandbox.remove()
+            return
+
+    def _acquire(self) -> SandboxContainer:
+        with self._lock:
+            sandbox = self._idle.pop() if self._idle else None
+            self._n_busy += 1
+        if sandbox is None:
+            try:
+                sandbox = self._start_container()
+            except Exception:
+                with self._lock:
+                    self._n_busy -= 1
+                raise
+        self.warm_up()
+        return sandbox
+
+    def _release(self, sandbox: SandboxContainer) -> None:
+        with self._lock:
+            self._n_busy -= 1
+            if (
+                sandbox.healthy
+                and sandbox.runs < self.max_runs
+                and not self._closed
+                and len(self._idle) + self._n_busy < self.size
+            ):
+                self._idle.append(sandbox)
+                return
+        logger.debug(f"Recycling sandbox container after {sandbox.runs} runs")
+        sandbox.remove()
+        self.warm_up()
+
+
+_pools: dict[str, SandboxPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_sandbox_pool(workspace_path: str) -> SandboxPool:
+    """Get the shared sandbox pool for a workspace"""
+    with _pools_lock:
+        if workspace_path not in _pools:
+            _pools[workspace_path] = SandboxPool(workspace_path)
+        return _pools[workspace_path]
+
+
+@atexit.register
+def shutdown_sandbox_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
@@ -3,25 +3,87 @@ from __future__ import annotations
 
 import contextlib
 import hashlib
+import json
 import os
 import os.path
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Generator, Literal
+from typing import Generator, Literal, Optional
 
 from autogpt.agent.agent import Agent
 from autogpt.command_decorator import command
+from autogpt.config import Config
 from autogpt.logs import logger
 from autogpt.memory.vector import MemoryItem, VectorMemory
 
 from .decorators import sanitize_path_arg
-from .file_operations_utils import read_textual_file
+from .file_operations_utils import (
+    directory_index,
+    list_directory,
+    read_textual_file,
+    read_textual_file_segments,
+)
 
 Operation = Literal["write", "append", "delete"]
 
+SNAPSHOT_INTERVAL = 100
+SNAPSHOT_DIGEST_WINDOW = 1024
+# Characters read at a time when hashing a file
+HASH_CHUNK_SIZE = 1024 * 1024
+
+FILE_KNOWLEDGE_CACHE_SIZE = 256
+LIST_FILES_PAGE_SIZE = 200
+
+
+def text_hasher(text: str = "") -> hashlib._Hash:
+    """Get a hash object for the given text, which more text can be fed into.
+
+    `text_hasher(a).update(b)` has the same digest as `text_hasher(a + b)`, so the
+    checksum of a file with appended text can be computed from the hash state of
+    its previous contents, without reading the file again.
+    """
+    return hashlib.md5(text.encode("utf-8"))
+
 
 def text_checksum(text: str) -> str:
     """Get the hex checksum for the given text."""
-    return hashlib.md5(text.encode("utf-8")).hexdigest()
+    return text_hasher(text).hexdigest()
+
+
+def file_hasher(file_path: str | Path) -> hashlib._Hash:
+    """Get a hash object for a file's contents, as text_hasher would create it.
+    The file is read in chunks, so it doesn't have to fit in memory at once."""
+    hasher = text_hasher()
+    with open(file_path, "r", encoding="utf-8") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            hasher.update(chunk.encode("utf-8"))
+    return hasher
+
+
+def file_checksum(file_path: str | Path) -> str:
+    """Get the checksum of a file's contents, as text_checksum would calculate it"""
+    return file_hasher(file_path).hexdigest()
+
+
+def parse_log_line(line: str) -> tuple[Operation, str, str | None] | None:
+    """Parse a line of the file operations log into an (operation, path, checksum)
+    tuple, or return None if the line does not contain an operation."""
+    line = line.replace("File Operation Logger", "").strip()
+    if not line:
+        return None
+    operation, tail = line.split(": ", maxsplit=1)
+    operation = operation.strip()
+    if operation in ("write", "append"):
+        try:
+            path, checksum = (x.strip() for x in tail.rsplit(" #", maxsplit=1))
+        except ValueError:
+            logger.warn(f"File log entry lacks checksum: '{line}'")
+            path, checksum = tail.strip(), None
+        return (operation, path, checksum)
+    elif operation == "delete":
+        return (operation, tail.strip(), None)
+    return None
 
 
 def operations_from_log(
@@ -34,20 +96,8 @@ def operations_from_log(
         return
 
     for line in log:
-        line = line.replace("File Operation Logger", "").strip()
-        if not line:
-            continue
-        operation, tail = line.split(": ", maxsplit=1)
-        operation = operation.strip()
-        if operation in ("write", "append"):
-            try:
-                path, checksum = (x.strip() for x in tail.rsplit(" #", maxsplit=1))
-            except ValueError:
-                logger.warn(f"File log entry lacks checksum: '{line}'")
-                path, checksum = tail.strip(), None
-            yield (operation, path, checksum)
-        elif operation == "delete":
-            yield (operation, tail.strip(), None)
+        if entry := parse_log_line(line):
+            yield entry
 
     log.close()
 
@@ -75,6 +125,292 @@ def file_operations_state(log_path: str) -> dict[str, str]:
     return state
 
 
+class FileOperationsIndex:
+    """In-memory index of the file state according to the file operations log.
+
+    The index is built from the log once, after which every refresh only replays
+    the part of the log that was appended since the previous refresh. Every
+    `snapshot_interval` replayed operations, the state is snapshotted next to the
+    log, so a fresh index only has to replay the tail of the log after the snapshot.
+    """
+
+    def __init__(
+        self, log_path: str | Path, snapshot_interval: int = SNAPSHOT_INTERVAL
+    ):
+        self.log_path = Path(log_path)
+        self.snapshot_path = self.log_path.with_name(f".{self.log_path.name}.snapshot")
+        self.snapshot_interval = snapshot_interval
+
+        self._state: dict[str, str | None] = {}
+        self._file_stats: dict[str, tuple[int, int]] = {}
+        # Hash states of the logged contents, to extend when text is appended.
+        # They can't be serialized, so they are not part of the snapshot.
+        self._hashers: dict[str, hashlib._Hash] = {}
+        self._offset = 0
+        self._ops_since_snapshot = 0
+        self._lock = threading.RLock()
+
+        self._load_snapshot()
+        self.refresh()
+
+    @property
+    def state(self) -> dict[str, str | None]:
+        """A mapping of file paths to their expected checksums. Do not modify."""
+        self.refresh()
+        return self._state
+
+    def refresh(self) -> None:
+        """Replay any operations that were appended to the log since the last refresh"""
+        with self._lock:
+            log_size = self._log_size()
+            if log_size < self._offset:
+                logger.debug(f"{self.log_path} was truncated; rebuilding index")
+                self._reset()
+            if log_size == self._offset:
+                return
+
+            with self.log_path.open("rb") as log:
+                log.seek(self._offset)
+                tail = log.read()
+
+            # Only consume complete lines; the last one may still be in progress
+            end = tail.rfind(b"\n") + 1
+            for line in tail[:end].decode("utf-8").splitlines():
+                if entry := parse_log_line(line):
+                    self._apply(*entry)
+                    self._ops_since_snapshot += 1
+            self._offset += end
+
+            if self._ops_since_snapshot >= self.snapshot_interval:
+                self.save_snapshot()
+
+    def record_file_stat(
+        self,
+        path: str,
+        file_path: str | Path,
+        hasher: Optional[hashlib._Hash] = None,
+    ) -> None:
+        """Remember the size and mtime of a file right after its checksum was logged,
+        so verified_checksum can later tell whether it was modified since.
+
+        Args:
+            path: The path of the file as it appears in the log
+            file_path: The actual path of the file
+            hasher: The hash state of the logged contents, see verified_hasher
+        """
+        stat = os.stat(file_path)
+        with self._lock:
+            self._file_stats[path] = (stat.st_size, stat.st_mtime_ns)
+            if hasher is not None:
+                self._hashers[path] = hasher.copy()
+            else:
+                self._hashers.pop(path, None)
+
+    def verified_hasher(
+        self, path: str, file_path: str | Path
+    ) -> Optional[hashlib._Hash]:
+        """Get a copy of the hash state of a file's logged contents, if the file was
+        not modified since logging, or None otherwise."""
+        if self.verified_checksum(path, file_path) is None:
+            return None
+        with self._lock:
+            hasher = self._hashers.get(path)
+            return hasher.copy() if hasher is not None else None
+
+    def verified_checksum(self, path: str, file_path: str | Path) -> str | None:
+        """Get the logged checksum of a file if it was not modified since logging.
+
+        Args:
+            path: The path of the file as it appears in the log
+            file_path: The actual path of the file
+
+        Returns:
+            The checksum, or None if it is unknown or the file has changed since.
+        """
+        with self._lock:
+            self.refresh()
+            checksum = self._state.get(path)
+            logged_stat = self._file_stats.get(path)
+        if checksum is None or logged_stat is None:
+            return None
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        if (stat.st_size, stat.st_mtime_ns) != logged_stat:
+            return None
+        return checksum
+
+    def save_snapshot(self) -> None:
+        """Write the current state and log offset to the snapshot file"""
+        with self._lock:
+            snapshot = {
+                "offset": self._offset,
+                "log_digest": self._log_digest(self._offset),
+                "state": self._state,
+                "file_stats": self._file_stats,
+            }
+            tmp_path = self.snapshot_path.with_suffix(".tmp")
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.snapshot_path)
+            self._ops_since_snapshot = 0
+
+    def _load_snapshot(self) -> None:
+        try:
+            with self.snapshot_path.open("r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            offset = snapshot["offset"]
+            state = snapshot["state"]
+        except FileNotFoundError:
+            return
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warn(f"Ignoring invalid file operations snapshot: {e}")
+            return
+
+        # The snapshot is only usable if the log it was taken from is still intact
+        if offset > self._log_size() or snapshot.get("log_digest") != self._log_digest(
+            offset
+        ):
+            logger.debug(f"{self.snapshot_path} is out of date; ignoring it")
+            return
+
+        self._state = state
+        self._file_stats = {
+            path: tuple(stat) for path, stat in snapshot.get("file_stats", {}).items()
+        }
+        self._offset = offset
+        logger.debug(f"Loaded file operations snapshot at offset {offset}")
+
+    def _apply(self, operation: Operation, path: str, checksum: str | None) -> None:
+        self._file_stats.pop(path, None)
+        self._hashers.pop(path, None)
+        if operation in ("write", "append"):
+            self._state[path] = checksum
+        elif operation == "delete":
+            self._state.pop(path, None)
+
+    def _reset(self) -> None:
+        self._state = {}
+        self._file_stats = {}
+        self._hashers = {}
+        self._offset = 0
+        self._ops_since_snapshot = 0
+
+    def _log_size(self) -> int:
+        try:
+            return self.log_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _log_digest(self, offset: int) -> str:
+        """Hash of the log bytes right before `offset`, to detect a replaced log"""
+        start = max(0, offset - SNAPSHOT_DIGEST_WINDOW)
+        try:
+            with self.log_path.open("rb") as log:
+                log.seek(start)
+                return hashlib.md5(log.read(offset - start)).hexdigest()
+        except FileNotFoundError:
+            return hashlib.md5().hexdigest()
+
+
+_file_operations_indexes: dict[str, FileOperationsIndex] = {}
+
+
+def get_file_operations_index(log_path: str | Path) -> FileOperationsIndex:
+    """Get the (cached) FileOperationsIndex for the given file operations log"""
+    key = os.path.abspath(log_path)
+    if key not in _file_operations_indexes:
+        _file_operations_indexes[key] = FileOperationsIndex(key)
+    return _file_operations_indexes[key]
+
+
+class FileKnowledgeCache:
+    """Cache of the MemoryItems that read_file creates from workspace files.
+
+    Entries are keyed by resolved path and validated against the size and mtime of
+    the file, so a repeated read of an unchanged file only costs a stat call. If only
+    the file's metadata has changed, an entry is still reused if the content hash
+    matches. The write, append and delete commands invalidate affected entries.
+    """
+
+    def __init__(self, max_entries: int = FILE_KNOWLEDGE_CACHE_SIZE):
+        self.max_entries = max_entries
+        # resolved path -> (size, mtime_ns, content checksum, memory item)
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_path: str | Path) -> MemoryItem | None:
+        """Get the cached MemoryItem for a file if the file has not changed"""
+        key = self._key(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        size, mtime_ns, _, memory = entry
+        try:
+            stat = os.stat(key)
+        except FileNotFoundError:
+            self.invalidate(key)
+            return None
+        if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+            return None
+
+        with self._lock:
+            self._entries.move_to_end(key)
+        return memory
+
+    def get_for_content(self, file_path: str | Path, content: str) -> MemoryItem | None:
+        """Get the cached MemoryItem for a file if its content has not changed"""
+        key = self._key(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry[2] != text_checksum(content):
+            return None
+
+        memory = entry[3]
+        self.put(key, content, memory)
+        return memory
+
+    def put(self, file_path: str | Path, content: str, memory: MemoryItem) -> None:
+        key = self._key(file_path)
+        stat = os.stat(key)
+        with self._lock:
+            self._entries[key] = (
+                stat.st_size,
+                stat.st_mtime_ns,
+                text_checksum(content),
+                memory,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, file_path: str | Path) -> None:
+        with self._lock:
+            self._entries.pop(self._key(file_path), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _key(file_path: str | Path) -> str:
+        return str(Path(file_path).resolve())
+
+
+file_knowledge_cache = FileKnowledgeCache()
+
+
+def logged_path(filename: str | Path, agent: Agent) -> str:
+    """Get the path of a file as it appears in the operations log"""
+    # Make the filename into a relative path if possible
+    with contextlib.suppress(ValueError):
+        return str(Path(filename).relative_to(agent.workspace.root))
+    return str(filename)
+
+
 @sanitize_path_arg("filename")
 def is_duplicate_operation(
     operation: Operation, filename: str, agent: Agent, checksum: str | None = None
@@ -90,11 +426,9 @@ def is_duplicate_operation(
     Returns:
         True if the operation has already been performed on the file
     """
-    # Make the filename into a relative path if possible
-    with contextlib.suppress(ValueError):
-        filename = str(Path(filename).relative_to(agent.workspace.root))
+    filename = logged_path(filename, agent)
 
-    state = file_operations_state(agent.config.file_logger_path)
+    state = get_file_operations_index(agent.config.file_logger_path).state
     if operation == "delete" and filename not in state:
         return True
     if operation == "write" and state.get(filename) == checksum:
@@ -113,9 +447,7 @@ def log_operation(
         filename: The name of the file the operation was performed on
         checksum: The checksum of the contents to be written
     """
-    # Make the filename into a relative path if possible
-    with contextlib.suppress(ValueError):
-        filename = str(Path(filename).relative_to(agent.workspace.root))
+    filename = logged_path(filename, agent)
 
     log_entry = f"{operation}: {filename}"
     if checksum is not None:
@@ -124,6 +456,7 @@ def log_operation(
     append_to_file(
         agent.config.file_logger_path, f"{log_entry}\n", agent, should_log=False
     )
+    get_file_operations_index(agent.config.file_logger_path).refresh()
 
 
 @command(
@@ -148,14 +481,18 @@ def read_file(filename: str, agent: Agent) -> str:
         str: The contents of the file
     """
     try:
-        content = read_textual_file(filename, logger)
+        file_memory = file_knowledge_cache.get(filename)
+        if file_memory is None:
+            content = read_textual_file(filename, logger)
+            file_memory = file_knowledge_cache.get_for_content(filename, content)
+            if file_memory is None:
+                file_memory = MemoryItem.from_text_file(content, filename, agent.config)
+                file_knowledge_cache.put(filename, content, file_memory)
 
-        # TODO: invalidate/update memory when file is edited
-        file_memory = MemoryItem.from_text_file(content, filename, agent.config)
         if len(file_memory.chunks) > 1:
             return file_memory.summary
 
-        return content
+        return file_memory.raw_content
     except Exception as e:
         return f"Error: {str(e)}"
 
@@ -163,21 +500,32 @@ def read_file(filename: str, agent: Agent) -> str:
 def ingest_file(
     filename: str,
     memory: VectorMemory,
+    config: Config,
+    max_length: Optional[int] = None,
+    overlap: int = 200,
 ) -> None:
     """
     Ingest a file by reading its content, splitting it into chunks with a specified
     maximum length and overlap, and adding the chunks to the memory storage.
 
+    The file is parsed and chunked as a stream, e.g. page by page for PDF files,
+    so the whole document never has to be tokenized in one go.
+
     Args:
         filename: The name of the file to ingest
         memory: An object with an add() method to store the chunks in memory
+        config: The config to use for summarization and embedding
+        max_length: The maximum length of each chunk, in tokens
+        overlap: The overlap between consecutive chunks, in tokens
     """
     try:
         logger.info(f"Ingesting file {filename}")
-        content = read_file(filename)
+        segments = read_textual_file_segments(filename, logger)
 
         # TODO: differentiate between different types of files
-        file_memory = MemoryItem.from_text_file(content, filename)
+        file_memory = MemoryItem.from_text_file_segments(
+            segments, filename, config, max_chunk_length=max_length, overlap=overlap
+        )
         logger.debug(f"Created memory: {file_memory.dump(True)}")
         memory.add(file_memory)
 
@@ -214,7 +562,8 @@ def write_to_file(filename: str, text: str, agent: Agent) -> str:
     Returns:
         str: A message indicating success or failure
     """
-    checksum = text_checksum(text)
+    hasher = text_hasher(text)
+    checksum = hasher.hexdigest()
     if is_duplicate_operation("write", filename, agent, checksum):
         return "Error: File has already been updated."
     try:
@@ -222,7 +571,12 @@ def write_to_file(filename: str, text: str, agent: Agent) -> str:
         os.makedirs(directory, exist_ok=True)
         with open(filename, "w", encoding="utf-8") as f:
             f.write(text)
+        file_knowledge_cache.invalidate(filename)
+        directory_index.invalidate(filename)
         log_operation("write", filename, agent, checksum)
+        get_file_operations_index(agent.config.file_logger_path).record_file_stat(
+            logged_path(filename, agent), filename, hasher
+        )
         return "File written to successfully."
     except Exception as err:
         return f"Error: {err}"
@@ -261,13 +615,26 @@ def append_to_file(
     try:
         directory = os.path.dirname(filename)
         os.makedirs(directory, exist_ok=True)
+
+        if should_log:
+            index = get_file_operations_index(agent.config.file_logger_path)
+            path = logged_path(filename, agent)
+            if not os.path.exists(filename):
+                hasher = text_hasher()
+            elif (hasher := index.verified_hasher(path, filename)) is None:
+                # The hash state is unknown (e.g. after a restart) or outdated, so
+                # hash the file once; later appends can extend the recorded state
+                hasher = file_hasher(filename)
+
         with open(filename, "a", encoding="utf-8") as f:
             f.write(text)
+        file_knowledge_cache.invalidate(filename)
+        directory_index.invalidate(filename)
 
         if should_log:
-            with open(filename, "r", encoding="utf-8") as f:
-                checksum = text_checksum(f.read())
-            log_operation("append", filename, agent, checksum=checksum)
+            hasher.update(text.encode("utf-8"))
+            log_operation("append", filename, agent, checksum=hasher.hexdigest())
+            index.record_file_stat(path, filename, hasher)
 
         return "Text appended successfully."
     except Exception as err:
@@ -299,6 +666,8 @@ def delete_file(filename: str, agent: Agent) -> str:
         return "Error: File has already been deleted."
     try:
         os.remove(filename)
+        file_knowledge_cache.invalidate(filename)
+        directory_index.invalidate(filename)
         log_operation("delete", filename, agent)
         return "File deleted successfully."
     except Exception as err:
@@ -313,28 +682,62 @@ def delete_file(filename: str, agent: Agent) -> str:
             "type": "string",
             "description": "The directory to list files in",
             "required": True,
-        }
+        },
+        "pattern": {
+            "type": "string",
+            "description": "Only list files matching this glob pattern, e.g. '*.py'",
+            "required": False,
+        },
+        "max_depth": {
+            "type": "integer",
+            "description": "How many levels of subdirectories to list",
+            "required": False,
+        },
+        "cursor": {
+            "type": "string",
+            "description": "The cursor given by a previous call, to list more files",
+            "required": False,
+        },
     },
 )
 @sanitize_path_arg("directory")
-def list_files(directory: str, agent: Agent) -> list[str]:
+def list_files(
+    directory: str,
+    agent: Agent,
+    pattern: str | None = None,
+    max_depth: int | None = None,
+    cursor: str | None = None,
+    page_size: int = LIST_FILES_PAGE_SIZE,
+) -> list[str]:
     """lists files in a directory recursively
 
+    Files and directories that are hidden or excluded by a .gitignore are skipped.
+
     Args:
         directory (str): The directory to search in
+        pattern (str, optional): A glob pattern that listed files must match
+        max_depth (int, optional): How many levels of subdirectories to list
+        cursor (str, optional): The cursor to continue a previous listing from
+        page_size (int): The maximum number of files to list at once
 
     Returns:
-        list[str]: A list of files found in the directory
+        list[str]: A list of files found in the directory, followed by a note with
+            a cursor if there are more files to list
     """
-    found_files = []
-
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.startswith("."):
-                continue
-            relative_path = os.path.relpath(
-                os.path.join(root, file), agent.config.workspace_path
-            )
-            found_files.append(relative_path)
+    listing = list_directory(
+        directory,
+        relative_to=agent.config.workspace_path,
+        pattern=pattern or None,
+        max_depth=int(max_depth) if max_depth is not None else None,
+        cursor=cursor or None,
+        limit=page_size,
+        index=directory_index,
+    )
 
+    found_files = listing.files
+    if listing.next_cursor:
+        found_files.append(
+            f"(Listed the first {len(found_files)} files. To list more, use "
+            f"list_files with cursor '{listing.next_cursor}')"
+        )
     return found_files
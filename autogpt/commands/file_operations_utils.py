@@ -1,5 +1,16 @@
+from __future__ import annotations
+
+import codecs
+import fnmatch
 import json
 import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
 
 import charset_normalizer
 import docx
@@ -14,36 +25,140 @@ from autogpt.logs import logger
 
 
 class ParserStrategy:
+    """Strategy for extracting the text from a file.
+
+    Implementations override `read`, or `read_segments` if the format can be
+    parsed incrementally, e.g. page by page.
+    """
+
     def read(self, file_path: str) -> str:
-        raise NotImplementedError
+        if type(self).read_segments is ParserStrategy.read_segments:
+            raise NotImplementedError(
+                f"{type(self).__name__} must override read or read_segments"
+            )
+        return "".join(self.read_segments(file_path))
+
+    def read_segments(self, file_path: str) -> Iterator[str]:
+        """Yield the text of the file in consecutive segments, e.g. pages"""
+        yield self.read(file_path)
+
+
+CHARSET_SAMPLE_SIZE = 64 * 1024
+# How much of the (ASCII) text before the first non-UTF-8 byte goes in the sample
+CHARSET_SAMPLE_LEAD = 1024
+ENCODING_CACHE_SIZE = 4096
+
+# Longer BOMs first: the UTF-32 LE BOM starts with the UTF-16 LE BOM
+BYTE_ORDER_MARKS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+class EncodingCache:
+    """LRU cache of detected file encodings, keyed by (path, mtime, size)"""
+
+    def __init__(self, max_entries: int = ENCODING_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, int, int]) -> str | None:
+        with self._lock:
+            encoding = self._entries.get(key)
+            if encoding is not None:
+                self._entries.move_to_end(key)
+            return encoding
+
+    def put(self, key: tuple[str, int, int], encoding: str) -> None:
+        with self._lock:
+            self._entries[key] = encoding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+encoding_cache = EncodingCache()
+
+
+def decode_text(data: bytes) -> tuple[str, str]:
+    """Decode text of unknown encoding.
+
+    A byte order mark or valid UTF-8 is recognized without further analysis.
+    Only for other content, the encoding is detected with charset_normalizer,
+    which analyzes CHARSET_SAMPLE_SIZE bytes starting just before the first byte
+    that isn't valid UTF-8, so the sample holds the bytes that set the encoding
+    apart rather than a long ASCII prefix. If the whole text can't be decoded with
+    the detected encoding, the encoding is detected again on all of it.
+
+    Returns:
+        tuple[str, str]: The decoded text, and the encoding it was decoded from
+    """
+    for bom, encoding in BYTE_ORDER_MARKS:
+        if data.startswith(bom):
+            return data.decode(encoding, errors="replace"), encoding
+
+    try:
+        return data.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError as e:
+        sample_start = max(0, e.start - CHARSET_SAMPLE_LEAD)
+
+    sample = data[sample_start : sample_start + CHARSET_SAMPLE_SIZE]
+    if charset_match := charset_normalizer.from_bytes(sample).best():
+        try:
+            return data.decode(charset_match.encoding), charset_match.encoding
+        except UnicodeDecodeError:
+            logger.debug(
+                f"Text is not valid {charset_match.encoding} after the sample;"
+                " detecting its encoding on the whole text"
+            )
+
+    charset_match = charset_normalizer.from_bytes(data).best()
+    encoding = charset_match.encoding if charset_match else "utf-8"
+    return data.decode(encoding, errors="replace"), encoding
 
 
 # Basic text file reading
 class TXTParser(ParserStrategy):
     def read(self, file_path: str) -> str:
-        charset_match = charset_normalizer.from_path(file_path).best()
-        logger.debug(f"Reading '{file_path}' with encoding '{charset_match.encoding}'")
-        return str(charset_match)
+        with open(file_path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            data = f.read()
+
+        cache_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+        if encoding := encoding_cache.get(cache_key):
+            text = data.decode(encoding, errors="replace")
+        else:
+            text, encoding = decode_text(data)
+            encoding_cache.put(cache_key, encoding)
+        logger.debug(f"Reading '{file_path}' with encoding '{encoding}'")
+        return text
 
 
-# Reading text from binary file using pdf parser
+# Reading text from binary file using pdf parser, page by page
 class PDFParser(ParserStrategy):
-    def read(self, file_path: str) -> str:
+    def read_segments(self, file_path: str) -> Iterator[str]:
         parser = PyPDF2.PdfReader(file_path)
-        text = ""
-        for page_idx in range(len(parser.pages)):
-            text += parser.pages[page_idx].extract_text()
-        return text
+        for page in parser.pages:
+            yield page.extract_text()
 
 
-# Reading text from binary file using docs parser
+# Reading text from binary file using docs parser, paragraph by paragraph
 class DOCXParser(ParserStrategy):
-    def read(self, file_path: str) -> str:
+    def read_segments(self, file_path: str) -> Iterator[str]:
         doc_file = docx.Document(file_path)
-        text = ""
         for para in doc_file.paragraphs:
-            text += para.text
-        return text
+            yield para.text
 
 
 # Reading as dictionary and returning string format
@@ -109,6 +224,10 @@ class FileContext:
         self.logger.debug(f"Reading file {file_path} with parser {self.parser}")
         return self.parser.read(file_path)
 
+    def read_file_segments(self, file_path) -> Iterator[str]:
+        self.logger.debug(f"Streaming file {file_path} with parser {self.parser}")
+        return self.parser.read_segments(file_path)
+
 
 extension_to_parser = {
     ".txt": TXTParser(),
@@ -128,34 +247,273 @@ extension_to_parser = {
 }
 
 
+BINARY_SNIFF_LENGTH = 8192
+
+
 def is_file_binary_fn(file_path: str):
-    """Given a file path load all its content and checks if the null bytes is present
+    """Given a file path, check if a null byte is present at the start of the file
+
+    Like git, only the first BINARY_SNIFF_LENGTH bytes of the file are inspected.
 
     Args:
-        file_path (_type_): _description_
+        file_path (str): The path of the file to check
 
     Returns:
         bool: is_binary
     """
     with open(file_path, "rb") as f:
-        file_data = f.read()
+        file_data = f.read(BINARY_SNIFF_LENGTH)
     if b"\x00" in file_data:
         return True
     return False
 
 
-def read_textual_file(file_path: str, logger: logs.Logger) -> str:
+def get_parser(file_path: str) -> ParserStrategy:
     if not os.path.isfile(file_path):
         raise FileNotFoundError(
             f"read_file {file_path} failed: no such file or directory"
         )
-    is_binary = is_file_binary_fn(file_path)
     file_extension = os.path.splitext(file_path)[1].lower()
     parser = extension_to_parser.get(file_extension)
     if not parser:
-        if is_binary:
+        if is_file_binary_fn(file_path):
             raise ValueError(f"Unsupported binary file format: {file_extension}")
         # fallback to txt file parser (to support script and code files loading)
         parser = TXTParser()
-    file_context = FileContext(parser, logger)
+    return parser
+
+
+def read_textual_file(file_path: str, logger: logs.Logger) -> str:
+    file_context = FileContext(get_parser(file_path), logger)
     return file_context.read_file(file_path)
+
+
+def read_textual_file_segments(file_path: str, logger: logs.Logger) -> Iterator[str]:
+    """Read the text of a file as a stream of segments, e.g. pages of a PDF.
+
+    Unlike read_textual_file, this doesn't keep the whole text in memory at once.
+    """
+    file_context = FileContext(get_parser(file_path), logger)
+    return file_context.read_file_segments(file_path)
+
+
+DEFAULT_IGNORE_PATTERNS = [".*", "node_modules/", "__pycache__/"]
+IGNORE_FILE_NAME = ".gitignore"
+
+
+@dataclass
+class IgnoreRule:
+    """A single .gitignore-style exclusion rule"""
+
+    regex: re.Pattern
+    negate: bool
+    dir_only: bool
+
+    @staticmethod
+    def parse(pattern: str) -> IgnoreRule | None:
+        """Parse a line from a .gitignore-style file, or return None if it is empty"""
+        pattern = pattern.rstrip()
+        if not pattern or pattern.startswith("#"):
+            return None
+
+        negate = pattern.startswith("!")
+        if negate:
+            pattern = pattern[1:]
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        # Patterns containing a slash are relative to the ignore file's directory
+        anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+
+        regex = ""
+        i = 0
+        while i < len(pattern):
+            if pattern.startswith("**/", i):
+                regex += "(?:.*/)?"
+                i += 3
+            elif pattern.startswith("**", i):
+                regex += ".*"
+                i += 2
+            elif pattern[i] == "*":
+                regex += "[^/]*"
+                i += 1
+            elif pattern[i] == "?":
+                regex += "[^/]"
+                i += 1
+            elif pattern[i] == "[" and (end := pattern.find("]", i + 1)) > i:
+                char_class = pattern[i + 1 : end]
+                if char_class.startswith("!"):
+                    char_class = "^" + char_class[1:]
+                regex += f"[{char_class}]"
+                i = end + 1
+            else:
+                regex += re.escape(pattern[i])
+                i += 1
+
+        prefix = "^" if anchored else "^(?:.*/)?"
+        return IgnoreRule(re.compile(prefix + regex + "$"), negate, dir_only)
+
+
+class IgnoreRules:
+    """A stack of .gitignore-style rules, each relative to a base directory"""
+
+    def __init__(
+        self, rules: Optional[list[tuple[tuple[str, ...], IgnoreRule]]] = None
+    ):
+        self.rules = list(rules) if rules else []
+
+    def extend(self, base: tuple[str, ...], patterns: Iterable[str]) -> IgnoreRules:
+        """Return a new IgnoreRules with patterns added relative to `base`"""
+        new_rules = [(base, r) for p in patterns if (r := IgnoreRule.parse(p))]
+        return IgnoreRules(self.rules + new_rules) if new_rules else self
+
+    def is_ignored(self, parts: tuple[str, ...], is_dir: bool) -> bool:
+        ignored = False
+        for base, rule in self.rules:
+            if parts[: len(base)] != base or (rule.dir_only and not is_dir):
+                continue
+            if rule.regex.match("/".join(parts[len(base) :])):
+                ignored = not rule.negate
+        return ignored
+
+
+DirectoryEntries = list[tuple[str, bool]]
+
+
+def scan_directory(directory: str) -> DirectoryEntries:
+    """Get the sorted (name, is_dir) entries of a directory, skipping symlinked dirs"""
+    entries = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            is_dir = entry.is_dir()
+            if is_dir and entry.is_symlink():
+                continue
+            entries.append((entry.name, is_dir))
+    entries.sort()
+    return entries
+
+
+class DirectoryIndex:
+    """Cache of directory entries, validated against the mtime of each directory.
+
+    Because mtime granularity can be coarse, commands that create or delete files
+    should also invalidate the affected paths explicitly.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, tuple[int, DirectoryEntries]] = {}
+        self._lock = threading.Lock()
+
+    def scan(self, directory: str) -> DirectoryEntries:
+        mtime = os.stat(directory).st_mtime_ns
+        with self._lock:
+            cached = self._entries.get(directory)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        entries = scan_directory(directory)
+        with self._lock:
+            self._entries[directory] = (mtime, entries)
+        return entries
+
+    def invalidate(self, path: str | Path) -> None:
+        """Invalidate the cached entries of a path and all of its parent directories"""
+        path = Path(path).resolve()
+        with self._lock:
+            for directory in (path, *path.parents):
+                self._entries.pop(str(directory), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+directory_index = DirectoryIndex()
+
+
+@dataclass
+class FileListing:
+    files: list[str]
+    next_cursor: str | None
+
+
+def list_directory(
+    directory: str | Path,
+    relative_to: str | Path | None = None,
+    pattern: str | None = None,
+    max_depth: int | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+    ignore_patterns: Iterable[str] = DEFAULT_IGNORE_PATTERNS,
+    index: DirectoryIndex | None = None,
+) -> FileListing:
+    """List the files in a directory recursively, in a stable sorted order.
+
+    Args:
+        directory: The directory to list.
+        relative_to: The directory to make the returned paths relative to.
+            Defaults to `directory`.
+        pattern: A glob pattern that listed files must match. Matched against the
+            file name, or the path relative to `directory` if it contains a slash.
+        max_depth: How many levels of subdirectories to descend into.
+        cursor: The `next_cursor` of the previous page, to continue listing.
+        limit: The maximum number of files to list.
+        ignore_patterns: .gitignore-style patterns of paths to skip. Patterns from
+            .gitignore files encountered in the listed tree are applied as well.
+        index: A DirectoryIndex to read cached directory entries from.
+
+    Returns:
+        FileListing: The listed files, and a cursor for the next page if there is one.
+
+    Raises:
+        ValueError: If the cursor does not belong to the listed directory.
+    """
+    if not os.path.isdir(directory):
+        return FileListing([], None)
+    directory = str(Path(directory).resolve())
+    relative_to = str(Path(relative_to).resolve()) if relative_to else directory
+    prefix = Path(os.path.relpath(directory, relative_to)).parts
+    prefix = () if prefix == (".",) else prefix
+
+    cursor_parts = None
+    if cursor:
+        cursor_parts = Path(cursor).parts
+        if cursor_parts[: len(prefix)] != prefix:
+            raise ValueError(f"Invalid cursor '{cursor}' for directory '{directory}'")
+        cursor_parts = cursor_parts[len(prefix) :]
+
+    scan = index.scan if index else scan_directory
+    match_path = pattern is not None and "/" in pattern
+
+    def walk(path: str, parts: tuple[str, ...], rules: IgnoreRules) -> Iterator[str]:
+        entries = scan(path)
+        if (IGNORE_FILE_NAME, False) in entries:
+            with open(os.path.join(path, IGNORE_FILE_NAME), encoding="utf-8") as f:
+                rules = rules.extend(parts, f.read().splitlines())
+
+        for name, is_dir in entries:
+            entry_parts = parts + (name,)
+            # Skip everything up to and including the cursor
+            if cursor_parts and (
+                entry_parts < cursor_parts[: len(entry_parts)]
+                if is_dir
+                else entry_parts <= cursor_parts
+            ):
+                continue
+            if rules.is_ignored(entry_parts, is_dir):
+                continue
+
+            if is_dir:
+                if max_depth is None or len(parts) < max_depth:
+                    yield from walk(os.path.join(path, name), entry_parts, rules)
+            elif pattern is None or fnmatch.fnmatchcase(
+                "/".join(entry_parts) if match_path else name, pattern
+            ):
+                yield os.path.join(*prefix, *entry_parts)
+
+    files = walk(directory, (), IgnoreRules().extend((), ignore_patterns))
+    listed = list(islice(files, limit))
+    next_cursor = None
+    if limit is not None and listed and next(files, None) is not None:
+        next_cursor = listed[-1]
+    return FileListing(listed, next_cursor)
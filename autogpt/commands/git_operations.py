@@ -4,6 +4,7 @@ from git.repo import Repo
 
 from autogpt.agent.agent import Agent
 from autogpt.command_decorator import command
+from autogpt.models.command import ConfigPredicate
 from autogpt.url_utils.validators import validate_url
 
 from .decorators import sanitize_path_arg
@@ -24,7 +25,7 @@ from .decorators import sanitize_path_arg
             "required": True,
         },
     },
-    lambda config: bool(config.github_username and config.github_api_key),
+    ConfigPredicate("github_username", "github_api_key"),
     "Configure github_username and github_api_key.",
 )
 @sanitize_path_arg("clone_path")
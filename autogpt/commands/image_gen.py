@@ -12,6 +12,7 @@ from PIL import Image
 from autogpt.agent.agent import Agent
 from autogpt.command_decorator import command
 from autogpt.logs import logger
+from autogpt.models.command import ConfigPredicate
 
 
 @command(
@@ -24,7 +25,7 @@ from autogpt.logs import logger
             "required": True,
         },
     },
-    lambda config: bool(config.image_provider),
+    ConfigPredicate("image_provider"),
     "Requires a image provider to be set.",
 )
 def generate_image(prompt: str, agent: Agent, size: int = 256) -> str:
@@ -2,15 +2,18 @@
 from __future__ import annotations
 
 import json
-import time
-from itertools import islice
-
-from duckduckgo_search import DDGS
 
 from autogpt.agent.agent import Agent
 from autogpt.command_decorator import command
-
-DUCKDUCKGO_MAX_ATTEMPTS = 3
+from autogpt.models.command import ConfigPredicate
+
+from .web_search_utils import (
+    DuckDuckGoSearchBackend,
+    GoogleSearchBackend,
+    cached_search,
+    get_search_backends,
+    search,
+)
 
 
 @command(
@@ -35,21 +38,41 @@ def web_search(query: str, agent: Agent, num_results: int = 8) -> str:
     Returns:
         str: The results of the search.
     """
-    search_results = []
-    attempts = 0
+    if not query:
+        return json.dumps([])
 
-    while attempts < DUCKDUCKGO_MAX_ATTEMPTS:
-        if not query:
-            return json.dumps(search_results)
+    search_results = cached_search(DuckDuckGoSearchBackend(), query, num_results)
 
-        results = DDGS().text(query)
-        search_results = list(islice(results, num_results))
+    results = json.dumps(search_results, ensure_ascii=False, indent=4)
+    return safe_google_results(results)
 
-        if search_results:
-            break
 
-        time.sleep(1)
-        attempts += 1
+@command(
+    "web_search_batch",
+    "Searches the web for multiple queries at once",
+    {
+        "queries": {
+            "type": "string",
+            "description": "The search queries, one per line",
+            "required": True,
+        }
+    },
+)
+def web_search_batch(queries: str, agent: Agent, num_results: int = 8) -> str:
+    """Search for multiple queries concurrently on all configured search backends
+
+    Args:
+        queries (str): The search queries, separated by newlines.
+        num_results (int): The number of results to return per query per backend.
+
+    Returns:
+        str: The merged results of the searches, deduplicated by URL.
+    """
+    search_results = search(
+        [q.strip() for q in queries.splitlines()],
+        get_search_backends(agent.config),
+        num_results,
+    )
 
     results = json.dumps(search_results, ensure_ascii=False, indent=4)
     return safe_google_results(results)
@@ -65,8 +88,7 @@ def web_search(query: str, agent: Agent, num_results: int = 8) -> str:
             "required": True,
         }
     },
-    lambda config: bool(config.google_api_key)
-    and bool(config.google_custom_search_engine_id),
+    ConfigPredicate("google_api_key", "google_custom_search_engine_id"),
     "Configure google_api_key and custom_search_engine_id.",
     aliases=["search"],
 )
@@ -81,26 +103,16 @@ def google(query: str, agent: Agent, num_results: int = 8) -> str | list[str]:
         str: The results of the search.
     """
 
-    from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
 
     try:
         # Get the Google API key and Custom Search Engine ID from the config file
-        api_key = agent.config.google_api_key
-        custom_search_engine_id = agent.config.google_custom_search_engine_id
-
-        # Initialize the Custom Search API service
-        service = build("customsearch", "v1", developerKey=api_key)
-
-        # Send the search query and retrieve the results
-        result = (
-            service.cse()
-            .list(q=query, cx=custom_search_engine_id, num=num_results)
-            .execute()
+        backend = GoogleSearchBackend(
+            agent.config.google_api_key, agent.config.google_custom_search_engine_id
         )
 
-        # Extract the search result items from the response
-        search_results = result.get("items", [])
+        # Send the search query and retrieve the result items
+        search_results = cached_search(backend, query, num_results)
 
         # Create a list of only the URLs from the search results
         search_results_links = [item["link"] for item in search_results]
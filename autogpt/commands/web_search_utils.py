@@ -0,0 +1,208 @@
+"""Search backends and concurrent multi-query search for the web search commands"""
+from __future__ import annotations
+
+import abc
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, Optional
+
+from duckduckgo_search import DDGS
+
+from autogpt.config import Config
+from autogpt.logs import logger
+
+DUCKDUCKGO_MAX_ATTEMPTS = 3
+SEARCH_CACHE_TTL = 60 * 60
+SEARCH_MAX_WORKERS = 8
+
+SearchResult = dict[str, str]
+
+
+class SearchBackend(abc.ABC):
+    """A source of web search results, e.g. a search engine API"""
+
+    name: str
+
+    @abc.abstractmethod
+    def search(self, query: str, num_results: int) -> list[SearchResult]:
+        """Run a single query against the backend.
+
+        Args:
+            query: The search query.
+            num_results: The maximum number of results to return.
+
+        Returns:
+            list[SearchResult]: The results, each containing at least a URL.
+        """
+
+
+class DuckDuckGoSearchBackend(SearchBackend):
+    """Search backend using DuckDuckGo, retrying with backoff on empty responses"""
+
+    name = "duckduckgo"
+
+    def __init__(
+        self, max_attempts: int = DUCKDUCKGO_MAX_ATTEMPTS, backoff: float = 1.0
+    ):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+
+    def search(self, query: str, num_results: int) -> list[SearchResult]:
+        results = []
+        for attempt in range(self.max_attempts):
+            results = list(islice(DDGS().text(query) or [], num_results))
+            if results:
+                break
+            if attempt < self.max_attempts - 1:
+                time.sleep(self.backoff * 2**attempt)
+        return results
+
+
+class GoogleSearchBackend(SearchBackend):
+    """Search backend using the official Google Custom Search API"""
+
+    name = "google"
+
+    def __init__(self, api_key: str, custom_search_engine_id: str):
+        self.api_key = api_key
+        self.custom_search_engine_id = custom_search_engine_id
+
+    def search(self, query: str, num_results: int) -> list[SearchResult]:
+        from googleapiclient.discovery import build
+
+        # Initialize the Custom Search API service
+        service = build("customsearch", "v1", developerKey=self.api_key)
+
+        # Send the search query and retrieve the results
+        result = (
+            service.cse()
+            .list(q=query, cx=self.custom_search_engine_id, num=num_results)
+            .execute()
+        )
+        return result.get("items", [])
+
+
+class SearchResultCache:
+    """Thread-safe cache of search results per (backend, query) with a TTL"""
+
+    def __init__(self, ttl: float = SEARCH_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: dict[tuple, tuple[float, list[SearchResult]]] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self, backend: str, query: str, num_results: int
+    ) -> Optional[list[SearchResult]]:
+        key = (backend, query, num_results)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, results = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            return results
+
+    def put(
+        self, backend: str, query: str, num_results: int, results: list[SearchResult]
+    ) -> None:
+        with self._lock:
+            self._entries[(backend, query, num_results)] = (time.monotonic(), results)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+search_cache = SearchResultCache()
+
+
+def result_url(result: SearchResult) -> str | None:
+    """Get the URL of a search result, regardless of which backend produced it"""
+    return result.get("href") or result.get("link") or result.get("url")
+
+
+def cached_search(
+    backend: SearchBackend,
+    query: str,
+    num_results: int,
+    cache: SearchResultCache = search_cache,
+) -> list[SearchResult]:
+    """Run a query against a backend, serving it from the cache if possible.
+
+    Empty result sets are not cached, so that a later call can retry the query.
+    """
+    if (results := cache.get(backend.name, query, num_results)) is not None:
+        logger.debug(f"Search cache hit for '{query}' on {backend.name}")
+        return results
+
+    results = backend.search(query, num_results)
+    if results:
+        cache.put(backend.name, query, num_results, results)
+    return results
+
+
+def search(
+    queries: Iterable[str],
+    backends: Iterable[SearchBackend],
+    num_results: int = 8,
+    cache: SearchResultCache = search_cache,
+    max_workers: int = SEARCH_MAX_WORKERS,
+) -> list[SearchResult]:
+    """Fan out a batch of queries concurrently over the given search backends.
+
+    Results are merged in order of (query, backend) and deduplicated by URL.
+    A failing backend is logged and skipped, so it can't sink the whole batch.
+
+    Args:
+        queries: The search queries.
+        backends: The backends to run each query against.
+        num_results: The maximum number of results per query per backend.
+        cache: The cache to serve results from.
+        max_workers: The maximum number of searches to run at the same time.
+
+    Returns:
+        list[SearchResult]: The merged, deduplicated results.
+    """
+    # The backends are iterated once per query, so an iterator mustn't run out
+    backends = list(backends)
+    jobs = [(b, q) for q in dict.fromkeys(q for q in queries if q) for b in backends]
+    if not jobs:
+        return []
+
+    def run_job(backend: SearchBackend, query: str) -> list[SearchResult]:
+        try:
+            return cached_search(backend, query, num_results, cache)
+        except Exception as e:
+            logger.warn(f"Search for '{query}' on {backend.name} failed: {e}")
+            return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+        result_sets = list(executor.map(lambda job: run_job(*job), jobs))
+
+    merged = []
+    seen_urls = set()
+    for results in result_sets:
+        for result in results:
+            url = result_url(result)
+            if url is not None:
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+            merged.append(result)
+    return merged
+
+
+def get_search_backends(config: Config) -> list[SearchBackend]:
+    """Get the search backends that are available with the given config"""
+    backends: list[SearchBackend] = [DuckDuckGoSearchBackend()]
+    if config.google_api_key and config.google_custom_search_engine_id:
+        backends.append(
+            GoogleSearchBackend(
+                config.google_api_key, config.google_custom_search_engine_id
+            )
+        )
+    return backends
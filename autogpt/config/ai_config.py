@@ -18,6 +18,15 @@ if TYPE_CHECKING:
 
 # Soon this will go in a folder where it remembers more stuff about the run(s)
 SAVE_FILE = str(Path(os.getcwd()) / "ai_settings.yaml")
+# Changing any of these changes the system prompt, see AIConfig.version
+PROMPT_ATTRIBUTES = (
+    "ai_name",
+    "ai_role",
+    "ai_goals",
+    "api_budget",
+    "prompt_generator",
+    "command_registry",
+)
 
 
 class AIConfig:
@@ -29,8 +38,12 @@ class AIConfig:
         ai_role (str): The description of the AI's role.
         ai_goals (list): The list of objectives the AI is supposed to complete.
         api_budget (float): The maximum dollar value for API calls (0.0 means infinite)
+        version (int): Incremented whenever an attribute in PROMPT_ATTRIBUTES is
+            set. Modifying ai_goals in place doesn't count; assign a new list.
     """
 
+    version: int = 0
+
     def __init__(
         self,
         ai_name: str = "",
@@ -56,6 +69,11 @@ class AIConfig:
         self.prompt_generator: PromptGenerator | None = None
         self.command_registry: CommandRegistry | None = None
 
+    def __setattr__(self, name: str, value: object) -> None:
+        super().__setattr__(name, value)
+        if name in PROMPT_ATTRIBUTES:
+            super().__setattr__("version", self.version + 1)
+
     @staticmethod
     def load(ai_settings_file: str = SAVE_FILE) -> "AIConfig":
         """
@@ -138,10 +156,10 @@ class AIConfig:
         prompt_generator.name = self.ai_name
         prompt_generator.role = self.ai_role
         prompt_generator.command_registry = self.command_registry
-        for plugin in config.plugins:
-            if not plugin.can_handle_post_prompt():
-                continue
-            prompt_generator = plugin.post_prompt(prompt_generator)
+        plugin_hooks = config.plugin_hooks
+        for plugin in plugin_hooks.handlers("post_prompt"):
+            with plugin_hooks.run("post_prompt", plugin):
+                prompt_generator = plugin.post_prompt(prompt_generator)
 
         if config.execute_local_commands:
             # add OS info to prompt
@@ -9,9 +9,10 @@ from typing import Any, Dict, Optional, Union
 import yaml
 from auto_gpt_plugin_template import AutoGPTPluginTemplate
 from colorama import Fore
-from pydantic import Field, validator
+from pydantic import Field, PrivateAttr, validator
 
 from autogpt.core.configuration.schema import Configurable, SystemSettings
+from autogpt.plugins.hooks import PluginHooks
 from autogpt.plugins.plugins_config import PluginsConfig
 
 AZURE_CONFIG_FILE = os.path.join(os.path.dirname(__file__), "../..", "azure.yaml")
@@ -101,6 +102,8 @@ class Config(SystemSettings, arbitrary_types_allowed=True):
     ###################
     plugins_dir: str = "plugins"
     plugins_config_file: str = PLUGINS_CONFIG_FILE
+    # Defaults to <plugins_dir>/.plugins_cache.json, see PluginsCache
+    plugins_cache_file: Optional[str] = None
     plugins_config: PluginsConfig = Field(
         default_factory=lambda: PluginsConfig(plugins={})
     )
@@ -108,6 +111,9 @@ class Config(SystemSettings, arbitrary_types_allowed=True):
     plugins_allowlist: list[str] = Field(default_factory=list)
     plugins_denylist: list[str] = Field(default_factory=list)
     plugins_openai: list[str] = Field(default_factory=list)
+    # Seconds a plugin may take to run a hook, see PluginHooks
+    plugin_hook_time_budget: Optional[float] = None
+    _plugin_hooks: Optional[PluginHooks] = PrivateAttr(default=None)
 
     ###############
     # Credentials #
@@ -144,6 +150,13 @@ class Config(SystemSettings, arbitrary_types_allowed=True):
         ), f"Plugins must subclass AutoGPTPluginTemplate; {p} is a template instance"
         return p
 
+    @property
+    def plugin_hooks(self) -> PluginHooks:
+        """The plugins that handle each hook; rebuilt when `plugins` is replaced"""
+        if self._plugin_hooks is None or self._plugin_hooks.plugins is not self.plugins:
+            self._plugin_hooks = PluginHooks(self.plugins, self.plugin_hook_time_budget)
+        return self._plugin_hooks
+
     def get_openai_credentials(self, model: str) -> dict[str, str]:
         credentials = {
             "api_key": self.openai_api_key,
@@ -256,6 +269,7 @@ class ConfigBuilder(Configurable[Config]):
             "wipe_redis_on_start": os.getenv("WIPE_REDIS_ON_START", "True") == "True",
             "plugins_dir": os.getenv("PLUGINS_DIR"),
             "plugins_config_file": os.getenv("PLUGINS_CONFIG_FILE"),
+            "plugins_cache_file": os.getenv("PLUGINS_CACHE_FILE"),
             "chat_messages_enabled": os.getenv("CHAT_MESSAGES_ENABLED") == "True",
         }
 
@@ -302,6 +316,10 @@ class ConfigBuilder(Configurable[Config]):
             config_dict["redis_port"] = int(os.getenv("REDIS_PORT"))
         with contextlib.suppress(TypeError):
             config_dict["temperature"] = float(os.getenv("TEMPERATURE"))
+        with contextlib.suppress(TypeError):
+            config_dict["plugin_hook_time_budget"] = float(
+                os.getenv("PLUGIN_HOOK_TIME_BUDGET")
+            )
 
         if config_dict["use_azure"]:
             azure_config = cls.load_azure_config(config_dict["azure_config_file"])
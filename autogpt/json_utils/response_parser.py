@@ -0,0 +1,124 @@
+"""Parsing and validation of the JSON replies of the LLM.
+
+A reply is first parsed as strict JSON with orjson, which is the common case.
+Only if that fails, the usual defects of LLM output are repaired one by one:
+a code block around the JSON, text before or after it, trailing commas, and
+Python literals (single quotes, True/False/None). The parsed reply reports which
+of these paths was taken.
+
+The response schema and its validator are loaded and compiled once for every
+schema and `openai_functions` setting, instead of on every reply.
+"""
+from __future__ import annotations
+
+import ast
+import copy
+import functools
+import json
+import os.path
+import re
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import orjson
+from jsonschema import Draft7Validator
+
+# The ways a reply can have been parsed, from fastest to slowest
+PARSED_AS_JSON = "json"
+PARSED_AFTER_REPAIR = "repaired"
+PARSED_AS_PYTHON_LITERAL = "python_literal"
+PARSE_FAILED = "failed"
+
+CODE_BLOCK_PATTERN = re.compile(r"^```[a-zA-Z]*\s*(.*?)\s*```$", re.DOTALL)
+TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+
+
+@dataclass
+class ParsedResponse:
+    """A parsed reply, how it was parsed and what had to be repaired"""
+
+    content: dict[str, Any]
+    method: str
+    repairs: list[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.method != PARSE_FAILED
+
+
+def _loads_dict(text: str) -> Optional[dict[str, Any]]:
+    try:
+        content = orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return None
+    return content if isinstance(content, dict) else None
+
+
+def parse_response(response_content: str) -> ParsedResponse:
+    """Parse a reply of the LLM into a dict, repairing it if it's not strict JSON.
+
+    Args:
+        response_content: The content of the reply
+
+    Returns:
+        ParsedResponse: The parsed reply; its content is empty if parsing failed
+    """
+    if (content := _loads_dict(response_content)) is not None:
+        return ParsedResponse(content, PARSED_AS_JSON)
+
+    repairs = []
+    text = response_content.strip()
+    if match := CODE_BLOCK_PATTERN.match(text):
+        text = match.group(1)
+        repairs.append("code_block")
+
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        return ParsedResponse({}, PARSE_FAILED, repairs, "No JSON object found")
+    if start > 0 or end < len(text) - 1:
+        text = text[start : end + 1]
+        repairs.append("surrounding_text")
+
+    if repairs and (content := _loads_dict(text)) is not None:
+        return ParsedResponse(content, PARSED_AFTER_REPAIR, repairs)
+
+    without_trailing_commas = TRAILING_COMMA_PATTERN.sub(r"\1", text)
+    if without_trailing_commas != text:
+        if (content := _loads_dict(without_trailing_commas)) is not None:
+            return ParsedResponse(
+                content, PARSED_AFTER_REPAIR, repairs + ["trailing_commas"]
+            )
+
+    # A reply can be the str() of a Python dict, e.g. when it went through a plugin
+    try:
+        content = ast.literal_eval(text)
+    except (ValueError, SyntaxError, MemoryError, RecursionError) as e:
+        return ParsedResponse({}, PARSE_FAILED, repairs, f"{type(e).__name__}: {e}")
+    if not isinstance(content, dict):
+        return ParsedResponse({}, PARSE_FAILED, repairs, "The reply is not an object")
+    return ParsedResponse(content, PARSED_AS_PYTHON_LITERAL, repairs)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_response_schema(schema_name: str, openai_functions: bool) -> dict[str, Any]:
+    filename = os.path.join(os.path.dirname(__file__), f"{schema_name}.json")
+    with open(filename, "r") as f:
+        json_schema = json.load(f)
+    if openai_functions:
+        del json_schema["properties"]["command"]
+        json_schema["required"].remove("command")
+    return json_schema
+
+
+def load_response_schema(schema_name: str, openai_functions: bool) -> dict[str, Any]:
+    """Get a copy of a response schema, which is read from disk only once"""
+    return copy.deepcopy(_load_response_schema(schema_name, openai_functions))
+
+
+@functools.lru_cache(maxsize=None)
+def get_response_validator(schema_name: str, openai_functions: bool) -> Draft7Validator:
+    """Get the validator of a response schema, which is compiled only once"""
+    schema = _load_response_schema(schema_name, openai_functions)
+    Draft7Validator.check_schema(schema)
+    return Draft7Validator(schema)
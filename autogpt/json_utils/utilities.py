@@ -1,43 +1,39 @@
 """Utilities for the json_fixes package."""
-import ast
 import json
-import os.path
 from typing import Any
 
-from jsonschema import Draft7Validator
-
 from autogpt.config import Config
+from autogpt.json_utils.response_parser import (
+    PARSED_AS_JSON,
+    get_response_validator,
+    load_response_schema,
+    parse_response,
+)
 from autogpt.logs import logger
 
 LLM_DEFAULT_RESPONSE_FORMAT = "llm_response_format_1"
 
 
 def extract_json_from_response(response_content: str) -> dict:
-    # Sometimes the response includes the JSON in a code block with ```
-    if response_content.startswith("```") and response_content.endswith("```"):
-        # Discard the first and last ```, then re-join in case the response naturally included ```
-        response_content = "```".join(response_content.split("```")[1:-1])
-
-    # response content comes from OpenAI as a Python `str(content_dict)`, literal_eval reverses this
-    try:
-        return ast.literal_eval(response_content)
-    except BaseException as e:
-        logger.info(f"Error parsing JSON response with literal_eval {e}")
+    """Parse the JSON reply of the LLM, repairing it if needed; see parse_response"""
+    parsed = parse_response(response_content)
+    if not parsed.ok:
+        logger.info(f"Error parsing JSON response: {parsed.error}")
         logger.debug(f"Invalid JSON received in response: {response_content}")
         # TODO: How to raise an error here without causing the program to exit?
         return {}
+    if parsed.method != PARSED_AS_JSON:
+        message = f"Parsed JSON response as {parsed.method}"
+        if parsed.repairs:
+            message += f", after repairing: {', '.join(parsed.repairs)}"
+        logger.debug(message)
+    return parsed.content
 
 
 def llm_response_schema(
     config: Config, schema_name: str = LLM_DEFAULT_RESPONSE_FORMAT
 ) -> dict[str, Any]:
-    filename = os.path.join(os.path.dirname(__file__), f"{schema_name}.json")
-    with open(filename, "r") as f:
-        json_schema = json.load(f)
-    if config.openai_functions:
-        del json_schema["properties"]["command"]
-        json_schema["required"].remove("command")
-    return json_schema
+    return load_response_schema(schema_name, config.openai_functions)
 
 
 def validate_json(
@@ -51,8 +47,7 @@ def validate_json(
     Returns:
         bool: Whether the json_object is valid or not
     """
-    schema = llm_response_schema(config, schema_name)
-    validator = Draft7Validator(schema)
+    validator = get_response_validator(schema_name, config.openai_functions)
 
     if errors := sorted(validator.iter_errors(json_object), key=lambda e: e.path):
         for error in errors:
@@ -9,15 +9,14 @@ if TYPE_CHECKING:
 from autogpt.config import Config
 from autogpt.llm.api_manager import ApiManager
 from autogpt.llm.base import ChatSequence, Message
-from autogpt.llm.providers.openai import (
-    count_openai_functions_tokens,
-    get_openai_command_specs,
-)
+from autogpt.llm.prompt_cache import REPLY_PRIMING_TOKENS
 from autogpt.llm.utils import count_message_tokens, create_chat_completion
-from autogpt.logs import CURRENT_CONTEXT_FILE_NAME, logger
+from autogpt.logs import logger
+from autogpt.logs.tracing import tracer
 
 
 # TODO: Change debug from hardcode to argument
+@tracer.traced("chat_with_ai")
 def chat_with_ai(
     config: Config,
     agent: Agent,
@@ -62,11 +61,22 @@ def chat_with_ai(
     # logger.debug(f"Memory Stats: {agent.memory.get_stats()}")
     relevant_memory = []
 
+    # The system prompt and function specs, and their token counts, are cached
+    static_prompt = agent.prompt_cache.get(
+        system_prompt,
+        model,
+        agent.command_registry,
+        agent.ai_config,
+        agent.config.openai_functions,
+    )
+    time_message = Message(
+        "system", f"The current time and date is {time.strftime('%c')}"
+    )
     message_sequence = ChatSequence.for_model(
         model,
         [
-            Message("system", system_prompt),
-            Message("system", f"The current time and date is {time.strftime('%c')}"),
+            static_prompt.system_message,
+            time_message,
             # Message(
             #     "system",
             #     f"This reminds you of these events from your past:\n{relevant_memory}\n\n",
@@ -75,14 +85,18 @@ def chat_with_ai(
     )
 
     # Count the currently used tokens
-    current_tokens_used = message_sequence.token_length
+    current_tokens_used = (
+        static_prompt.system_tokens
+        + count_message_tokens(time_message, model)
+        - REPLY_PRIMING_TOKENS
+    )
     insertion_index = len(message_sequence)
 
     # Account for tokens used by OpenAI functions
     openai_functions = None
     if agent.config.openai_functions:
-        openai_functions = get_openai_command_specs(agent.command_registry)
-        functions_tlength = count_openai_functions_tokens(openai_functions, model)
+        openai_functions = static_prompt.functions
+        functions_tlength = static_prompt.functions_tokens
         current_tokens_used += functions_tlength
         logger.debug(f"OpenAI Functions take up {functions_tlength} tokens in API call")
 
@@ -108,9 +122,10 @@ def chat_with_ai(
 
     # Update & add summary of trimmed messages
     if len(agent.history) > 0:
-        new_summary_message, trimmed_messages = agent.history.trim_messages(
-            current_message_chain=list(message_sequence), config=agent.config
-        )
+        with tracer.span("summarize_history"):
+            new_summary_message, trimmed_messages = agent.history.trim_messages(
+                current_message_chain=list(message_sequence), config=agent.config
+            )
         tokens_to_add = count_message_tokens(new_summary_message, model)
         message_sequence.insert(insertion_index, new_summary_message)
         current_tokens_used += tokens_to_add - agent.history.max_summary_tlength
@@ -144,19 +159,19 @@ def chat_with_ai(
     # Append user input, the length of this is accounted for above
     message_sequence.append(user_input_msg)
 
-    plugin_count = len(config.plugins)
-    for i, plugin in enumerate(config.plugins):
-        if not plugin.can_handle_on_planning():
-            continue
-        plugin_response = plugin.on_planning(
-            agent.ai_config.prompt_generator, message_sequence.raw()
-        )
+    plugin_hooks = config.plugin_hooks
+    planning_plugins = plugin_hooks.handlers("on_planning")
+    for i, plugin in enumerate(planning_plugins):
+        with plugin_hooks.run("on_planning", plugin):
+            plugin_response = plugin.on_planning(
+                agent.ai_config.prompt_generator, message_sequence.raw()
+            )
         if not plugin_response or plugin_response == "":
             continue
         tokens_to_add = count_message_tokens(Message("system", plugin_response), model)
         if current_tokens_used + tokens_to_add > send_token_limit:
             logger.debug(f"Plugin response too long, skipping: {plugin_response}")
-            logger.debug(f"Plugins remaining at stop: {plugin_count - i}")
+            logger.debug(f"Plugins remaining at stop: {len(planning_plugins) - i}")
             break
         message_sequence.add("system", plugin_response)
         current_tokens_used += tokens_to_add
@@ -179,12 +194,14 @@ def chat_with_ai(
         logger.debug(f"{message.role.capitalize()}: {message.content}")
         logger.debug("")
     logger.debug("----------- END OF CONTEXT ----------------")
-    agent.log_cycle_handler.log_cycle(
+    tracer.current_span().set_attributes(
+        model=model, tokens=current_tokens_used, tokens_remaining=tokens_remaining
+    )
+    agent.log_cycle_handler.log_message_context(
         agent.ai_name,
         agent.created_at,
         agent.cycle_count,
-        message_sequence.raw(),
-        CURRENT_CONTEXT_FILE_NAME,
+        message_sequence.messages,
     )
 
     # TODO: use a model defined elsewhere, so that model can contain
@@ -0,0 +1,88 @@
+"""A cache of the part of the prompt that doesn't change from cycle to cycle.
+
+Every cycle sends the same system prompt and, with OpenAI functions, the same
+function specs, which take thousands of tokens to count. These only change when
+the system prompt, the model, the commands in the CommandRegistry or the
+AIConfig change. The registry and the AI config count their changes in a
+`version` attribute, so the cache only needs to compare a few values to know
+whether the prefix it holds is still valid.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+from autogpt.llm.base import Message
+from autogpt.llm.providers.openai import (
+    OpenAIFunctionSpec,
+    count_openai_functions_tokens,
+    get_openai_command_specs,
+)
+from autogpt.llm.utils import count_message_tokens
+from autogpt.logs import logger
+
+if TYPE_CHECKING:
+    from autogpt.config.ai_config import AIConfig
+    from autogpt.models.command_registry import CommandRegistry
+
+# Tokens count_message_tokens adds once per list of messages, to prime the reply
+REPLY_PRIMING_TOKENS = 3
+
+
+@dataclass
+class StaticPrompt:
+    """The system prompt and function specs, and how many tokens they take up"""
+
+    system_message: Message
+    system_tokens: int
+    """The tokens of the system message, including the reply priming tokens"""
+    functions: Optional[list[OpenAIFunctionSpec]] = None
+    functions_tokens: int = 0
+
+
+class PromptCache:
+    """Holds the StaticPrompt of an agent until something it depends on changes"""
+
+    def __init__(self):
+        self._key: Optional[tuple[Any, ...]] = None
+        self._prompt: Optional[StaticPrompt] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        system_prompt: str,
+        model: str,
+        command_registry: CommandRegistry,
+        ai_config: AIConfig,
+        openai_functions: bool,
+    ) -> StaticPrompt:
+        key = (
+            system_prompt,
+            model,
+            id(command_registry),
+            command_registry.version,
+            id(ai_config),
+            ai_config.version,
+            openai_functions,
+        )
+        if self._prompt is not None and key == self._key:
+            self.hits += 1
+            return self._prompt
+
+        self.misses += 1
+        logger.debug("Building the static prompt and counting its tokens")
+        system_message = Message("system", system_prompt)
+        prompt = StaticPrompt(
+            system_message, count_message_tokens(system_message, model)
+        )
+        if openai_functions:
+            prompt.functions = get_openai_command_specs(command_registry)
+            prompt.functions_tokens = count_openai_functions_tokens(
+                prompt.functions, model
+            )
+        self._key, self._prompt = key, prompt
+        return prompt
+
+    def invalidate(self) -> None:
+        self._key, self._prompt = None, None
@@ -309,7 +309,7 @@ class OpenAIFunctionSpec:
         description: Optional[str]
         required: bool = False
 
-    @property
+    @functools.cached_property
     def schema(self) -> dict[str, str | dict | list]:
         """Returns an OpenAI-consumable function specification"""
         return {
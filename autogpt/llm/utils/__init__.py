@@ -5,6 +5,7 @@ from typing import List, Literal, Optional
 from colorama import Fore
 
 from autogpt.config import Config
+from autogpt.logs.tracing import tracer
 
 from ..api_manager import ApiManager
 from ..base import (
@@ -93,6 +94,7 @@ def create_text_completion(
 
 
 # Overly simple abstraction until we create something better
+@tracer.traced("create_chat_completion")
 def create_chat_completion(
     prompt: ChatSequence,
     config: Config,
@@ -129,22 +131,28 @@ def create_chat_completion(
     logger.debug(
         f"{Fore.GREEN}Creating chat completion with model {model}, temperature {temperature}, max_tokens {max_tokens}{Fore.RESET}"
     )
+    span = tracer.current_span()
+    span.set_attributes(model=model, max_tokens=max_tokens)
     chat_completion_kwargs = {
         "model": model,
         "temperature": temperature,
         "max_tokens": max_tokens,
     }
 
+    plugin_hooks = config.plugin_hooks
+    # Whether a plugin handles a chat completion depends on its arguments
     for plugin in config.plugins:
         if plugin.can_handle_chat_completion(
             messages=prompt.raw(),
             **chat_completion_kwargs,
         ):
-            message = plugin.handle_chat_completion(
-                messages=prompt.raw(),
-                **chat_completion_kwargs,
-            )
+            with plugin_hooks.run("handle_chat_completion", plugin):
+                message = plugin.handle_chat_completion(
+                    messages=prompt.raw(),
+                    **chat_completion_kwargs,
+                )
             if message is not None:
+                span.set_attribute("handled_by_plugin", plugin.__class__.__name__)
                 return message
 
     chat_completion_kwargs.update(config.get_openai_credentials(model))
@@ -159,6 +167,11 @@ def create_chat_completion(
         **chat_completion_kwargs,
     )
     logger.debug(f"Response: {response}")
+    if usage := getattr(response, "usage", None):
+        span.set_attributes(
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+        )
 
     if hasattr(response, "error"):
         logger.error(response.error)
@@ -168,11 +181,10 @@ def create_chat_completion(
     content: str | None = first_message.get("content")
     function_call: FunctionCallDict | None = first_message.get("function_call")
 
-    for plugin in config.plugins:
-        if not plugin.can_handle_on_response():
-            continue
+    for plugin in plugin_hooks.handlers("on_response"):
         # TODO: function call support in plugin.on_response()
-        content = plugin.on_response(content)
+        with plugin_hooks.run("on_response", plugin):
+            content = plugin.on_response(content)
 
     return ChatModelResponse(
         model_info=OPEN_AI_CHAT_MODELS[model],
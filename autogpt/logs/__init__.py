@@ -1,8 +1,15 @@
 from .formatters import AutoGptFormatter, JsonFormatter, remove_color_codes
-from .handlers import ConsoleHandler, JsonFileHandler, TypingConsoleHandler
+from .handlers import (
+    ConsoleHandler,
+    ConsoleRenderer,
+    JsonFileHandler,
+    TypingConsoleHandler,
+    console_renderer,
+)
 from .log_cycle import (
     CURRENT_CONTEXT_FILE_NAME,
     FULL_MESSAGE_HISTORY_FILE_NAME,
+    MESSAGE_LOG_FILE_NAME,
     NEXT_ACTION_FILE_NAME,
     PROMPT_SUMMARY_FILE_NAME,
     PROMPT_SUPERVISOR_FEEDBACK_FILE_NAME,
@@ -12,4 +19,5 @@ from .log_cycle import (
     LogCycleHandler,
 )
 from .logger import Logger, logger
+from .tracing import Tracer, tracer
 from .utils import print_assistant_thoughts, remove_ansi_escape
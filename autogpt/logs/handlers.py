@@ -1,41 +1,178 @@
+from __future__ import annotations
+
 import json
 import logging
 import random
+import sys
+import threading
 import time
+from collections import deque
+from typing import Optional
+
+MAX_TYPING_BACKLOG = 2
+
+
+class ConsoleRenderer:
+    """Writes console output with simulated typing on a background thread, so that
+    the threads producing the output don't have to wait for the animation.
+
+    When output is submitted faster than it can be animated, the backlog is written
+    at once instead of falling further and further behind.
+    """
+
+    def __init__(self, max_backlog: int = MAX_TYPING_BACKLOG):
+        self.max_backlog = max_backlog
+        # Wall time that producers have spent blocked on the console output
+        self.blocked_time = 0.0
+        self.n_animated = 0
+        self.n_collapsed = 0
+        self._queue: deque[str] = deque()
+        self._rendering = False
+        self._hurry = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, text: str) -> None:
+        """Queue text to be written to the console"""
+        started_at = time.perf_counter()
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="console-renderer", daemon=True
+                )
+                self._thread.start()
+            self._queue.append(text)
+            self._cond.notify_all()
+            self.blocked_time += time.perf_counter() - started_at
+
+    def flush(self, animate: bool = False) -> None:
+        """Wait until all queued output has been written to the console.
+
+        Args:
+            animate: Whether to let the queued output finish its animation,
+                instead of writing it out at once.
+        """
+        started_at = time.perf_counter()
+        with self._cond:
+            if not animate:
+                self._hurry += 1
+                self._cond.notify_all()
+            try:
+                while (self._queue or self._rendering) and self._thread_alive():
+                    self._cond.wait(0.1)
+            finally:
+                if not animate:
+                    self._hurry -= 1
+            self.blocked_time += time.perf_counter() - started_at
+
+    def summary(self) -> str:
+        """How long producers were blocked on the console output, and how much of
+        the output was animated"""
+        return (
+            f"{self.blocked_time * 1000:.1f} ms blocked,"
+            f" {self.n_animated} messages animated, {self.n_collapsed} collapsed"
+        )
+
+    def _thread_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _behind(self) -> bool:
+        return bool(self._hurry) or len(self._queue) > self.max_backlog
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                if self._behind():
+                    backlog = list(self._queue)
+                    self._queue.clear()
+                else:
+                    backlog = [self._queue.popleft()]
+                self._rendering = True
+
+            try:
+                if len(backlog) > 1:
+                    self.n_collapsed += len(backlog)
+                    self._write(
+                        "".join(" ".join(text.split()) + "\n" for text in backlog)
+                    )
+                else:
+                    self._type(backlog[0])
+            finally:
+                with self._cond:
+                    self._rendering = False
+                    self._cond.notify_all()
+
+    def _type(self, text: str) -> None:
+        min_typing_speed = 0.05
+        max_typing_speed = 0.01
+
+        words = text.split()
+        for i, word in enumerate(words):
+            if self._behind():
+                # Write the rest of the message at once to catch up
+                self.n_collapsed += 1
+                self._write(" ".join(words[i:]) + "\n")
+                return
+            self._write(word if i == len(words) - 1 else word + " ")
+            typing_speed = random.uniform(min_typing_speed, max_typing_speed)
+            with self._cond:
+                self._cond.wait_for(self._behind, timeout=typing_speed)
+            # type faster after each word
+            min_typing_speed = min_typing_speed * 0.95
+            max_typing_speed = max_typing_speed * 0.95
+        self.n_animated += 1
+        self._write("\n")
+
+    @staticmethod
+    def _write(text: str) -> None:
+        try:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        except (OSError, ValueError):
+            pass
+
+
+console_renderer = ConsoleRenderer()
 
 
 class ConsoleHandler(logging.StreamHandler):
+    def __init__(self, renderer: ConsoleRenderer = console_renderer):
+        super().__init__()
+        self.renderer = renderer
+
     def emit(self, record: logging.LogRecord) -> None:
         msg = self.format(record)
         try:
+            # Don't let this output overtake the output that is still being typed
+            self.renderer.flush()
             print(msg)
         except Exception:
             self.handleError(record)
 
 
 class TypingConsoleHandler(logging.StreamHandler):
-    """Output stream to console using simulated typing"""
+    """Output stream to console using simulated typing.
 
-    def emit(self, record: logging.LogRecord):
-        min_typing_speed = 0.05
-        max_typing_speed = 0.01
+    The typing is animated by a ConsoleRenderer on a background thread, so logging
+    a message doesn't block the caller.
+    """
 
+    def __init__(self, renderer: ConsoleRenderer = console_renderer):
+        super().__init__()
+        self.renderer = renderer
+
+    def emit(self, record: logging.LogRecord):
         msg = self.format(record)
         try:
-            words = msg.split()
-            for i, word in enumerate(words):
-                print(word, end="", flush=True)
-                if i < len(words) - 1:
-                    print(" ", end="", flush=True)
-                typing_speed = random.uniform(min_typing_speed, max_typing_speed)
-                time.sleep(typing_speed)
-                # type faster after each word
-                min_typing_speed = min_typing_speed * 0.95
-                max_typing_speed = max_typing_speed * 0.95
-            print()
+            self.renderer.submit(msg)
         except Exception:
             self.handleError(record)
 
+    def flush(self) -> None:
+        self.renderer.flush()
+
 
 class JsonFileHandler(logging.FileHandler):
     def __init__(self, filename: str, mode="a", encoding=None, delay=False):
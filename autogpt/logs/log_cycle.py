@@ -1,8 +1,18 @@
-import json
+from __future__ import annotations
+
+import atexit
 import os
-from typing import Any, Dict, Union
+import queue
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Sequence, Union
+
+import orjson
 
 from .logger import logger
+from .message_log import MESSAGE_LOG_FILE_NAME, MessageLogEncoder
+
+if TYPE_CHECKING:
+    from autogpt.llm.base import Message
 
 DEFAULT_PREFIX = "agent"
 FULL_MESSAGE_HISTORY_FILE_NAME = "full_message_history.json"
@@ -14,21 +24,109 @@ SUPERVISOR_FEEDBACK_FILE_NAME = "supervisor_feedback.txt"
 PROMPT_SUPERVISOR_FEEDBACK_FILE_NAME = "prompt_supervisor_feedback.json"
 USER_INPUT_FILE_NAME = "user_input.txt"
 
+LOG_QUEUE_SIZE = 256
+
+
+class CycleLogWriter:
+    """
+    Serializes and writes cycle logs on a background thread, so that logging
+    doesn't hold up the agent. The queue is bounded: if the writer can't keep up,
+    log_cycle blocks rather than buffering an unbounded amount of data.
+    Pending logs are flushed when the interpreter exits.
+    """
+
+    SAVE_OPTIONS = (
+        orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+    def __init__(self, max_queue_size: int = LOG_QUEUE_SIZE):
+        self._queue: queue.Queue[tuple[str, Any, bool, bool] | None] = queue.Queue(
+            max_queue_size
+        )
+        self._created_directories: set[str] = set()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, file_path: str, data: Any) -> None:
+        """Queue data to be written to a file as JSON"""
+        self._put((file_path, data, False, True))
+
+    def append_lines(
+        self, file_path: str, records: list[Any], truncate: bool = False
+    ) -> None:
+        """Queue records to be appended to a file as JSON lines.
+        With `truncate`, what was in the file before is discarded first."""
+        self._put((file_path, records, True, truncate))
+
+    def _put(self, item: tuple[str, Any, bool, bool]) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="cycle-log-writer", daemon=True
+                )
+                self._thread.start()
+        self._queue.put(item)
+
+    def flush(self) -> None:
+        """Wait until all queued logs have been written"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write all queued logs and stop the writer thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join()
+
+    def _run(self) -> None:
+        while (item := self._queue.get()) is not None:
+            try:
+                self._write(*item)
+            except Exception as e:
+                logger.warn(f"Could not write cycle log '{item[0]}': {e}")
+            finally:
+                self._queue.task_done()
+        self._queue.task_done()
+
+    def _write(self, file_path: str, data: Any, lines: bool, truncate: bool) -> None:
+        directory = os.path.dirname(file_path)
+        if directory not in self._created_directories:
+            os.makedirs(directory, exist_ok=True)
+            self._created_directories.add(directory)
+
+        if lines:
+            with open(file_path, "wb" if truncate else "ab") as f:
+                f.write(b"".join(orjson.dumps(r, default=str) + b"\n" for r in data))
+        else:
+            with open(file_path, "wb") as f:
+                f.write(orjson.dumps(data, default=str, option=self.SAVE_OPTIONS))
+
+
+cycle_log_writer = CycleLogWriter()
+atexit.register(cycle_log_writer.close)
+
 
 class LogCycleHandler:
     """
     A class for logging cycle data.
     """
 
-    def __init__(self):
+    def __init__(self, writer: CycleLogWriter = cycle_log_writer):
         self.log_count_within_cycle = 0
+        self.writer = writer
+        self.message_log_encoder = MessageLogEncoder()
+        # Message logs this handler has written to; a log left by a previous run
+        # (with OVERWRITE_DEBUG, every run uses the same folder) is truncated
+        self._message_log_paths: set[str] = set()
 
     @staticmethod
     def create_directory_if_not_exists(directory_path: str) -> None:
         if not os.path.exists(directory_path):
             os.makedirs(directory_path, exist_ok=True)
 
-    def create_outer_directory(self, ai_name: str, created_at: str) -> str:
+    def get_outer_directory(self, ai_name: str, created_at: str) -> str:
         log_directory = logger.get_log_directory()
 
         if os.environ.get("OVERWRITE_DEBUG") == "1":
@@ -37,7 +135,10 @@ class LogCycleHandler:
             ai_name_short = self.get_agent_short_name(ai_name)
             outer_folder_name = f"{created_at}_{ai_name_short}"
 
-        outer_folder_path = os.path.join(log_directory, "DEBUG", outer_folder_name)
+        return os.path.join(log_directory, "DEBUG", outer_folder_name)
+
+    def create_outer_directory(self, ai_name: str, created_at: str) -> str:
+        outer_folder_path = self.get_outer_directory(ai_name, created_at)
         self.create_directory_if_not_exists(outer_folder_path)
 
         return outer_folder_path
@@ -69,20 +170,59 @@ class LogCycleHandler:
         file_name: str,
     ) -> None:
         """
-        Log cycle data to a JSON file.
+        Log cycle data to a JSON file. The data is serialized and written in the
+        background, so it must not be modified after it has been passed in.
 
         Args:
             data (Any): The data to be logged.
             file_name (str): The name of the file to save the logged data.
         """
-        nested_folder_path = self.create_nested_directory(
-            ai_name, created_at, cycle_count
+        # The directories are created by the writer, which caches their existence
+        nested_folder_path = os.path.join(
+            self.get_outer_directory(ai_name, created_at), str(cycle_count).zfill(3)
         )
-
-        json_data = json.dumps(data, ensure_ascii=False, indent=4)
         log_file_path = os.path.join(
             nested_folder_path, f"{self.log_count_within_cycle}_{file_name}"
         )
 
-        logger.log_json(json_data, log_file_path)
+        self.writer.submit(log_file_path, data)
         self.log_count_within_cycle += 1
+
+    def log_message_history(
+        self,
+        ai_name: str,
+        created_at: str,
+        cycle_count: int,
+        messages: Sequence[Message],
+    ) -> None:
+        """Log the message history at the start of a cycle to the message log.
+        Only messages that were added since the previous cycle are written."""
+        self._append_message_log(
+            ai_name,
+            created_at,
+            self.message_log_encoder.history_events(cycle_count, messages),
+        )
+
+    def log_message_context(
+        self,
+        ai_name: str,
+        created_at: str,
+        cycle_count: int,
+        messages: Sequence[Message],
+    ) -> None:
+        """Log the context that is sent to the LLM to the message log"""
+        self._append_message_log(
+            ai_name,
+            created_at,
+            self.message_log_encoder.context_events(cycle_count, messages),
+        )
+
+    def _append_message_log(
+        self, ai_name: str, created_at: str, events: list[dict]
+    ) -> None:
+        file_path = os.path.join(
+            self.get_outer_directory(ai_name, created_at), MESSAGE_LOG_FILE_NAME
+        )
+        truncate = file_path not in self._message_log_paths
+        self._message_log_paths.add(file_path)
+        self.writer.append_lines(file_path, events, truncate=truncate)
@@ -84,7 +84,6 @@ class Logger(metaclass=Singleton):
         self.json_logger.setLevel(logging.DEBUG)
 
         self._config: Optional[Config] = None
-        self.chat_plugins = []
 
     @property
     def config(self) -> Config | None:
@@ -110,8 +109,11 @@ class Logger(metaclass=Singleton):
         if speak_text and self.config and self.config.speak_mode:
             say_text(f"{title}. {content}", self.config)
 
-        for plugin in self.chat_plugins:
-            plugin.report(f"{title}. {content}")
+        if self.config and self.config.chat_messages_enabled:
+            plugin_hooks = self.config.plugin_hooks
+            for plugin in plugin_hooks.handlers("report"):
+                with plugin_hooks.run("report", plugin):
+                    plugin.report(f"{title}. {content}")
 
         if content:
             if isinstance(content, list):
@@ -0,0 +1,198 @@
+"""Per-cycle memory accounting for long-running agents.
+
+When enabled, MemoryTracker takes a tracemalloc snapshot at every cycle boundary
+and compares it with the previous one. It reports the allocation sites that
+grew the most, together with the sizes of the agent's subsystems that tend to
+grow over a run: the message history, the vector memory and various caches.
+When memory grows by more than a threshold in a single cycle, a warning is
+logged, so that leaks surface in soak tests.
+"""
+from __future__ import annotations
+
+import sys
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional
+
+import orjson
+
+from .logger import logger
+from .tracing import tracer
+
+if TYPE_CHECKING:
+    from autogpt.agent.agent import Agent
+
+MEMORY_TRACEBACK_DEPTH = 1
+MEMORY_TOP_SITES = 10
+MEMORY_GROWTH_WARNING_THRESHOLD = 10 * 1024 * 1024
+
+IGNORED_FILES = [tracemalloc.__file__, "<frozen importlib._bootstrap>"]
+
+
+@dataclass
+class AllocationSite:
+    location: str
+    size: int
+    size_diff: int
+    count_diff: int
+
+
+@dataclass
+class MemoryReport:
+    cycle: int
+    """The cycle the report covers; 0 is the startup before the first cycle"""
+    traced_memory: int
+    peak_traced_memory: int
+    growth: int
+    top_growth: list[AllocationSite] = field(default_factory=list)
+    object_counts: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @property
+    def label(self) -> str:
+        return f"Cycle {self.cycle}" if self.cycle else "Startup"
+
+    def __str__(self) -> str:
+        lines = [
+            f"{self.label}: {self.traced_memory / 1024:.0f} KiB traced"
+            f" ({self.growth / 1024:+.0f} KiB),"
+            f" peak {self.peak_traced_memory / 1024:.0f} KiB"
+        ]
+        lines += [
+            f"  {site.size_diff / 1024:+.1f} KiB ({site.count_diff:+d} blocks)"
+            f" {site.location}"
+            for site in self.top_growth
+        ]
+        lines += [f"  {name}: {count}" for name, count in self.object_counts.items()]
+        return "\n".join(lines)
+
+
+def agent_object_counts(agent: Agent) -> dict[str, int]:
+    """Count the objects held by an agent's subsystems that grow during a run"""
+    counts = {
+        "history.messages": len(agent.history.messages),
+        "history.chars": sum(len(m.content) for m in agent.history.messages),
+        "memory.items": len(agent.memory),
+        "caches.message_log_ids": (
+            agent.log_cycle_handler.message_log_encoder.n_logged_messages
+        ),
+        "caches.tracer_spans": len(tracer.spans),
+    }
+    # Only look at caches of modules that are in use, instead of importing them
+    if file_operations_utils := sys.modules.get(
+        "autogpt.commands.file_operations_utils"
+    ):
+        counts["caches.encodings"] = len(file_operations_utils.encoding_cache)
+    return counts
+
+
+class MemoryTracker:
+    """Snapshots allocations at cycle boundaries and reports what is growing.
+
+    Args:
+        growth_warning_threshold: Growth in bytes per cycle above which a warning
+            is logged
+        top_n: The number of top growing allocation sites to report
+        traceback_depth: The number of frames to record per allocation. More frames
+            give more context per allocation site, but are more expensive.
+    """
+
+    def __init__(
+        self,
+        growth_warning_threshold: int = MEMORY_GROWTH_WARNING_THRESHOLD,
+        top_n: int = MEMORY_TOP_SITES,
+        traceback_depth: int = MEMORY_TRACEBACK_DEPTH,
+    ):
+        self.growth_warning_threshold = growth_warning_threshold
+        self.top_n = top_n
+        self.traceback_depth = traceback_depth
+        self.counters: dict[str, Callable[[], int]] = {}
+        self.reports: list[MemoryReport] = []
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._started_tracing = False
+
+    def start(self) -> MemoryTracker:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_depth)
+            self._started_tracing = True
+        self._snapshot = self._take_snapshot()
+        return self
+
+    def stop(self) -> None:
+        self._snapshot = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def save(self, file_path: str | Path) -> None:
+        """Write the reports as JSON lines"""
+        with open(file_path, "wb") as f:
+            for report in self.reports:
+                f.write(orjson.dumps(report.to_dict()) + b"\n")
+
+    def add_counter(self, name: str, counter: Callable[[], int]) -> None:
+        """Add a subsystem whose object count is included in every report"""
+        self.counters[name] = counter
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, pattern) for pattern in IGNORED_FILES]
+        )
+
+    def on_cycle(self, cycle: int, agent: Optional[Agent] = None) -> MemoryReport:
+        """Compare the allocations with those at the previous cycle boundary, to
+        report what the cycle that just ended allocated.
+
+        Args:
+            cycle: The number of the cycle that just ended, or 0 for the startup
+            agent: The agent whose subsystems should be included in the report
+
+        Returns:
+            MemoryReport: The memory usage and growth since the previous call
+        """
+        if self._snapshot is None:
+            self.start()
+        snapshot = self._take_snapshot()
+        stats = snapshot.compare_to(self._snapshot, "lineno")  # type: ignore
+        self._snapshot = snapshot
+
+        traced_memory, peak_traced_memory = tracemalloc.get_traced_memory()
+        growing = sorted(
+            (s for s in stats if s.size_diff > 0),
+            key=lambda s: s.size_diff,
+            reverse=True,
+        )
+        object_counts = agent_object_counts(agent) if agent else {}
+        for name, counter in self.counters.items():
+            object_counts[name] = counter()
+
+        report = MemoryReport(
+            cycle=cycle,
+            traced_memory=traced_memory,
+            peak_traced_memory=peak_traced_memory,
+            growth=sum(s.size_diff for s in stats),
+            top_growth=[
+                AllocationSite(
+                    location=str(s.traceback),
+                    size=s.size,
+                    size_diff=s.size_diff,
+                    count_diff=s.count_diff,
+                )
+                for s in growing[: self.top_n]
+            ],
+            object_counts=object_counts,
+        )
+        self.reports.append(report)
+
+        logger.debug(str(report), "MEMORY:")
+        if report.growth > self.growth_warning_threshold:
+            logger.warn(
+                f"Memory grew by {report.growth / 1024 / 1024:.1f} MiB"
+                f" ({report.label.lower()}); top growing allocation site: "
+                + (report.top_growth[0].location if report.top_growth else "unknown"),
+                "MEMORY:",
+            )
+        return report
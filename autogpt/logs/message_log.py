@@ -0,0 +1,170 @@
+"""Append-only, delta-encoded log of an agent's message history and contexts.
+
+Every distinct message is logged only once, as a `message` event with an ID derived
+from its content. Per cycle, a `history` event lists the IDs of the messages that
+were added to the history since the previous cycle, and a `context` event lists
+the IDs of the messages that were sent to the LLM. This way, the size of the log
+grows linearly over a run, instead of quadratically with full dumps every cycle.
+
+The history or context of any cycle can be reconstructed with MessageLog:
+
+    python -m autogpt.logs.message_log <path to message_log.jsonl> --cycle 3
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Sequence
+
+import orjson
+
+if TYPE_CHECKING:
+    from autogpt.llm.base import Message, MessageDict
+
+MESSAGE_LOG_FILE_NAME = "message_log.jsonl"
+
+
+def message_id(message: MessageDict) -> str:
+    """Get an ID for a message that is derived from its content"""
+    data = orjson.dumps(message, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+class MessageLogEncoder:
+    """Encodes snapshots of the message history and context as message log events,
+    which only contain what wasn't logged before"""
+
+    def __init__(self):
+        self._logged_ids: set[str] = set()
+        self._history_ids: list[str] = []
+        self._history_logged = False
+
+    @property
+    def n_logged_messages(self) -> int:
+        return len(self._logged_ids)
+
+    def history_events(self, cycle: int, messages: Sequence[Message]) -> list[dict]:
+        """Get the events to log the message history at the start of a cycle"""
+        n_logged = len(self._history_ids)
+        events: list[dict] = []
+
+        # The history is append-only, so normally only the new messages are logged
+        if (
+            self._history_logged
+            and len(messages) >= n_logged
+            and (
+                n_logged == 0
+                or message_id(messages[n_logged - 1].raw()) == self._history_ids[-1]
+            )
+        ):
+            new_ids = self._encode_messages(messages[n_logged:], events)
+            self._history_ids.extend(new_ids)
+            events.append({"event": "history", "cycle": cycle, "append": new_ids})
+        else:
+            self._history_ids = self._encode_messages(messages, events)
+            self._history_logged = True
+            events.append(
+                {"event": "history", "cycle": cycle, "reset": list(self._history_ids)}
+            )
+        return events
+
+    def context_events(self, cycle: int, messages: Sequence[Message]) -> list[dict]:
+        """Get the events to log a context that is sent to the LLM"""
+        events: list[dict] = []
+        ids = self._encode_messages(messages, events)
+        events.append({"event": "context", "cycle": cycle, "messages": ids})
+        return events
+
+    def _encode_messages(
+        self, messages: Sequence[Message], events: list[dict]
+    ) -> list[str]:
+        ids = []
+        for message in messages:
+            raw_message = message.raw()
+            msg_id = message_id(raw_message)
+            if msg_id not in self._logged_ids:
+                self._logged_ids.add(msg_id)
+                events.append(
+                    {"event": "message", "id": msg_id, "message": raw_message}
+                )
+            ids.append(msg_id)
+        return ids
+
+
+class MessageLog:
+    """Reconstructs message histories and contexts from message log events"""
+
+    def __init__(self, events: Iterable[dict[str, Any]]):
+        self.messages: dict[str, MessageDict] = {}
+        self.history_events: list[dict] = []
+        self.contexts: dict[int, list[str]] = {}
+
+        for event in events:
+            match event["event"]:
+                case "message":
+                    self.messages[event["id"]] = event["message"]
+                case "history":
+                    self.history_events.append(event)
+                case "context":
+                    # If a cycle has multiple contexts, keep the last one
+                    self.contexts[event["cycle"]] = event["messages"]
+
+    @classmethod
+    def load(cls, file_path: str | Path) -> MessageLog:
+        with open(file_path, "rb") as f:
+            return cls(orjson.loads(line) for line in f if line.strip())
+
+    @property
+    def cycles(self) -> list[int]:
+        return sorted(
+            {e["cycle"] for e in self.history_events} | set(self.contexts.keys())
+        )
+
+    def history(self, cycle: Optional[int] = None) -> list[MessageDict]:
+        """Get the message history as it was at the start of a cycle.
+
+        Args:
+            cycle: The cycle to get the history for. Defaults to the last cycle.
+        """
+        ids: list[str] = []
+        for event in self.history_events:
+            if cycle is not None and event["cycle"] > cycle:
+                break
+            if "reset" in event:
+                ids = list(event["reset"])
+            else:
+                ids.extend(event["append"])
+        return [self.messages[msg_id] for msg_id in ids]
+
+    def context(self, cycle: int) -> list[MessageDict]:
+        """Get the last context that was sent to the LLM in a cycle"""
+        return [self.messages[msg_id] for msg_id in self.contexts.get(cycle, [])]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Reconstruct the message history or context of an agent cycle "
+        "from a message log."
+    )
+    parser.add_argument("file", type=str, help="The message log file to read.")
+    parser.add_argument(
+        "--cycle", type=int, help="The cycle to show (default: the last cycle)"
+    )
+    parser.add_argument(
+        "--context",
+        action="store_true",
+        help="Show the context sent to the LLM instead of the message history",
+    )
+    args = parser.parse_args()
+
+    message_log = MessageLog.load(args.file)
+    cycle = args.cycle if args.cycle is not None else max(message_log.cycles, default=0)
+    messages = (
+        message_log.context(cycle) if args.context else message_log.history(cycle)
+    )
+    print(orjson.dumps(messages, option=orjson.OPT_INDENT_2).decode())
+
+
+if __name__ == "__main__":
+    main()
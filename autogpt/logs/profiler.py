@@ -0,0 +1,214 @@
+"""Sampling profiler that attributes CPU time to agent cycles, phases and commands.
+
+A background thread periodically samples the stack of the profiled thread. Each
+sample is tagged with the agent cycle, the phase of the cycle and the command that
+is being executed, which are derived from the sampled stack itself, so the agent
+doesn't need any instrumentation for this. Where the OS supports per-thread CPU
+clocks, samples are weighted with the CPU time that the thread used since the
+previous sample, which separates CPU-bound work from waiting on I/O.
+
+The results can be written as collapsed stacks, which can be turned into flame
+graphs with e.g. https://github.com/brendangregg/FlameGraph or speedscope, and as
+a summary table of the CPU time per phase and command.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from types import FrameType
+from typing import NamedTuple, Optional
+
+from .logger import logger
+
+PROFILE_INTERVAL = 0.01
+PROFILE_MAX_DEPTH = 128
+
+# Phases of an agent cycle, by the functions that mark them, in order of precedence
+PHASE_FUNCTIONS = [
+    ("summarize", {"update_running_summary"}),
+    ("command", {"execute_command"}),
+    ("llm_wait", {"create_chat_completion", "get_embedding"}),
+    ("prompt_build", {"chat_with_ai"}),
+]
+DEFAULT_PHASE = "agent"
+
+
+class SampleKey(NamedTuple):
+    cycle: Optional[int]
+    phase: str
+    command: Optional[str]
+    stack: tuple[str, ...]
+
+
+class SamplingProfiler:
+    """Periodically samples the stack of a thread and tags it with agent context.
+
+    Args:
+        interval: The number of seconds between samples
+        thread_id: The thread to profile. Defaults to the thread calling `start()`.
+    """
+
+    def __init__(
+        self, interval: float = PROFILE_INTERVAL, thread_id: Optional[int] = None
+    ):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.samples: defaultdict[SampleKey, int] = defaultdict(int)
+        self.cpu_time: defaultdict[SampleKey, float] = defaultdict(float)
+        self._clock_id: Optional[int] = None
+        self._last_cpu_time = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> SamplingProfiler:
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        if hasattr(time, "pthread_getcpuclockid"):
+            self._clock_id = time.pthread_getcpuclockid(self.thread_id)
+            self._last_cpu_time = time.clock_gettime(self._clock_id)
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> SamplingProfiler:
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        """Take a sample of the profiled thread's stack"""
+        frame = sys._current_frames().get(self.thread_id)  # type: ignore
+        if frame is None:
+            return
+
+        if self._clock_id is not None:
+            try:
+                now = time.clock_gettime(self._clock_id)
+            except OSError:
+                # The profiled thread has exited
+                return
+            cpu_time = now - self._last_cpu_time
+            self._last_cpu_time = now
+        else:
+            cpu_time = self.interval
+
+        key = self._inspect(frame)
+        self.samples[key] += 1
+        self.cpu_time[key] += cpu_time
+
+    @staticmethod
+    def _inspect(frame: Optional[FrameType]) -> SampleKey:
+        stack: list[str] = []
+        function_names: set[str] = set()
+        cycle = command = None
+        while frame is not None and len(stack) < PROFILE_MAX_DEPTH:
+            code = frame.f_code
+            stack.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+            function_names.add(code.co_name)
+            if code.co_name == "execute_command" and command is None:
+                command = frame.f_locals.get("command_name")
+            elif code.co_name == "start_interaction_loop" and cycle is None:
+                cycle = getattr(frame.f_locals.get("self"), "cycle_count", None)
+            frame = frame.f_back
+
+        phase = next(
+            (phase for phase, names in PHASE_FUNCTIONS if names & function_names),
+            DEFAULT_PHASE,
+        )
+        return SampleKey(
+            cycle, phase, str(command) if command else None, tuple(reversed(stack))
+        )
+
+    def collapsed_stacks(self, cpu: bool = False) -> list[str]:
+        """Get the samples in the collapsed stack format used for flame graphs.
+
+        Args:
+            cpu: Whether to weigh the stacks by CPU time (in microseconds)
+                instead of by the number of samples
+        """
+        lines = []
+        for key, n_samples in self.samples.items():
+            weight = round(self.cpu_time[key] * 1e6) if cpu else n_samples
+            if weight <= 0:
+                continue
+            frames = [
+                f"cycle {key.cycle}" if key.cycle is not None else "no cycle",
+                key.phase,
+                *([key.command] if key.command else []),
+                *key.stack,
+            ]
+            lines.append(f"{';'.join(f.replace(';', ':') for f in frames)} {weight}")
+        return sorted(lines)
+
+    def summary(self) -> str:
+        """Get a table of the samples and CPU time per phase and per command"""
+        by_phase: defaultdict[str, list[float]] = defaultdict(lambda: [0, 0.0])
+        by_command: defaultdict[str, list[float]] = defaultdict(lambda: [0, 0.0])
+        for key, n_samples in self.samples.items():
+            by_phase[key.phase][0] += n_samples
+            by_phase[key.phase][1] += self.cpu_time[key]
+            if key.command:
+                by_command[key.command][0] += n_samples
+                by_command[key.command][1] += self.cpu_time[key]
+        total_cpu_time = sum(self.cpu_time.values()) or 1.0
+
+        def table(title: str, rows: dict[str, list[float]]) -> list[str]:
+            lines = [
+                f"{title:<24} {'Samples':>8} {'Wall (s)':>9} {'CPU (s)':>9} {'CPU %':>6}"
+            ]
+            for name, (n_samples, cpu_time) in sorted(
+                rows.items(), key=lambda r: r[1][1], reverse=True
+            ):
+                lines.append(
+                    f"{name:<24} {int(n_samples):>8} "
+                    f"{n_samples * self.interval:>9.2f} {cpu_time:>9.2f} "
+                    f"{100 * cpu_time / total_cpu_time:>6.1f}"
+                )
+            return lines
+
+        lines = table("Phase", by_phase)
+        if by_command:
+            lines += ["", *table("Command", by_command)]
+        return "\n".join(lines)
+
+    def save(self, directory: str | Path, name: str = "profile") -> list[Path]:
+        """Write the collapsed stacks and the summary table to a directory
+
+        Returns:
+            list[Path]: The paths of the written files
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        outputs = {
+            directory / f"{name}.collapsed": self.collapsed_stacks(),
+            directory / f"{name}.cpu.collapsed": self.collapsed_stacks(cpu=True),
+            directory / f"{name}.summary.txt": [self.summary()],
+        }
+        for file_path, lines in outputs.items():
+            file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return list(outputs)
+
+    def stop_and_save(self, directory: str | Path, name: str = "profile") -> None:
+        """Stop profiling, write the results and log the summary"""
+        self.stop()
+        paths = self.save(directory, name)
+        logger.info(f"\n{self.summary()}", "CPU PROFILE:")
+        logger.info(", ".join(str(p) for p in paths), "Profile written to")
@@ -0,0 +1,239 @@
+"""Lightweight tracing of where an agent's wall time goes.
+
+Spans are only recorded while the tracer is enabled. When it is disabled, opening
+a span returns a shared no-op span, so instrumented code pays next to nothing.
+Recorded spans can be exported as Chrome trace events, which can be viewed in
+chrome://tracing or https://ui.perfetto.dev, or as JSON lines.
+
+Usage:
+
+    with tracer.span("chat_with_ai", model=model) as span:
+        ...
+        span.set_attribute("tokens", n_tokens)
+
+    @tracer.traced("execute_command")
+    def execute_command(...):
+        tracer.current_span().set_attribute("command", command_name)
+"""
+from __future__ import annotations
+
+import functools
+import itertools
+import os
+import threading
+import time
+from contextvars import ContextVar, Token
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+import orjson
+
+MAX_SPANS = 100_000
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span:
+    """A timed operation with attributes, e.g. an LLM call or a command execution"""
+
+    __slots__ = (
+        "tracer",
+        "name",
+        "span_id",
+        "parent_id",
+        "thread_id",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "_token",
+    )
+
+    def __init__(self, tracer: Tracer, name: str, attributes: dict[str, Any]):
+        parent = _current_span.get()
+        self.tracer = tracer
+        self.name = name
+        self.span_id: int = next(tracer._ids)
+        self.parent_id: Optional[int] = parent.span_id if parent else None
+        self.thread_id = threading.get_ident()
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self._token: Optional[Token] = None
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def start(self) -> Span:
+        """Make this the current span, so that spans opened after it are its children"""
+        self._token = _current_span.set(self)
+        return self
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.perf_counter_ns()
+        if self._token is not None:
+            _current_span.reset(self._token)
+            self._token = None
+        self.tracer._record(self)
+
+    def __enter__(self) -> Span:
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        self.end()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "id": self.span_id,
+            "parent_id": self.parent_id,
+            "thread_id": self.thread_id,
+            "start_ms": (self.start_ns - self.tracer.epoch_ns) / 1e6,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+        }
+
+
+class NoopSpan:
+    """Span that records nothing; returned while tracing is disabled"""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+    def start(self) -> NoopSpan:
+        return self
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self) -> NoopSpan:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """Records spans and exports them as Chrome trace events or JSON lines"""
+
+    def __init__(self, max_spans: int = MAX_SPANS):
+        self.enabled = False
+        self.max_spans = max_spans
+        self.epoch_ns = time.perf_counter_ns()
+        self.spans: list[Span] = []
+        self.n_dropped = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans = []
+            self.n_dropped = 0
+
+    def span(self, name: str, **attributes: Any) -> Span | NoopSpan:
+        """Open a span, to be used as a context manager or with `start()`/`end()`"""
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def current_span(self) -> Span | NoopSpan:
+        """Get the innermost open span, e.g. to add attributes to it"""
+        if not self.enabled:
+            return NOOP_SPAN
+        return _current_span.get() or NOOP_SPAN
+
+    def traced(self, name: Optional[str] = None) -> Callable[[F], F]:
+        """Decorator that records each call of a function as a span"""
+
+        def decorator(func: F) -> F:
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, span_name, {}):
+                    return func(*args, **kwargs)
+
+            return wrapper  # type: ignore
+
+        return decorator
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            if len(self.spans) < self.max_spans:
+                self.spans.append(span)
+            else:
+                self.n_dropped += 1
+
+    def export_chrome_trace(self, file_path: str | Path) -> None:
+        """Write the recorded spans as a Chrome trace event file"""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        events = [
+            {
+                "name": span.name,
+                "cat": "autogpt",
+                "ph": "X",
+                "ts": (span.start_ns - self.epoch_ns) / 1e3,
+                "dur": (span.end_ns - span.start_ns) / 1e3,  # type: ignore
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.attributes,
+            }
+            for span in spans
+        ]
+        with open(file_path, "wb") as f:
+            f.write(
+                orjson.dumps(
+                    {"traceEvents": events, "displayTimeUnit": "ms"}, default=str
+                )
+            )
+
+    def export_jsonl(self, file_path: str | Path) -> None:
+        """Write the recorded spans as JSON lines"""
+        with self._lock:
+            spans = list(self.spans)
+        with open(file_path, "wb") as f:
+            for span in spans:
+                f.write(orjson.dumps(span.to_dict(), default=str) + b"\n")
+
+    def export(self, file_path: str | Path) -> None:
+        """Write the recorded spans as JSON lines if the file name ends with `.jsonl`,
+        and as Chrome trace events otherwise"""
+        if str(file_path).endswith(".jsonl"):
+            self.export_jsonl(file_path)
+        else:
+            self.export_chrome_trace(file_path)
+
+
+tracer = Tracer()
@@ -1,6 +1,8 @@
 """The application entry point.  Can be invoked by a CLI or any other front end application."""
+import atexit
 import logging
 import sys
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
@@ -9,8 +11,12 @@ from colorama import Fore, Style
 from autogpt.agent import Agent
 from autogpt.config.config import ConfigBuilder, check_openai_api_key
 from autogpt.configurator import create_config
-from autogpt.logs import logger
+from autogpt.logs import console_renderer, logger
+from autogpt.logs.memory_tracker import MemoryTracker
+from autogpt.logs.profiler import SamplingProfiler
+from autogpt.logs.tracing import tracer
 from autogpt.memory.vector import get_memory
+from autogpt.models.command_manifest import CommandManifest
 from autogpt.models.command_registry import CommandRegistry
 from autogpt.plugins import scan_plugins
 from autogpt.prompts.prompt import DEFAULT_TRIGGERING_PROMPT, construct_main_ai_config
@@ -52,9 +58,31 @@ def run_auto_gpt(
     ai_name: Optional[str] = None,
     ai_role: Optional[str] = None,
     ai_goals: tuple[str] = tuple(),
+    trace_file: Optional[str] = None,
+    profile: bool = False,
+    track_memory: bool = False,
 ):
     # Configure logging before we do anything else.
     logger.set_level(logging.DEBUG if debug else logging.INFO)
+    if trace_file:
+        tracer.enable()
+        atexit.register(tracer.export, trace_file)
+    if profile:
+        profiler = SamplingProfiler().start()
+        atexit.register(
+            profiler.stop_and_save,
+            Path(logger.get_log_directory()) / "profiles",
+            f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+        )
+    memory_tracker = None
+    if track_memory:
+        # Start tracing early, so that the first report covers the startup
+        memory_tracker = MemoryTracker().start()
+        atexit.register(
+            memory_tracker.save,
+            Path(logger.get_log_directory())
+            / f"memory_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl",
+        )
 
     config = ConfigBuilder.build_config_from_env()
     # HACK: This is a hack to allow the config into the logger without having to pass it around everywhere
@@ -128,9 +156,19 @@ def run_auto_gpt(
     # HACK: doing this here to collect some globals that depend on the workspace.
     Workspace.build_file_logger_path(config, workspace_directory)
 
+    atexit.register(
+        lambda: logger.debug(f"Console output: {console_renderer.summary()}")
+    )
     config.plugins = scan_plugins(config, config.debug_mode)
+    if config.plugins:
+        atexit.register(
+            lambda: logger.debug(
+                f"Plugin hook timings:\n{config.plugin_hooks.summary()}"
+            )
+        )
     # Create a CommandRegistry instance and scan default folder
     command_registry = CommandRegistry()
+    command_manifest = CommandManifest.load()
 
     logger.debug(
         f"The following command categories are disabled: {config.disabled_command_categories}"
@@ -144,7 +182,7 @@ def run_auto_gpt(
     )
 
     for command_category in enabled_command_categories:
-        command_registry.import_commands(command_category)
+        command_registry.import_commands(command_category, command_manifest)
 
     # Unregister commands that are incompatible with the current config
     incompatible_commands = []
@@ -174,10 +212,8 @@ def run_auto_gpt(
 
     # add chat plugins capable of report to logger
     if config.chat_messages_enabled:
-        for plugin in config.plugins:
-            if hasattr(plugin, "can_handle_report") and plugin.can_handle_report():
-                logger.info(f"Loaded plugin into logger: {plugin.__class__.__name__}")
-                logger.chat_plugins.append(plugin)
+        for plugin in config.plugin_hooks.handlers("report"):
+            logger.info(f"Loaded plugin into logger: {plugin.__class__.__name__}")
 
     # Initialize memory and make sure it is empty.
     # this is particularly important for indexing and referencing pinecone memory
@@ -202,4 +238,5 @@ def run_auto_gpt(
         ai_config=ai_config,
         config=config,
     )
+    agent.memory_tracker = memory_tracker
     agent.start_interaction_loop()
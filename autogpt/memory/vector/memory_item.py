@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import dataclasses
+import hashlib
 import json
-from typing import Literal
+from typing import Iterable, Literal, Optional
 
 import numpy as np
 
@@ -10,12 +11,24 @@ from autogpt.config import Config
 from autogpt.llm import Message
 from autogpt.llm.utils import count_string_tokens
 from autogpt.logs import logger
-from autogpt.processing.text import chunk_content, split_text, summarize_text
+from autogpt.processing.text import (
+    chunk_content,
+    chunk_text_stream,
+    split_text,
+    summarize_text,
+)
 
 from .utils import Embedding, get_embedding
 
 MemoryDocType = Literal["webpage", "text_file", "code_file", "agent_history"]
 
+ReusableChunks = dict[str, tuple[str, Embedding]]
+"""Summaries and embeddings of already processed chunks, by chunk hash"""
+
+
+def chunk_hash(chunk: str) -> str:
+    return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
 
 @dataclasses.dataclass
 class MemoryItem:
@@ -32,12 +45,19 @@ class MemoryItem:
     def relevance_for(self, query: str, e_query: Embedding | None = None):
         return MemoryItemRelevance.of(self, query, e_query)
 
+    def reusable_chunks(self) -> ReusableChunks:
+        """Get the summaries and embeddings of this item's chunks, by chunk hash"""
+        hashes = self.metadata.get("chunk_hashes") or [
+            chunk_hash(chunk) for chunk in self.chunks
+        ]
+        return dict(zip(hashes, zip(self.chunk_summaries, self.e_chunks)))
+
     @staticmethod
     def from_text(
         text: str,
         source_type: MemoryDocType,
         config: Config,
-        metadata: dict = {},
+        metadata: Optional[dict] = None,
         how_to_summarize: str | None = None,
         question_for_summary: str | None = None,
     ):
@@ -51,23 +71,89 @@ class MemoryItem:
                 else chunk_content(text, config.embedding_model)
             )
         ]
+        return MemoryItem.from_text_chunks(
+            text,
+            chunks,
+            source_type,
+            config,
+            metadata,
+            how_to_summarize=how_to_summarize,
+            question_for_summary=question_for_summary,
+        )
+
+    @staticmethod
+    def from_text_segments(
+        segments: Iterable[str],
+        source_type: MemoryDocType,
+        config: Config,
+        metadata: Optional[dict] = None,
+        max_chunk_length: Optional[int] = None,
+        overlap: int = 200,
+    ):
+        """Create a MemoryItem from a stream of text segments, e.g. the pages of a
+        document, chunking them as they come in."""
+        raw_segments = []
+
+        def collect(segments: Iterable[str]):
+            for segment in segments:
+                raw_segments.append(segment)
+                yield segment
+
+        chunks = [
+            chunk
+            for chunk, _ in chunk_text_stream(
+                collect(segments), config.embedding_model, max_chunk_length, overlap
+            )
+        ]
+        return MemoryItem.from_text_chunks(
+            "".join(raw_segments), chunks, source_type, config, metadata
+        )
+
+    @staticmethod
+    def from_text_chunks(
+        text: str,
+        chunks: list[str],
+        source_type: MemoryDocType,
+        config: Config,
+        metadata: Optional[dict] = None,
+        how_to_summarize: str | None = None,
+        question_for_summary: str | None = None,
+        reusable_chunks: Optional[ReusableChunks] = None,
+    ):
+        """Create a MemoryItem from text that has already been split into chunks.
+
+        Chunks that are in `reusable_chunks` aren't summarized and embedded again;
+        their stored summary and embedding are used instead.
+        """
         logger.debug("Chunks: " + str(chunks))
 
-        chunk_summaries = [
-            summary
-            for summary, _ in [
+        # Only summarize and embed chunks that haven't been processed before
+        hashes = [chunk_hash(chunk) for chunk in chunks]
+        processed: ReusableChunks = {
+            h: reusable_chunks[h]
+            for h in hashes
+            if reusable_chunks and h in reusable_chunks
+        }
+        new_chunks = {h: c for h, c in zip(hashes, chunks) if h not in processed}
+        if processed:
+            logger.debug(f"Reusing {len(processed)} of {len(chunks)} chunks")
+
+        if new_chunks:
+            new_summaries = [
                 summarize_text(
                     text_chunk,
                     config,
                     instruction=how_to_summarize,
                     question=question_for_summary,
-                )
-                for text_chunk in chunks
+                )[0]
+                for text_chunk in new_chunks.values()
             ]
-        ]
-        logger.debug("Chunk summaries: " + str(chunk_summaries))
+            new_embeddings = get_embedding(list(new_chunks.values()), config)
+            processed.update(zip(new_chunks, zip(new_summaries, new_embeddings)))
 
-        e_chunks = get_embedding(chunks, config)
+        chunk_summaries = [processed[h][0] for h in hashes]
+        e_chunks = [processed[h][1] for h in hashes]
+        logger.debug("Chunk summaries: " + str(chunk_summaries))
 
         summary = (
             chunk_summaries[0]
@@ -85,7 +171,9 @@ class MemoryItem:
         # e_average = np.average(e_chunks, axis=0, weights=[len(c) for c in chunks])
         e_summary = get_embedding(summary, config)
 
+        metadata = dict(metadata or {})
         metadata["source_type"] = source_type
+        metadata["chunk_hashes"] = hashes
 
         return MemoryItem(
             text,
@@ -101,6 +189,23 @@ class MemoryItem:
     def from_text_file(content: str, path: str, config: Config):
         return MemoryItem.from_text(content, "text_file", config, {"location": path})
 
+    @staticmethod
+    def from_text_file_segments(
+        segments: Iterable[str],
+        path: str,
+        config: Config,
+        max_chunk_length: Optional[int] = None,
+        overlap: int = 200,
+    ):
+        return MemoryItem.from_text_segments(
+            segments,
+            "text_file",
+            config,
+            {"location": path},
+            max_chunk_length=max_chunk_length,
+            overlap=overlap,
+        )
+
     @staticmethod
     def from_code_file(content: str, path: str):
         # TODO: implement tailored code memories
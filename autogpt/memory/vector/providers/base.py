@@ -1,6 +1,6 @@
 import abc
 import functools
-from typing import MutableSet, Sequence
+from typing import Iterable, MutableSet, Sequence
 
 import numpy as np
 
@@ -16,6 +16,23 @@ class VectorMemoryProvider(MutableSet[MemoryItem]):
     def __init__(self, config: Config):
         pass
 
+    def add_many(self, items: Iterable[MemoryItem]) -> None:
+        """
+        Adds multiple memories to the index at once.
+        Implementations may override this function for performance purposes,
+        e.g. to persist the index only once per batch.
+        """
+        for item in items:
+            self.add(item)
+
+    def discard_many(self, items: Iterable[MemoryItem]) -> None:
+        """
+        Removes multiple memories from the index at once.
+        Implementations may override this function for performance purposes.
+        """
+        for item in items:
+            self.discard(item)
+
     def get(self, query: str, config: Config) -> MemoryItemRelevance | None:
         """
         Gets the data from the memory that is most relevant to the given query.
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterator
+from typing import Iterable, Iterator
 
 import orjson
 
@@ -59,11 +59,27 @@ class JSONFileMemory(VectorMemoryProvider):
         self.save_index()
         return len(self.memories)
 
+    def add_many(self, items: Iterable[MemoryItem]):
+        items = list(items)
+        self.memories.extend(items)
+        logger.debug(f"Adding {len(items)} items to memory")
+        self.save_index()
+        return len(self.memories)
+
     def discard(self, item: MemoryItem):
         try:
-            self.remove(item)
-        except:
-            pass
+            self.memories.remove(item)
+        except ValueError:
+            return
+        self.save_index()
+
+    def discard_many(self, items: Iterable[MemoryItem]):
+        # Match by identity, because comparing the embeddings of every item is slow
+        discarded = {id(item) for item in items}
+        n_memories = len(self.memories)
+        self.memories = [m for m in self.memories if id(m) not in discarded]
+        if len(self.memories) < n_memories:
+            self.save_index()
 
     def clear(self):
         """Clears the data in memory."""
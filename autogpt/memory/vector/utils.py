@@ -6,6 +6,7 @@ from autogpt.config import Config
 from autogpt.llm.base import TText
 from autogpt.llm.providers import openai as iopenai
 from autogpt.logs import logger
+from autogpt.logs.tracing import tracer
 
 Embedding = list[np.float32] | np.ndarray[Any, np.dtype[np.float32]]
 """Embedding vector"""
@@ -21,6 +22,7 @@ def get_embedding(input: list[str] | list[TText]) -> list[Embedding]:
     ...
 
 
+@tracer.traced("get_embedding")
 def get_embedding(
     input: str | TText | list[str] | list[TText], config: Config
 ) -> Embedding | list[Embedding]:
@@ -41,6 +43,9 @@ def get_embedding(
         input = [text.replace("\n", " ") for text in input]
 
     model = config.embedding_model
+    tracer.current_span().set_attributes(
+        model=model, n_inputs=len(input) if multiple else 1
+    )
     kwargs = {"model": model}
     kwargs.update(config.get_openai_credentials(model))
 
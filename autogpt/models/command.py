@@ -1,3 +1,4 @@
+import importlib
 from typing import Any, Callable, Optional
 
 from autogpt.config import Config
@@ -47,3 +48,52 @@ class Command:
             for param in self.parameters
         ]
         return f"{self.name}: {self.description}, params: ({', '.join(params)})"
+
+
+class ConfigPredicate:
+    """An `enabled` predicate that holds when all of the given config attributes
+    are set. Unlike a lambda, it can be stored in the command manifest."""
+
+    def __init__(self, *attributes: str):
+        self.attributes = list(attributes)
+
+    def __call__(self, config: Config) -> bool:
+        return all(getattr(config, attribute) for attribute in self.attributes)
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, ConfigPredicate) and self.attributes == other.attributes
+        )
+
+    def __repr__(self) -> str:
+        return f"ConfigPredicate({', '.join(map(repr, self.attributes))})"
+
+
+class LazyCommand(Command):
+    """A command whose implementing module is only imported when it is first called.
+
+    Attributes:
+        module_name (str): The name of the module that implements the command.
+        function_name (str): The name of the decorated command function in the module.
+    """
+
+    def __init__(self, module_name: str, function_name: str, **kwargs):
+        self.module_name = module_name
+        self.function_name = function_name
+        self._method: Optional[Callable[..., Any]] = None
+        super().__init__(method=None, **kwargs)  # type: ignore
+
+    @property
+    def method(self) -> Callable[..., Any]:
+        if self._method is None:
+            module = importlib.import_module(self.module_name)
+            self._method = getattr(module, self.function_name).command.method
+        return self._method  # type: ignore
+
+    @method.setter
+    def method(self, method: Optional[Callable[..., Any]]) -> None:
+        self._method = method
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._method is not None
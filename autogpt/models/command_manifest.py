@@ -0,0 +1,166 @@
+"""Precomputed command metadata, so that command modules are imported lazily.
+
+Importing the command modules pulls in heavy dependencies like selenium, docker
+and the document parsers, while building the prompt only takes the names,
+descriptions and parameters of the commands. The manifest holds this metadata
+for every command module, so the registry can be populated from it; a module is
+then only imported when one of its commands is first called.
+
+Every module entry is stored with the checksum of the module's source. When the
+source has changed since the manifest was generated, the module is imported as
+usual. Regenerate the manifest after changing a command:
+
+    python -m autogpt.models.command_manifest
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import json
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from autogpt.command_decorator import AUTO_GPT_COMMAND_IDENTIFIER
+from autogpt.logs import logger
+
+from .command import Command, ConfigPredicate, LazyCommand
+from .command_parameter import CommandParameter
+
+COMMAND_MANIFEST_FILE = Path(__file__).parent.parent / "commands" / "manifest.json"
+COMMAND_MANIFEST_VERSION = 1
+
+
+def module_checksum(module_name: str) -> Optional[str]:
+    """Get the checksum of a module's source, without importing the module"""
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not Path(spec.origin).is_file():
+        return None
+    return hashlib.sha256(Path(spec.origin).read_bytes()).hexdigest()
+
+
+def serialize_enabled(enabled: Any) -> bool | dict[str, list[str]] | None:
+    if isinstance(enabled, bool):
+        return enabled
+    if isinstance(enabled, ConfigPredicate):
+        return {"requires_config": enabled.attributes}
+    # Other predicates can only be evaluated by importing the module
+    return None
+
+
+def deserialize_enabled(enabled: bool | dict[str, list[str]]) -> Any:
+    if isinstance(enabled, dict):
+        return ConfigPredicate(*enabled["requires_config"])
+    return enabled
+
+
+def describe_module(module_name: str) -> dict[str, Any]:
+    """Import a command module and describe the commands it registers"""
+    module = importlib.import_module(module_name)
+    entry: dict[str, Any] = {"checksum": module_checksum(module_name)}
+
+    commands = []
+    for attr_name in dir(module):
+        attr = getattr(module, attr_name)
+        if inspect.isclass(attr) and issubclass(attr, Command) and attr != Command:
+            # Command classes are instantiated on import
+            return entry | {"eager": True}
+        if not getattr(attr, AUTO_GPT_COMMAND_IDENTIFIER, False):
+            continue
+        command: Command = attr.command
+        enabled = serialize_enabled(command.enabled)
+        if enabled is None:
+            return entry | {"eager": True}
+        commands.append(
+            {
+                "function": attr_name,
+                "name": command.name,
+                "description": command.description,
+                "parameters": [
+                    {
+                        "name": p.name,
+                        "type": p.type,
+                        "description": p.description,
+                        "required": p.required,
+                    }
+                    for p in command.parameters
+                ],
+                "enabled": enabled,
+                "disabled_reason": command.disabled_reason,
+                "aliases": command.aliases,
+            }
+        )
+    return entry | {"commands": commands}
+
+
+class CommandManifest:
+    """The metadata of the commands in a set of modules, by module name"""
+
+    def __init__(self, modules: Optional[dict[str, dict[str, Any]]] = None):
+        self.modules = modules or {}
+
+    @classmethod
+    def generate(cls, module_names: Iterable[str]) -> CommandManifest:
+        return cls({name: describe_module(name) for name in module_names})
+
+    @classmethod
+    def load(cls, file_path: Path = COMMAND_MANIFEST_FILE) -> CommandManifest:
+        """Load a manifest; if it's missing or invalid, all modules load eagerly"""
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not load the command manifest: {e}")
+            return cls()
+        if data.get("version") != COMMAND_MANIFEST_VERSION:
+            logger.debug("The command manifest is outdated, ignoring it")
+            return cls()
+        return cls(data.get("modules", {}))
+
+    def save(self, file_path: Path = COMMAND_MANIFEST_FILE) -> None:
+        data = {"version": COMMAND_MANIFEST_VERSION, "modules": self.modules}
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(data, indent=2) + "\n")
+
+    def get_commands(self, module_name: str) -> Optional[list[LazyCommand]]:
+        """Get the commands of a module, without importing it.
+
+        Returns:
+            The commands, or None if the module has to be imported to get them,
+            because it is not in the manifest or has changed since
+        """
+        entry = self.modules.get(module_name)
+        if entry is None or entry.get("eager"):
+            return None
+        if entry.get("checksum") != module_checksum(module_name):
+            logger.debug(f"Command module {module_name} changed since the manifest")
+            return None
+
+        return [
+            LazyCommand(
+                module_name,
+                command["function"],
+                name=command["name"],
+                description=command["description"],
+                parameters=[CommandParameter(**p) for p in command["parameters"]],
+                enabled=deserialize_enabled(command["enabled"]),
+                disabled_reason=command["disabled_reason"],
+                aliases=command["aliases"],
+            )
+            for command in entry["commands"]
+        ]
+
+
+def main() -> None:
+    from autogpt.main import COMMAND_CATEGORIES
+
+    CommandManifest.generate(COMMAND_CATEGORIES).save()
+    print(f"Command manifest written to {COMMAND_MANIFEST_FILE}")
+
+
+if __name__ == "__main__":
+    main()
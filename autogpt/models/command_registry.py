@@ -1,11 +1,16 @@
+from __future__ import annotations
+
 import importlib
 import inspect
-from typing import Any
+from typing import TYPE_CHECKING, Any, Optional
 
 from autogpt.command_decorator import AUTO_GPT_COMMAND_IDENTIFIER
 from autogpt.logs import logger
 from autogpt.models.command import Command
 
+if TYPE_CHECKING:
+    from autogpt.models.command_manifest import CommandManifest
+
 
 class CommandRegistry:
     """
@@ -17,10 +22,13 @@ class CommandRegistry:
 
     commands: dict[str, Command]
     commands_aliases: dict[str, Command]
+    version: int
+    """Incremented on every change to the registered commands, see PromptCache"""
 
     def __init__(self):
         self.commands = {}
         self.commands_aliases = {}
+        self.version = 0
 
     def __contains__(self, command_name: str):
         return command_name in self.commands or command_name in self.commands_aliases
@@ -45,12 +53,14 @@ class CommandRegistry:
             )
         for alias in cmd.aliases:
             self.commands_aliases[alias] = cmd
+        self.version += 1
 
     def unregister(self, command: Command) -> None:
         if command.name in self.commands:
             del self.commands[command.name]
             for alias in command.aliases:
                 del self.commands_aliases[alias]
+            self.version += 1
         else:
             raise KeyError(f"Command '{command.name}' not found in registry.")
 
@@ -84,7 +94,9 @@ class CommandRegistry:
         ]
         return "\n".join(commands_list)
 
-    def import_commands(self, module_name: str) -> None:
+    def import_commands(
+        self, module_name: str, manifest: Optional[CommandManifest] = None
+    ) -> None:
         """
         Imports the specified Python module containing command plugins.
 
@@ -93,9 +105,18 @@ class CommandRegistry:
         as `Command` objects. The registered `Command` objects are then added to the
         `commands` dictionary of the `CommandRegistry` object.
 
+        If a manifest is given that describes the module, its commands are
+        registered from the manifest instead, and the module is only imported when
+        one of them is called.
+
         Args:
             module_name (str): The name of the module to import for command plugins.
+            manifest (CommandManifest, optional): Precomputed command metadata.
         """
+        if manifest and (commands := manifest.get_commands(module_name)) is not None:
+            for cmd in commands:
+                self.register(cmd)
+            return
 
         module = importlib.import_module(module_name)
 
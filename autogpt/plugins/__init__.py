@@ -7,8 +7,11 @@ import json
 import os
 import sys
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import TYPE_CHECKING, List
+from types import ModuleType
+from typing import TYPE_CHECKING, List, Optional
 from urllib.parse import urlparse
 from zipimport import zipimporter
 
@@ -22,10 +25,15 @@ if TYPE_CHECKING:
 
 from autogpt.logs import logger
 from autogpt.models.base_open_ai_plugin import BaseOpenAIPlugin
+from autogpt.plugins.lazy_plugin import LazyPlugin
+from autogpt.plugins.plugins_cache import PLUGINS_CACHE_FILE_NAME, PluginsCache
 
 DEFAULT_PLUGINS_CONFIG_FILE = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "..", "..", "plugins_config.yaml"
 )
+# Timeout in seconds for every request made to fetch an OpenAI plugin
+PLUGIN_REQUEST_TIMEOUT = 10
+MAX_PLUGIN_FETCH_WORKERS = 8
 
 
 def inspect_zip_for_modules(zip_path: str, debug: bool = False) -> list[str]:
@@ -61,58 +69,88 @@ def write_dict_to_json_file(data: dict, file_path: str) -> None:
         json.dump(data, file, indent=4)
 
 
+def fetch_openai_plugin_manifest_and_spec(url: str, config: Config) -> Optional[dict]:
+    """
+    Fetch the manifest and OpenAPI spec of an OpenAI plugin, unless they are cached.
+    Args:
+        url (str): URL of the plugin.
+        config (Config): Config instance including plugins config
+    Returns:
+        Optional[dict]: The manifest and spec, or None if they could not be fetched.
+    """
+    openai_plugin_client_dir = f"{config.plugins_dir}/openai/{urlparse(url).netloc}"
+    create_directory_if_not_exists(openai_plugin_client_dir)
+    if not os.path.exists(f"{openai_plugin_client_dir}/ai-plugin.json"):
+        try:
+            response = requests.get(
+                f"{url}/.well-known/ai-plugin.json", timeout=PLUGIN_REQUEST_TIMEOUT
+            )
+        except requests.exceptions.RequestException as e:
+            logger.warn(f"Error while requesting manifest from {url}: {e}")
+            return None
+        if response.status_code != 200:
+            logger.warn(f"Failed to fetch manifest for {url}: {response.status_code}")
+            return None
+        try:
+            manifest = response.json()
+            schema_version = manifest["schema_version"]
+            api_type = manifest["api"]["type"]
+        except (ValueError, KeyError) as e:
+            logger.warn(f"Invalid manifest for {url}: {type(e).__name__}: {e}")
+            return None
+        if schema_version != "v1":
+            logger.warn(f"Unsupported manifest version: {schema_version} for {url}")
+            return None
+        if api_type != "openapi":
+            logger.warn(f"Unsupported API type: {api_type} for {url}")
+            return None
+        write_dict_to_json_file(manifest, f"{openai_plugin_client_dir}/ai-plugin.json")
+    else:
+        logger.info(f"Manifest for {url} already exists")
+        with open(f"{openai_plugin_client_dir}/ai-plugin.json") as f:
+            manifest = json.load(f)
+    if not os.path.exists(f"{openai_plugin_client_dir}/openapi.json"):
+        openapi_spec = openapi_python_client._get_document(
+            url=manifest["api"]["url"], path=None, timeout=PLUGIN_REQUEST_TIMEOUT
+        )
+        if not isinstance(openapi_spec, dict):
+            logger.warn(
+                f"Error while requesting OpenAPI spec for {url}: {openapi_spec}"
+            )
+            return None
+        write_dict_to_json_file(
+            openapi_spec, f"{openai_plugin_client_dir}/openapi.json"
+        )
+    else:
+        logger.info(f"OpenAPI spec for {url} already exists")
+        with open(f"{openai_plugin_client_dir}/openapi.json") as f:
+            openapi_spec = json.load(f)
+    return {"manifest": manifest, "openapi_spec": openapi_spec}
+
+
 def fetch_openai_plugins_manifest_and_spec(config: Config) -> dict:
     """
-    Fetch the manifest for a list of OpenAI plugins.
-        Args:
-        urls (List): List of URLs to fetch.
+    Fetch the manifests of a list of OpenAI plugins, all at the same time.
+    Args:
+        config (Config): Config instance with the URLs in plugins_openai.
     Returns:
         dict: per url dictionary of manifest and spec.
     """
     # TODO add directory scan
-    manifests = {}
-    for url in config.plugins_openai:
-        openai_plugin_client_dir = f"{config.plugins_dir}/openai/{urlparse(url).netloc}"
-        create_directory_if_not_exists(openai_plugin_client_dir)
-        if not os.path.exists(f"{openai_plugin_client_dir}/ai-plugin.json"):
-            try:
-                response = requests.get(f"{url}/.well-known/ai-plugin.json")
-                if response.status_code == 200:
-                    manifest = response.json()
-                    if manifest["schema_version"] != "v1":
-                        logger.warn(
-                            f"Unsupported manifest version: {manifest['schem_version']} for {url}"
-                        )
-                        continue
-                    if manifest["api"]["type"] != "openapi":
-                        logger.warn(
-                            f"Unsupported API type: {manifest['api']['type']} for {url}"
-                        )
-                        continue
-                    write_dict_to_json_file(
-                        manifest, f"{openai_plugin_client_dir}/ai-plugin.json"
-                    )
-                else:
-                    logger.warn(
-                        f"Failed to fetch manifest for {url}: {response.status_code}"
-                    )
-            except requests.exceptions.RequestException as e:
-                logger.warn(f"Error while requesting manifest from {url}: {e}")
-        else:
-            logger.info(f"Manifest for {url} already exists")
-            manifest = json.load(open(f"{openai_plugin_client_dir}/ai-plugin.json"))
-        if not os.path.exists(f"{openai_plugin_client_dir}/openapi.json"):
-            openapi_spec = openapi_python_client._get_document(
-                url=manifest["api"]["url"], path=None, timeout=5
-            )
-            write_dict_to_json_file(
-                openapi_spec, f"{openai_plugin_client_dir}/openapi.json"
-            )
-        else:
-            logger.info(f"OpenAPI spec for {url} already exists")
-            openapi_spec = json.load(open(f"{openai_plugin_client_dir}/openapi.json"))
-        manifests[url] = {"manifest": manifest, "openapi_spec": openapi_spec}
-    return manifests
+    urls = list(config.plugins_openai)
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(
+        max_workers=min(len(urls), MAX_PLUGIN_FETCH_WORKERS)
+    ) as pool:
+        results = pool.map(
+            lambda url: fetch_openai_plugin_manifest_and_spec(url, config), urls
+        )
+        return {
+            url: manifest_spec
+            for url, manifest_spec in zip(urls, results)
+            if manifest_spec is not None
+        }
 
 
 def create_directory_if_not_exists(directory_path: str) -> bool:
@@ -209,19 +247,82 @@ def instantiate_openai_plugin_clients(
     return plugins
 
 
-def scan_plugins(config: Config, debug: bool = False) -> List[AutoGPTPluginTemplate]:
+def find_plugin_classes(module: ModuleType, module_name: str) -> list[dict[str, str]]:
+    """
+    Find the plugin classes in a plugin module.
+    Args:
+        module (ModuleType): The imported module.
+        module_name (str): The name to import the module by.
+    Returns:
+        list[dict[str, str]]: The name of the module and of the class, per class.
+    """
+    classes = []
+    for key in dir(module):
+        if key.startswith("__"):
+            continue
+
+        a_module = getattr(module, key)
+        if (
+            not inspect.isclass(a_module)
+            or a_module.__name__ == "AutoGPTPluginTemplate"
+        ):
+            continue
+
+        if issubclass(a_module, AutoGPTPluginTemplate):
+            classes.append({"module": module_name, "class": a_module.__name__})
+        else:
+            logger.debug(
+                f"Skipping '{key}' because it doesn't subclass AutoGPTPluginTemplate."
+            )
+    return classes
+
+
+def load_plugin_class(
+    module_name: str, class_name: str, zip_path: Optional[Path] = None
+) -> type[AutoGPTPluginTemplate]:
+    """
+    Import the module of a plugin, unless it's imported already, and get its class.
+    Args:
+        module_name (str): Name of the module the class is in.
+        class_name (str): Name of the plugin class.
+        zip_path (Path, optional): The zipfile the module is in, if it's zipped.
+    Returns:
+        type[AutoGPTPluginTemplate]: The plugin class.
+    """
+    module = sys.modules.get(module_name)
+    if module is None:
+        if zip_path is not None:
+            module = zipimporter(str(zip_path)).load_module(module_name)
+        else:
+            module = importlib.import_module(module_name)
+    return getattr(module, class_name)
+
+
+def scan_plugins(
+    config: Config, debug: bool = False
+) -> List[AutoGPTPluginTemplate | LazyPlugin]:
     """Scan the plugins directory for plugins and loads them.
 
+    The plugin classes found in the plugins are cached in the plugins directory, or
+    in `config.plugins_cache_file` if it's set, so plugins that haven't changed are
+    not inspected again. Plugins are only created when they are first used, see
+    LazyPlugin.
+
     Args:
         config (Config): Config instance including plugins config
         debug (bool, optional): Enable debug logging. Defaults to False.
 
     Returns:
-        List[Tuple[str, Path]]: List of plugins.
+        List[AutoGPTPluginTemplate | LazyPlugin]: List of plugins.
     """
-    loaded_plugins = []
+    loaded_plugins: list[AutoGPTPluginTemplate | LazyPlugin] = []
     # Generic plugins
     plugins_path = Path(config.plugins_dir)
+    plugins_cache = PluginsCache.load(
+        Path(config.plugins_cache_file)
+        if config.plugins_cache_file
+        else plugins_path / PLUGINS_CACHE_FILE_NAME
+    )
 
     plugins_config = config.plugins_config
     # Directory-based plugins
@@ -234,67 +335,78 @@ def scan_plugins(config: Config, debug: bool = False) -> List[AutoGPTPluginTempl
         plugin_module_name = plugin_module_path[-1]
         qualified_module_name = ".".join(plugin_module_path)
 
-        __import__(qualified_module_name)
-        plugin = sys.modules[qualified_module_name]
-
         if not plugins_config.is_enabled(plugin_module_name):
             logger.warn(
                 f"Plugin folder {plugin_module_name} found but not configured. If this is a legitimate plugin, please add it to plugins_config.yaml (key: {plugin_module_name})."
             )
             continue
 
-        for _, class_obj in inspect.getmembers(plugin):
-            if (
-                hasattr(class_obj, "_abc_impl")
+        plugin_classes = plugins_cache.get(Path(plugin_path))
+        if plugin_classes is None:
+            __import__(qualified_module_name)
+            plugin = sys.modules[qualified_module_name]
+            plugin_classes = [
+                {"module": qualified_module_name, "class": class_obj.__name__}
+                for _, class_obj in inspect.getmembers(plugin)
+                if hasattr(class_obj, "_abc_impl")
                 and AutoGPTPluginTemplate in class_obj.__bases__
-            ):
-                loaded_plugins.append(class_obj())
+            ]
+            plugins_cache.set(Path(plugin_path), plugin_classes)
+
+        for plugin_class in plugin_classes:
+            loaded_plugins.append(
+                LazyPlugin(
+                    plugin_class["class"],
+                    partial(
+                        load_plugin_class, plugin_class["module"], plugin_class["class"]
+                    ),
+                )
+            )
 
     # Zip-based plugins
     for plugin in plugins_path.glob("*.zip"):
-        if moduleList := inspect_zip_for_modules(str(plugin), debug):
-            for module in moduleList:
-                plugin = Path(plugin)
+        plugin_classes = plugins_cache.get(plugin)
+        if plugin_classes is None:
+            plugin_classes = []
+            for module in inspect_zip_for_modules(str(plugin), debug):
                 module = Path(module)
                 logger.debug(f"Zipped Plugin: {plugin}, Module: {module}")
                 zipped_package = zipimporter(str(plugin))
                 zipped_module = zipped_package.load_module(str(module.parent))
+                plugin_classes += find_plugin_classes(zipped_module, str(module.parent))
+            plugins_cache.set(plugin, plugin_classes)
 
-                for key in dir(zipped_module):
-                    if key.startswith("__"):
-                        continue
-
-                    a_module = getattr(zipped_module, key)
-                    if not inspect.isclass(a_module):
-                        continue
-
-                    if (
-                        issubclass(a_module, AutoGPTPluginTemplate)
-                        and a_module.__name__ != "AutoGPTPluginTemplate"
-                    ):
-                        plugin_name = a_module.__name__
-                        plugin_configured = plugins_config.get(plugin_name) is not None
-                        plugin_enabled = plugins_config.is_enabled(plugin_name)
-
-                        if plugin_configured and plugin_enabled:
-                            logger.debug(
-                                f"Loading plugin {plugin_name}. Enabled in plugins_config.yaml."
-                            )
-                            loaded_plugins.append(a_module())
-                        elif plugin_configured and not plugin_enabled:
-                            logger.debug(
-                                f"Not loading plugin {plugin_name}. Disabled in plugins_config.yaml."
-                            )
-                        elif not plugin_configured:
-                            logger.warn(
-                                f"Not loading plugin {plugin_name}. Key '{plugin_name}' was not found in plugins_config.yaml. "
-                                f"Zipped plugins should use the class name ({plugin_name}) as the key."
-                            )
-                    else:
-                        if a_module.__name__ != "AutoGPTPluginTemplate":
-                            logger.debug(
-                                f"Skipping '{key}' because it doesn't subclass AutoGPTPluginTemplate."
-                            )
+        for plugin_class in plugin_classes:
+            plugin_name = plugin_class["class"]
+            plugin_configured = plugins_config.get(plugin_name) is not None
+            plugin_enabled = plugins_config.is_enabled(plugin_name)
+
+            if plugin_configured and plugin_enabled:
+                logger.debug(
+                    f"Loading plugin {plugin_name}. Enabled in plugins_config.yaml."
+                )
+                loaded_plugins.append(
+                    LazyPlugin(
+                        plugin_name,
+                        partial(
+                            load_plugin_class,
+                            plugin_class["module"],
+                            plugin_name,
+                            zip_path=plugin,
+                        ),
+                    )
+                )
+            elif plugin_configured and not plugin_enabled:
+                logger.debug(
+                    f"Not loading plugin {plugin_name}. Disabled in plugins_config.yaml."
+                )
+            elif not plugin_configured:
+                logger.warn(
+                    f"Not loading plugin {plugin_name}. Key '{plugin_name}' was not found in plugins_config.yaml. "
+                    f"Zipped plugins should use the class name ({plugin_name}) as the key."
+                )
+
+    plugins_cache.save()
 
     # OpenAI plugins
     if config.plugins_openai:
@@ -316,5 +428,9 @@ def scan_plugins(config: Config, debug: bool = False) -> List[AutoGPTPluginTempl
     if loaded_plugins:
         logger.info(f"\nPlugins found: {len(loaded_plugins)}\n" "--------------------")
     for plugin in loaded_plugins:
+        if isinstance(plugin, LazyPlugin) and not plugin.lazy_is_loaded:
+            # Don't create the plugin just to log its name
+            logger.info(f"{plugin.lazy_class_name} (loaded on first use)")
+            continue
         logger.info(f"{plugin._name}: {plugin._version} - {plugin._description}")
     return loaded_plugins
@@ -0,0 +1,146 @@
+"""Dispatch of plugin hooks to the plugins that handle them.
+
+The plugins that handle a hook are resolved once, the first time the hook is
+dispatched, instead of calling `can_handle_*()` on every plugin on every call.
+Resolving a hook on first use rather than at load time keeps plugins from being
+created before they're needed (see LazyPlugin). Call `invalidate()` after adding
+or changing plugins at runtime.
+
+Every hook call is timed. With a time budget, a plugin that runs over budget on
+a hook too often is no longer called for that hook.
+
+Usage:
+
+    hooks = config.plugin_hooks
+    for plugin in hooks.handlers("post_command"):
+        with hooks.run("post_command", plugin):
+            result = plugin.post_command(command_name, result)
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+from autogpt.logs import logger
+from autogpt.logs.tracing import NoopSpan, Span, tracer
+
+MAX_BUDGET_OVERRUNS = 3
+
+
+@dataclass
+class HookTiming:
+    """How often a plugin ran a hook, and how long that took"""
+
+    calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    budget_overruns: int = 0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+class PluginHooks:
+    """The plugins that handle each hook, and how long they take to run it.
+
+    Args:
+        plugins: The loaded plugins, in the order their hooks should be called
+        time_budget: The time in seconds a plugin may take to run a hook
+        max_budget_overruns: How often a plugin may run over budget on a hook
+            before it's no longer called for that hook
+    """
+
+    def __init__(
+        self,
+        plugins: list[Any],
+        time_budget: Optional[float] = None,
+        max_budget_overruns: int = MAX_BUDGET_OVERRUNS,
+    ):
+        self.plugins = plugins
+        self.time_budget = time_budget
+        self.max_budget_overruns = max_budget_overruns
+        self.timings: dict[tuple[str, str], HookTiming] = {}
+        self._handlers: dict[str, list[Any]] = {}
+        self._lock = threading.Lock()
+
+    def handlers(self, hook: str) -> list[Any]:
+        """Get the plugins that handle a hook, e.g. "post_command".
+
+        Only for hooks whose `can_handle_*()` takes no arguments; hooks like
+        chat_completion have to be checked on every call.
+        """
+        handlers = self._handlers.get(hook)
+        if handlers is None:
+            with self._lock:
+                handlers = self._handlers.get(hook)
+                if handlers is None:
+                    handlers = []
+                    for plugin in self.plugins:
+                        can_handle = getattr(plugin, f"can_handle_{hook}", None)
+                        if can_handle is not None and can_handle():
+                            handlers.append(plugin)
+                    self._handlers[hook] = handlers
+        return handlers
+
+    def invalidate(self, hook: Optional[str] = None) -> None:
+        """Resolve the handlers of a hook, or of all hooks, again on next use"""
+        with self._lock:
+            if hook is None:
+                self._handlers.clear()
+            else:
+                self._handlers.pop(hook, None)
+
+    @contextmanager
+    def run(self, hook: str, plugin: Any) -> Iterator[Span | NoopSpan]:
+        """Time a plugin running a hook, in a tracing span "plugin.<hook>" """
+        plugin_name = plugin.__class__.__name__
+        started_at = time.perf_counter()
+        try:
+            with tracer.span(f"plugin.{hook}", plugin=plugin_name) as span:
+                yield span
+        finally:
+            self._record(hook, plugin, time.perf_counter() - started_at)
+
+    def _record(self, hook: str, plugin: Any, duration: float) -> None:
+        plugin_name = plugin.__class__.__name__
+        with self._lock:
+            timing = self.timings.setdefault((hook, plugin_name), HookTiming())
+            timing.calls += 1
+            timing.total_time += duration
+            timing.max_time = max(timing.max_time, duration)
+
+            if self.time_budget is None or duration <= self.time_budget:
+                return
+            timing.budget_overruns += 1
+            logger.warn(
+                f"Plugin {plugin_name} took {duration:.2f}s to run {hook},"
+                f" over its budget of {self.time_budget:.2f}s"
+            )
+            handlers = self._handlers.get(hook, [])
+            if timing.budget_overruns < self.max_budget_overruns or not any(
+                handler is plugin for handler in handlers
+            ):
+                return
+            # Replace the list, as the caller may still be iterating over it
+            self._handlers[hook] = [h for h in handlers if h is not plugin]
+            logger.warn(
+                f"Plugin {plugin_name} ran over budget {timing.budget_overruns} times,"
+                f" it will no longer be called for {hook}"
+            )
+
+    def summary(self) -> str:
+        """The hook timings, slowest first"""
+        lines = [
+            f"{plugin_name}.{hook}: {timing.calls} calls,"
+            f" {timing.total_time * 1000:.1f} ms total,"
+            f" {timing.mean_time * 1000:.1f} ms mean,"
+            f" {timing.max_time * 1000:.1f} ms max"
+            for (hook, plugin_name), timing in sorted(
+                self.timings.items(), key=lambda item: -item[1].total_time
+            )
+        ]
+        return "\n".join(lines)
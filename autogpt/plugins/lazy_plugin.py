@@ -0,0 +1,77 @@
+"""A stand-in for a plugin, which creates the plugin when it is first used."""
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Optional
+
+from auto_gpt_plugin_template import AutoGPTPluginTemplate
+
+from autogpt.logs import logger
+
+
+class LazyPlugin:
+    """Loads the class of a plugin, and creates the plugin, on first use.
+
+    Getting any attribute of the plugin, like a `can_handle_*` hook, creates it.
+    The class of the plugin is loaded without creating it when only the class is
+    asked for, so `isinstance()` and `plugin.__class__` work as for the plugin.
+
+    Attributes of the stand-in itself are prefixed with `_lazy_`, so they can't
+    clash with those of the plugin.
+    """
+
+    def __init__(
+        self,
+        class_name: str,
+        load_class: Callable[[], type[AutoGPTPluginTemplate]],
+    ):
+        self._lazy_class_name = class_name
+        self._lazy_load_class = load_class
+        self._lazy_class: Optional[type[AutoGPTPluginTemplate]] = None
+        self._lazy_plugin: Optional[AutoGPTPluginTemplate] = None
+        self._lazy_lock = threading.Lock()
+
+    @property
+    def lazy_class_name(self) -> str:
+        return self._lazy_class_name
+
+    @property
+    def lazy_is_loaded(self) -> bool:
+        """Whether the plugin has been created"""
+        return self._lazy_plugin is not None
+
+    @property
+    def lazy_plugin_class(self) -> type[AutoGPTPluginTemplate]:
+        if self._lazy_class is None:
+            self._lazy_class = self._lazy_load_class()
+        return self._lazy_class
+
+    @property
+    def lazy_plugin(self) -> AutoGPTPluginTemplate:
+        """The plugin, which is created the first time it is needed"""
+        if self._lazy_plugin is None:
+            with self._lazy_lock:
+                if self._lazy_plugin is None:
+                    logger.debug(f"Loading plugin {self._lazy_class_name}")
+                    self._lazy_plugin = self.lazy_plugin_class()
+        return self._lazy_plugin
+
+    @property  # type: ignore[misc]
+    def __class__(self) -> type:
+        return self.lazy_plugin_class
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes that are not set on the stand-in itself
+        if name.startswith("_lazy_"):
+            raise AttributeError(name)
+        return getattr(self.lazy_plugin, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name.startswith("_lazy_"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.lazy_plugin, name, value)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.lazy_is_loaded else "not loaded"
+        return f"<LazyPlugin {self._lazy_class_name} ({state})>"
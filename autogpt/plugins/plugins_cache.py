@@ -0,0 +1,87 @@
+"""A cache of the plugin classes found in the plugins directory.
+
+Finding the plugin classes in a plugin means importing it, or opening the zip
+file and loading its modules. The cache keeps the classes found in every plugin,
+keyed by the path of the plugin and stored with the checksum of its files, so an
+unchanged plugin is not inspected again on the next start.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+
+from autogpt.logs import logger
+
+PLUGINS_CACHE_FILE_NAME = ".plugins_cache.json"
+PLUGINS_CACHE_VERSION = 1
+
+
+def plugin_checksum(plugin_path: Path) -> str:
+    """Get the checksum of a zipped plugin, or of all files of a plugin folder"""
+    sha256 = hashlib.sha256()
+    if plugin_path.is_file():
+        sha256.update(plugin_path.read_bytes())
+        return sha256.hexdigest()
+
+    for file_path in sorted(plugin_path.rglob("*")):
+        if not file_path.is_file() or "__pycache__" in file_path.parts:
+            continue
+        sha256.update(file_path.relative_to(plugin_path).as_posix().encode())
+        sha256.update(file_path.read_bytes())
+    return sha256.hexdigest()
+
+
+class PluginsCache:
+    """The plugin classes found in every plugin, by path of the plugin.
+
+    The classes of a plugin are stored as a list of dicts with the name of the
+    module they are in ("module") and their own name ("class").
+    """
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        self.plugins: dict[str, dict] = {}
+        self._changed = False
+
+    @classmethod
+    def load(cls, file_path: Path) -> PluginsCache:
+        """Load a cache file; if it's missing or invalid, the cache starts empty"""
+        cache = cls(file_path)
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cache
+        if data.get("version") == PLUGINS_CACHE_VERSION:
+            cache.plugins = data.get("plugins", {})
+        return cache
+
+    def get(self, plugin_path: Path) -> Optional[list[dict[str, str]]]:
+        """Get the classes of a plugin, or None if it has changed since it was cached"""
+        entry = self.plugins.get(str(plugin_path))
+        if entry is None or entry["checksum"] != plugin_checksum(plugin_path):
+            return None
+        logger.debug(f"Plugin {plugin_path} is unchanged, using the cached classes")
+        return entry["classes"]
+
+    def set(self, plugin_path: Path, classes: list[dict[str, str]]) -> None:
+        self.plugins[str(plugin_path)] = {
+            "checksum": plugin_checksum(plugin_path),
+            "classes": classes,
+        }
+        self._changed = True
+
+    def save(self) -> None:
+        """Write the cache file, if anything was added to the cache"""
+        if not self._changed:
+            return
+        data = {"version": PLUGINS_CACHE_VERSION, "plugins": self.plugins}
+        try:
+            with open(self.file_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4)
+        except OSError as e:
+            logger.warn(f"Could not write the plugins cache {self.file_path}: {e}")
+            return
+        self._changed = False
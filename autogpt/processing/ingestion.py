@@ -0,0 +1,419 @@
+"""Parallel, resumable pipeline for ingesting many files into memory"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+from autogpt.commands.file_operations_utils import read_textual_file_segments
+from autogpt.config import Config
+from autogpt.logs import logger
+from autogpt.memory.vector import MemoryItem, VectorMemory
+from autogpt.memory.vector.memory_item import ReusableChunks
+from autogpt.processing.text import chunk_text_stream
+
+INGESTION_LLM_WORKERS = 4
+INGESTION_BATCH_SIZE = 32
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_content_hash(file_path: str) -> str:
+    """Get the SHA-256 hex digest of the content of a file"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while block := f.read(HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@dataclass
+class PreparedFile:
+    """A file that has been parsed and chunked, and is ready to be memorized"""
+
+    path: str
+    content_hash: str
+    text: str = ""
+    chunks: list[str] = field(default_factory=list)
+    n_tokens: int = 0
+    n_reused_chunks: int = 0
+    unchanged: bool = False
+
+
+def prepare_file(
+    file_path: str,
+    known_hash: Optional[str],
+    for_model: str,
+    max_chunk_length: Optional[int] = None,
+    overlap: int = 200,
+) -> PreparedFile:
+    """Parse and chunk a file, unless its content hash matches `known_hash`.
+
+    This is the CPU-bound stage of the pipeline, so it must stay picklable in order
+    to run in a worker process.
+    """
+    content_hash = file_content_hash(file_path)
+    if content_hash == known_hash:
+        return PreparedFile(file_path, content_hash, unchanged=True)
+
+    segments = []
+
+    def collect(segments_in: Iterable[str]):
+        for segment in segments_in:
+            segments.append(segment)
+            yield segment
+
+    chunks = list(
+        chunk_text_stream(
+            collect(read_textual_file_segments(file_path, logger)),
+            for_model,
+            max_chunk_length,
+            overlap,
+        )
+    )
+    return PreparedFile(
+        file_path,
+        content_hash,
+        text="".join(segments),
+        chunks=[chunk for chunk, _ in chunks],
+        n_tokens=sum(length for _, length in chunks),
+    )
+
+
+class IngestionManifest:
+    """Append-only checkpoint of the files that have been ingested, and their hashes.
+
+    The manifest is a JSONL file: a header line with the ingestion parameters,
+    followed by one line per ingested file. Later lines take precedence, so
+    recording a file is a cheap append regardless of how many files came before.
+    A manifest that was written with different parameters is discarded.
+    """
+
+    def __init__(self, file_path: str | Path, params: dict):
+        self.file_path = Path(file_path)
+        self.params = params
+        self.hashes: dict[str, str] = {}
+        self._load()
+
+    def get(self, file_path: str) -> Optional[str]:
+        return self.hashes.get(file_path)
+
+    def record(self, entries: Iterable[tuple[str, str]]) -> None:
+        """Record files as ingested, and persist them to the manifest file"""
+        lines = []
+        for file_path, content_hash in entries:
+            self.hashes[file_path] = content_hash
+            lines.append(json.dumps({"path": file_path, "hash": content_hash}) + "\n")
+        self._append(lines)
+
+    def forget(self, file_paths: Iterable[str]) -> None:
+        """Remove files from the manifest, e.g. because they have been deleted"""
+        lines = []
+        for file_path in file_paths:
+            self.hashes.pop(file_path, None)
+            lines.append(json.dumps({"path": file_path, "hash": None}) + "\n")
+        self._append(lines)
+
+    def _append(self, lines: list[str]) -> None:
+        if not lines:
+            return
+        with self.file_path.open("a", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def reset(self) -> None:
+        self.hashes.clear()
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.file_path.open("w", encoding="utf-8") as f:
+            f.write(json.dumps({"params": self.params}) + "\n")
+
+    def _load(self) -> None:
+        if not self.file_path.is_file():
+            self.reset()
+            return
+
+        with self.file_path.open("r", encoding="utf-8") as f:
+            lines = iter(f)
+            try:
+                header = json.loads(next(lines))
+            except (StopIteration, json.JSONDecodeError):
+                header = {}
+            if header.get("params") != self.params:
+                logger.info(
+                    f"Ingestion parameters changed; discarding manifest {self.file_path}"
+                )
+                self.reset()
+                return
+
+            for line in lines:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line may be incomplete if the ingestion was killed
+                    continue
+                if entry["hash"] is None:
+                    self.hashes.pop(entry["path"], None)
+                else:
+                    self.hashes[entry["path"]] = entry["hash"]
+
+
+@dataclass
+class IngestionStats:
+    """Counters and throughput figures of an ingestion run"""
+
+    started_at: float = field(default_factory=time.monotonic)
+    files_ingested: int = 0
+    files_skipped: int = 0
+    files_failed: dict[str, str] = field(default_factory=dict)
+    files_purged: int = 0
+    n_chunks: int = 0
+    n_reused_chunks: int = 0
+    n_tokens: int = 0
+
+    @property
+    def files_processed(self) -> int:
+        return self.files_ingested + self.files_skipped + len(self.files_failed)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files_processed / max(self.elapsed, 1e-9)
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.n_tokens / max(self.elapsed, 1e-9)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.files_ingested} files ingested, "
+            f"{self.files_skipped} skipped, {len(self.files_failed)} failed, "
+            f"{self.files_purged} purged; {self.n_chunks} chunks "
+            f"({self.n_reused_chunks} reused), {self.n_tokens} tokens "
+            f"in {self.elapsed:.1f}s "
+            f"({self.files_per_second:.2f} files/s, "
+            f"{self.tokens_per_second:.0f} tokens/s)"
+        )
+
+
+class IngestionPipeline:
+    """Ingests files into memory in three overlapping stages:
+
+    1. parse, hash and chunk files in a process pool;
+    2. summarize and embed the chunks with concurrent LLM calls;
+    3. add the resulting memories to the memory in batches, and checkpoint them in
+       the manifest, so that an interrupted ingestion can be resumed.
+
+    Files whose content hash matches the manifest, and empty files, are skipped.
+    When a file has changed, only its new chunks are summarized and embedded: the
+    stored summaries and embeddings of its unchanged chunks are reused, and its old
+    memories are replaced.
+    """
+
+    def __init__(
+        self,
+        memory: VectorMemory,
+        config: Config,
+        manifest: Optional[IngestionManifest] = None,
+        max_chunk_length: Optional[int] = None,
+        overlap: int = 200,
+        parse_workers: Optional[int] = None,
+        llm_workers: int = INGESTION_LLM_WORKERS,
+        batch_size: int = INGESTION_BATCH_SIZE,
+        use_processes: bool = True,
+    ):
+        self.memory = memory
+        self.config = config
+        self.manifest = manifest
+        self.max_chunk_length = max_chunk_length
+        self.overlap = overlap
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.llm_workers = llm_workers
+        self.batch_size = batch_size
+        self.use_processes = use_processes
+        self._existing: dict[str, list[MemoryItem]] = {}
+
+    @property
+    def params(self) -> dict:
+        """The parameters that determine the memories created from a file"""
+        return {
+            "model": self.config.embedding_model,
+            "max_length": self.max_chunk_length,
+            "overlap": self.overlap,
+        }
+
+    def run(
+        self, files: Iterable[str], purge_deleted_in: Optional[str] = None
+    ) -> IngestionStats:
+        """Ingest the given files.
+
+        Args:
+            files: Paths of the files to ingest. May be a lazy iterable, which is
+                consumed only as fast as the pipeline can process the files.
+            purge_deleted_in: A directory to purge the memories of deleted files of.
+
+        Returns:
+            IngestionStats: The results of the run
+        """
+        stats = IngestionStats()
+        batch: list[tuple[PreparedFile, MemoryItem]] = []
+        pending: dict[Future, str] = {}
+        max_in_flight = 2 * (self.parse_workers + self.llm_workers)
+        files = iter(files)
+
+        # The memories of previously ingested files, to reuse or replace
+        self._existing = {}
+        for memory_item in self.memory:
+            if memory_item.metadata.get("source_type") == "text_file":
+                location = memory_item.metadata.get("location")
+                self._existing.setdefault(location, []).append(memory_item)
+
+        parse_pool: Executor = (
+            ProcessPoolExecutor(self.parse_workers)
+            if self.use_processes
+            else ThreadPoolExecutor(self.parse_workers)
+        )
+        llm_pool = ThreadPoolExecutor(self.llm_workers)
+
+        def submit_next_files():
+            while len(pending) < max_in_flight:
+                file_path = next(files, None)
+                if file_path is None:
+                    return
+                file_path = os.path.abspath(file_path)
+                future = parse_pool.submit(
+                    prepare_file,
+                    file_path,
+                    self.manifest.get(file_path) if self.manifest else None,
+                    self.config.embedding_model,
+                    self.max_chunk_length,
+                    self.overlap,
+                )
+                pending[future] = file_path
+
+        try:
+            submit_next_files()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.warn(f"Error while ingesting file '{file_path}': {e}")
+                        stats.files_failed[file_path] = str(e)
+                        continue
+
+                    if isinstance(result, PreparedFile):
+                        if result.unchanged or not result.chunks:
+                            stats.files_skipped += 1
+                            if not result.unchanged:
+                                self._flush([(result, None)], stats)
+                            continue
+                        pending[llm_pool.submit(self._memorize, result)] = file_path
+                    else:
+                        batch.append(result)
+                        if len(batch) >= self.batch_size:
+                            self._flush(batch, stats)
+                submit_next_files()
+            self._flush(batch, stats)
+            if purge_deleted_in:
+                self._purge_deleted(purge_deleted_in, stats)
+        except KeyboardInterrupt:
+            logger.warn("Ingestion interrupted; saving the progress made so far")
+            self._flush(batch, stats)
+            raise
+        finally:
+            parse_pool.shutdown(cancel_futures=True)
+            llm_pool.shutdown(cancel_futures=True)
+
+        logger.info(f"Ingestion finished: {stats}")
+        return stats
+
+    def _memorize(self, file: PreparedFile) -> tuple[PreparedFile, MemoryItem]:
+        reusable_chunks: ReusableChunks = {}
+        for memory_item in self._existing.get(file.path, []):
+            chunking = memory_item.metadata.get("chunking", {})
+            # Embeddings are only comparable if they were made with the same model
+            if chunking.get("model") == self.config.embedding_model:
+                reusable_chunks |= memory_item.reusable_chunks()
+
+        memory_item = MemoryItem.from_text_chunks(
+            file.text,
+            file.chunks,
+            "text_file",
+            self.config,
+            {"location": file.path, "chunking": self.params},
+            reusable_chunks=reusable_chunks,
+        )
+        file.n_reused_chunks = sum(
+            h in reusable_chunks for h in memory_item.metadata["chunk_hashes"]
+        )
+        return file, memory_item
+
+    def _flush(
+        self,
+        batch: list[tuple[PreparedFile, Optional[MemoryItem]]],
+        stats: IngestionStats,
+    ) -> None:
+        """Replace the memories of the files in the batch, and checkpoint them"""
+        if not batch:
+            return
+        replaced = [
+            memory_item
+            for file, _ in batch
+            for memory_item in self._existing.pop(file.path, [])
+        ]
+        if replaced:
+            self.memory.discard_many(replaced)
+        if new_items := [item for _, item in batch if item is not None]:
+            self.memory.add_many(new_items)
+        if self.manifest:
+            self.manifest.record((file.path, file.content_hash) for file, _ in batch)
+
+        for file, memory_item in batch:
+            if memory_item is None:
+                continue
+            stats.files_ingested += 1
+            stats.n_chunks += len(file.chunks)
+            stats.n_reused_chunks += file.n_reused_chunks
+            stats.n_tokens += file.n_tokens
+        batch.clear()
+        logger.info(f"Ingestion progress: {stats}")
+
+    def _purge_deleted(self, directory: str, stats: IngestionStats) -> None:
+        """Remove the memories and manifest entries of deleted files in a directory"""
+        directory = os.path.join(os.path.abspath(directory), "")
+        deleted = {
+            location
+            for location in (
+                list(self._existing)
+                + list(self.manifest.hashes if self.manifest else [])
+            )
+            if location
+            and location.startswith(directory)
+            and not os.path.exists(location)
+        }
+        if not deleted:
+            return
+
+        purged = [m for location in deleted for m in self._existing.pop(location, [])]
+        self.memory.discard_many(purged)
+        if self.manifest:
+            self.manifest.forget(deleted)
+        stats.files_purged += len(deleted)
+        logger.info(f"Purged {len(deleted)} deleted files from memory")
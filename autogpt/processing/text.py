@@ -1,6 +1,6 @@
 """Text processing functions"""
 from math import ceil
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 import spacy
 import tiktoken
@@ -57,6 +57,69 @@ def chunk_content(
         yield tokenizer.decode(token_batch), len(token_batch)
 
 
+def chunk_text_stream(
+    segments: Iterable[str],
+    for_model: str,
+    max_chunk_length: Optional[int] = None,
+    overlap: int = 200,
+) -> Iterator[tuple[str, int]]:
+    """Split a stream of text segments (e.g. pages) into chunks of tokens.
+
+    Unlike chunk_content, this doesn't need the whole text up front: at any time,
+    it holds no more than one segment and one chunk worth of tokens in memory.
+    Because the total length is not known in advance, all chunks except the last
+    are of the maximum length.
+
+    Args:
+        segments: The consecutive parts of the text to chunk
+        for_model: The model to chunk for; determines tokenizer and constraints
+        max_chunk_length: The maximum length of a chunk, in tokens
+        overlap: The number of tokens that consecutive chunks overlap by
+
+    Yields:
+        tuple[str, int]: The next chunk of text and its length in tokens
+    """
+    max_chunk_length = _max_chunk_length(for_model, max_chunk_length)
+    overlap = min(overlap, max_chunk_length // 2)
+    tokenizer = tiktoken.encoding_for_model(for_model)
+
+    tokens: list[int] = []
+    n_chunks = 0
+    for segment in segments:
+        tokens.extend(tokenizer.encode(segment))
+        while len(tokens) > max_chunk_length:
+            yield tokenizer.decode(tokens[:max_chunk_length]), max_chunk_length
+            n_chunks += 1
+            del tokens[: max_chunk_length - overlap]
+
+    # Skip the remainder if it was already included in the last chunk as overlap
+    if tokens and (n_chunks == 0 or len(tokens) > overlap):
+        yield tokenizer.decode(tokens), len(tokens)
+
+
+def truncate_text(text: str, for_model: str, max_tokens: int) -> str:
+    """Truncate text to a maximum number of tokens, keeping its start and end.
+
+    Text that is short enough isn't tokenized at all.
+    """
+    # A token is at least one byte, so text with fewer bytes can't be too long
+    if len(text.encode("utf-8")) <= max_tokens:
+        return text
+
+    tokenizer = tiktoken.encoding_for_model(for_model)
+    tokens = tokenizer.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+
+    head_length = max_tokens // 2
+    tail_length = max_tokens - head_length
+    return (
+        tokenizer.decode(tokens[:head_length])
+        + f"\n... [{len(tokens) - max_tokens} tokens omitted] ...\n"
+        + (tokenizer.decode(tokens[-tail_length:]) if tail_length else "")
+    )
+
+
 def summarize_text(
     text: str,
     config: Config,
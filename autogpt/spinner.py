@@ -4,6 +4,8 @@ import sys
 import threading
 import time
 
+from autogpt.logs.handlers import console_renderer
+
 
 class Spinner:
     """A simple spinner class"""
@@ -44,6 +46,8 @@ class Spinner:
 
     def __enter__(self):
         """Start the spinner"""
+        # The spinner would garble output that is still being typed out
+        console_renderer.flush()
         self.running = True
         self.spinner_thread = threading.Thread(target=self.spin)
         self.spinner_thread.start()
@@ -9,7 +9,7 @@ from prompt_toolkit import ANSI, PromptSession
 from prompt_toolkit.history import InMemoryHistory
 
 from autogpt.config import Config
-from autogpt.logs import logger
+from autogpt.logs import console_renderer, logger
 
 session = PromptSession(history=InMemoryHistory())
 
@@ -54,6 +54,8 @@ def clean_input(config: Config, prompt: str = "", talk=False):
                 return plugin_response
 
         # ask for input, default when just pressing Enter is y
+        # Let the user read everything that is still being typed out first
+        console_renderer.flush(animate=True)
         logger.info("Asking user via keyboard...")
         answer = session.prompt(ANSI(prompt))
         return answer
@@ -1,15 +1,30 @@
+import argparse
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+
 from autogpt.agent import Agent
 from autogpt.config import AIConfig, Config, ConfigBuilder
+from autogpt.logs.profiler import SamplingProfiler
 from autogpt.main import COMMAND_CATEGORIES
 from autogpt.memory.vector import get_memory
+from autogpt.models.command_manifest import CommandManifest
 from autogpt.models.command_registry import CommandRegistry
 from autogpt.prompts.prompt import DEFAULT_TRIGGERING_PROMPT
 from autogpt.workspace import Workspace
 
 
-def run_task(task) -> None:
+def run_task(task, profile_directory: Optional[Path] = None) -> None:
     agent = bootstrap_agent(task)
-    agent.start_interaction_loop()
+    if profile_directory is None:
+        agent.start_interaction_loop()
+        return
+
+    profiler = SamplingProfiler().start()
+    try:
+        agent.start_interaction_loop()
+    finally:
+        profiler.stop_and_save(profile_directory)
 
 
 def bootstrap_agent(task):
@@ -44,9 +59,27 @@ def bootstrap_agent(task):
 
 def get_command_registry(config: Config):
     command_registry = CommandRegistry()
+    command_manifest = CommandManifest.load()
     enabled_command_categories = [
         x for x in COMMAND_CATEGORIES if x not in config.disabled_command_categories
     ]
     for command_category in enabled_command_categories:
-        command_registry.import_commands(command_category)
+        command_registry.import_commands(command_category, command_manifest)
     return command_registry
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run Auto-GPT on a single task.")
+    parser.add_argument("task", type=str, help="The task for the agent to perform")
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=Path("profiles"),
+        default=None,
+        metavar="DIRECTORY",
+        help="Profile the CPU time per cycle, phase and command, and write the "
+        "results to DIRECTORY (default: ./profiles)",
+    )
+    args = parser.parse_args()
+    run_task(SimpleNamespace(user_input=args.task), args.profile)
@@ -1,9 +1,13 @@
 import argparse
 import logging
+import os
+from pathlib import Path
 
-from autogpt.commands.file_operations import ingest_file, list_files
+from autogpt.commands.file_operations import ingest_file
+from autogpt.commands.file_operations_utils import list_directory
 from autogpt.config import ConfigBuilder
 from autogpt.memory.vector import VectorMemory, get_memory
+from autogpt.processing.ingestion import IngestionManifest, IngestionPipeline
 
 config = ConfigBuilder.build_config_from_env()
 
@@ -21,20 +25,52 @@ def configure_logging():
     return logging.getLogger("AutoGPT-Ingestion")
 
 
+def iter_directory_files(directory: str, page_size: int = 1000):
+    """Lazily list all files in a directory, page by page"""
+    cursor = None
+    while True:
+        listing = list_directory(directory, cursor=cursor, limit=page_size)
+        for file in listing.files:
+            yield os.path.join(directory, file)
+        if not (cursor := listing.next_cursor):
+            return
+
+
 def ingest_directory(directory: str, memory: VectorMemory, args):
     """
-    Ingest all files in a directory by calling the ingest_file function for each file.
+    Ingest all files in a directory using the parallel ingestion pipeline.
+    Progress is checkpointed in a manifest, so an interrupted ingestion resumes
+    where it stopped, and files that haven't changed since are skipped. Of changed
+    files, only new chunks are re-embedded, and deleted files are purged.
 
     :param directory: The directory containing the files to ingest
     :param memory: An object with an add() method to store the chunks in memory
     """
     logger = logging.getLogger("AutoGPT-Ingestion")
-    try:
-        files = list_files(directory)
-        for file in files:
-            ingest_file(file, memory, args.max_length, args.overlap)
-    except Exception as e:
-        logger.error(f"Error while ingesting directory '{directory}': {str(e)}")
+    pipeline = IngestionPipeline(
+        memory,
+        config,
+        max_chunk_length=args.max_length,
+        overlap=args.overlap,
+        parse_workers=args.workers,
+        llm_workers=args.llm_workers,
+        batch_size=args.batch_size,
+    )
+    manifest_path = args.manifest or (
+        Path(config.workspace_path) / f"{config.memory_index}.ingestion.jsonl"
+    )
+    pipeline.manifest = IngestionManifest(manifest_path, pipeline.params)
+    if args.init:
+        pipeline.manifest.reset()
+
+    stats = pipeline.run(iter_directory_files(directory), purge_deleted_in=directory)
+    logger.info(
+        f"Ingested {stats.files_ingested} files ({stats.files_skipped} skipped) "
+        f"at {stats.files_per_second:.2f} files/s, "
+        f"{stats.tokens_per_second:.0f} tokens/s"
+    )
+    for file, error in stats.files_failed.items():
+        logger.error(f"Failed to ingest '{file}': {error}")
 
 
 def main() -> None:
@@ -67,6 +103,31 @@ def main() -> None:
         help="The max_length of each chunk when ingesting files (default: 4000)",
         default=4000,
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="The number of processes to parse files with (default: CPU count)",
+        default=None,
+    )
+    parser.add_argument(
+        "--llm_workers",
+        type=int,
+        help="The number of files to summarize and embed concurrently (default: 4)",
+        default=4,
+    )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        help="The number of files to write to memory at once (default: 32)",
+        default=32,
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        help="The checkpoint file to resume an interrupted ingestion from "
+        "(default: <memory index>.ingestion.jsonl in the workspace)",
+        default=None,
+    )
     args = parser.parse_args()
 
     # Initialize memory
@@ -77,7 +138,7 @@ def main() -> None:
 
     if args.file:
         try:
-            ingest_file(args.file, memory, args.max_length, args.overlap)
+            ingest_file(args.file, memory, config, args.max_length, args.overlap)
             logger.info(f"File '{args.file}' ingested successfully.")
         except Exception as e:
             logger.error(f"Error while ingesting file '{args.file}': {str(e)}")
@@ -0,0 +1,321 @@
+"""Offline benchmark of the agent loop's own overhead.
+
+Runs the agent end to end through `Agent.start_interaction_loop` against a local
+fake OpenAI server (see scripts/fake_openai_server.py), so no API key or budget
+is needed and the LLM latency is under control. Per cycle, the time spent waiting
+on chat completions is subtracted from the wall time, which leaves the overhead
+of the framework itself: prompt building, token counting, parsing, command
+execution, logging and so on.
+
+The results are written as JSON, so they can be compared between commits:
+
+    python -m scripts.benchmark_agent_loop --cycles 50 --latency uniform:0.01,0.05 \\
+        --output before.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from autogpt.agent import Agent
+from autogpt.config import AIConfig, Config, ConfigBuilder
+from autogpt.llm.api_manager import ApiManager
+from autogpt.logs import logger
+from autogpt.logs.memory_tracker import MemoryTracker
+from autogpt.logs.tracing import Span, tracer
+from autogpt.memory.vector import get_memory
+from autogpt.prompts.prompt import DEFAULT_TRIGGERING_PROMPT
+from autogpt.workspace import Workspace
+from benchmarks import get_command_registry
+from scripts.fake_openai_server import FakeOpenAIServer, LatencyModel
+
+DEFAULT_CYCLES = 20
+DEFAULT_MODEL = "gpt-3.5-turbo"
+
+
+@dataclass
+class CycleMetrics:
+    cycle: int
+    wall_time: float
+    llm_wait: float
+    embedding_wait: float
+    overhead: float
+    tokens_counted: int
+
+
+def summarize(values: list[float]) -> dict[str, float]:
+    """Get the p50, p95, mean, min and max of a list of values"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def percentile(q: float) -> float:
+        position = (len(ordered) - 1) * q
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+    return {
+        "p50": percentile(0.5),
+        "p95": percentile(0.95),
+        "mean": sum(ordered) / len(ordered),
+        "min": ordered[0],
+        "max": ordered[-1],
+    }
+
+
+def make_config(server_url: str, workspace_path: Path, cycles: int, model: str):
+    config = ConfigBuilder.build_config_from_env()
+    config.openai_api_key = "sk-benchmark"
+    config.openai_api_base = server_url
+    config.use_azure = False
+    config.smart_llm = config.fast_llm = model
+    config.temperature = 0
+    config.continuous_mode = True
+    config.continuous_limit = cycles
+    config.plain_output = True
+    config.memory_backend = "no_memory"
+    config.plugins = []
+    config.workspace_path = str(workspace_path)
+    Workspace.build_file_logger_path(config, workspace_path)
+    return config
+
+
+def build_agent(config: Config, workspace_path: Path) -> Agent:
+    command_registry = get_command_registry(config)
+    ai_config = AIConfig(
+        ai_name="Benchmark-GPT",
+        ai_role="an agent that runs a scripted benchmark.",
+        ai_goals=["Write, read and list some files"],
+    )
+    ai_config.command_registry = command_registry
+    return Agent(
+        ai_name=ai_config.ai_name,
+        memory=get_memory(config),
+        command_registry=command_registry,
+        ai_config=ai_config,
+        config=config,
+        next_action_count=0,
+        system_prompt=ai_config.construct_full_prompt(config),
+        triggering_prompt=DEFAULT_TRIGGERING_PROMPT,
+        workspace_directory=workspace_path,
+    )
+
+
+def cycle_metrics(spans: list[Span], n_cycles: int) -> list[CycleMetrics]:
+    """Break down the wall time of each cycle, using the recorded tracing spans"""
+    spans_by_id = {span.span_id: span for span in spans}
+    cycles = {
+        span.span_id: span
+        for span in spans
+        if span.name == "agent.cycle" and span.attributes["cycle"] <= n_cycles
+    }
+    llm_wait = {span_id: 0.0 for span_id in cycles}
+    embedding_wait = {span_id: 0.0 for span_id in cycles}
+    tokens = {span_id: 0 for span_id in cycles}
+
+    for span in spans:
+        if span.name not in ("create_chat_completion", "get_embedding", "chat_with_ai"):
+            continue
+        parent = spans_by_id.get(span.parent_id)  # type: ignore
+        while parent is not None and parent.span_id not in cycles:
+            parent = spans_by_id.get(parent.parent_id)  # type: ignore
+        if parent is None:
+            continue
+        if span.name == "create_chat_completion":
+            llm_wait[parent.span_id] += span.duration_ms / 1000  # type: ignore
+        elif span.name == "get_embedding":
+            embedding_wait[parent.span_id] += span.duration_ms / 1000  # type: ignore
+        else:
+            tokens[parent.span_id] += span.attributes.get("tokens", 0)
+
+    return [
+        CycleMetrics(
+            cycle=span.attributes["cycle"],
+            wall_time=span.duration_ms / 1000,  # type: ignore
+            llm_wait=llm_wait[span_id],
+            embedding_wait=embedding_wait[span_id],
+            overhead=span.duration_ms / 1000  # type: ignore
+            - llm_wait[span_id]
+            - embedding_wait[span_id],
+            tokens_counted=tokens[span_id],
+        )
+        for span_id, span in sorted(cycles.items())
+    ]
+
+
+def run_agent(
+    server: FakeOpenAIServer,
+    cycles: int,
+    model: str,
+    memory_tracker: Optional[MemoryTracker] = None,
+) -> list[CycleMetrics]:
+    """Run an agent for a number of cycles against the fake server"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        workspace_path = Workspace.make_workspace(Path(tmp_dir) / "workspace")
+        config = make_config(server.url, workspace_path, cycles, model)
+        logger.config = config
+        agent = build_agent(config, workspace_path)
+        agent.memory_tracker = memory_tracker
+
+        tracer.clear()
+        tracer.enable()
+        try:
+            agent.start_interaction_loop()
+        finally:
+            tracer.disable()
+        return cycle_metrics(tracer.spans, cycles)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(
+    cycles: int = DEFAULT_CYCLES,
+    latency: LatencyModel = LatencyModel(),
+    script: Optional[list[dict[str, Any]]] = None,
+    model: str = DEFAULT_MODEL,
+    completion_tokens: Optional[int] = None,
+    seed: int = 0,
+    measure_allocations: bool = True,
+) -> dict[str, Any]:
+    """Benchmark the agent loop and return the results as a JSON-able dict.
+
+    Allocations are measured in a separate run, because tracemalloc slows down
+    every allocation and would distort the timings.
+    """
+    api_manager = ApiManager()
+    api_manager.reset()
+
+    started_at = time.perf_counter()
+    with FakeOpenAIServer(script, latency, completion_tokens, seed) as server:
+        metrics = run_agent(server, cycles, model)
+        n_requests = server.n_requests
+    total_time = time.perf_counter() - started_at
+
+    results: dict[str, Any] = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "cycles": cycles,
+            "latency": str(latency),
+            "model": model,
+            "seed": seed,
+        },
+        "total_time": total_time,
+        "llm_requests": n_requests,
+        "cycle_time": summarize([m.wall_time for m in metrics]),
+        "llm_wait": summarize([m.llm_wait for m in metrics]),
+        "embedding_wait": summarize([m.embedding_wait for m in metrics]),
+        "overhead": summarize([m.overhead for m in metrics]),
+        "tokens": {
+            "counted": sum(m.tokens_counted for m in metrics),
+            "prompt": api_manager.get_total_prompt_tokens(),
+            "completion": api_manager.get_total_completion_tokens(),
+        },
+        "cycles": [asdict(m) for m in metrics],
+    }
+
+    if measure_allocations:
+        memory_tracker = MemoryTracker()
+        with FakeOpenAIServer(
+            script, LatencyModel(), completion_tokens, seed
+        ) as server:
+            memory_tracker.start()
+            try:
+                run_agent(server, cycles, model, memory_tracker)
+            finally:
+                memory_tracker.stop()
+        # The first report covers the setup, not a cycle
+        reports = memory_tracker.reports[1:]
+        results["allocations"] = {
+            "growth_per_cycle": summarize([r.growth for r in reports]),
+            "peak_traced_memory": max(
+                (r.peak_traced_memory for r in reports), default=0
+            ),
+            "traced_memory": reports[-1].traced_memory if reports else 0,
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the agent loop against a fake OpenAI server."
+    )
+    parser.add_argument("--cycles", type=int, default=DEFAULT_CYCLES)
+    parser.add_argument(
+        "--latency",
+        type=LatencyModel.parse,
+        default=LatencyModel(),
+        help="LLM response latency: SECONDS, fixed:SECONDS, uniform:MIN,MAX"
+        " or normal:MEAN,STDDEV (default: 0)",
+    )
+    parser.add_argument(
+        "--script", type=str, help="JSON file with the list of commands to run"
+    )
+    parser.add_argument("--model", type=str, default=DEFAULT_MODEL)
+    parser.add_argument(
+        "--completion-tokens",
+        type=int,
+        help="A fixed number of completion tokens to report per request",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--no-allocations",
+        action="store_true",
+        help="Skip the extra run that measures allocations",
+    )
+    parser.add_argument(
+        "--output", type=str, help="File to write the results to (default: stdout)"
+    )
+    args = parser.parse_args()
+
+    script = None
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            script = json.load(f)
+
+    # Keep the agent's console output from drowning the results
+    logger.set_level(logging.WARNING)
+    results = run_benchmark(
+        cycles=args.cycles,
+        latency=args.latency,
+        script=script,
+        model=args.model,
+        completion_tokens=args.completion_tokens,
+        seed=args.seed,
+        measure_allocations=not args.no_allocations,
+    )
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+        overhead = results["overhead"]
+        print(
+            f"Overhead per cycle: p50 {overhead['p50'] * 1000:.1f} ms,"
+            f" p95 {overhead['p95'] * 1000:.1f} ms; results written to {args.output}",
+            file=sys.stderr,
+        )
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
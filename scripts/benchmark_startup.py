@@ -0,0 +1,129 @@
+"""Benchmark the import cost of populating the command registry at startup.
+
+Populates the registry with the command categories in a fresh interpreter under
+`python -X importtime`, once by importing every command module and once from the
+command manifest (see autogpt/models/command_manifest.py), and compares the two:
+
+    python -m scripts.benchmark_startup --runs 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).parent.parent
+
+STARTUP_SCRIPT = """
+from autogpt.main import COMMAND_CATEGORIES
+from autogpt.models.command_manifest import CommandManifest
+from autogpt.models.command_registry import CommandRegistry
+
+manifest = CommandManifest.load() if {lazy} else None
+registry = CommandRegistry()
+for command_category in COMMAND_CATEGORIES:
+    registry.import_commands(command_category, manifest)
+registry.command_prompt()
+"""
+
+
+@dataclass
+class ImportTimes:
+    """The self and cumulative import times of every module, in microseconds"""
+
+    self_us: dict[str, int]
+    cumulative_us: dict[str, int]
+
+    @classmethod
+    def parse(cls, importtime_output: str) -> ImportTimes:
+        self_us, cumulative_us = {}, {}
+        for line in importtime_output.splitlines():
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            self_time, cumulative_time, module = line[len("import time:") :].split("|")
+            self_us[module.strip()] = int(self_time)
+            cumulative_us[module.strip()] = int(cumulative_time)
+        return cls(self_us, cumulative_us)
+
+    @property
+    def total_us(self) -> int:
+        return sum(self.self_us.values())
+
+    def top_level_packages(self) -> set[str]:
+        return {module.split(".")[0] for module in self.self_us}
+
+
+def measure(lazy: bool) -> tuple[float, ImportTimes]:
+    """Populate the registry in a new interpreter; return the wall time and imports"""
+    started_at = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT.format(lazy=lazy)],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return time.perf_counter() - started_at, ImportTimes.parse(result.stderr)
+
+
+def run_benchmark(runs: int = 5) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    imports: dict[str, ImportTimes] = {}
+    for mode, lazy in (("eager", False), ("lazy", True)):
+        wall_times, import_times = [], []
+        for _ in range(runs):
+            wall_time, imports[mode] = measure(lazy)
+            wall_times.append(wall_time)
+            import_times.append(imports[mode].total_us / 1e6)
+        results[mode] = {
+            "wall_time": statistics.median(wall_times),
+            "import_time": statistics.median(import_times),
+            "modules": len(imports[mode].self_us),
+        }
+
+    # The packages that are no longer imported before the first command is called
+    deferred = (
+        imports["eager"].top_level_packages() - imports["lazy"].top_level_packages()
+    )
+    results["deferred_packages"] = sorted(
+        deferred,
+        key=lambda package: imports["eager"].cumulative_us.get(package, 0),
+        reverse=True,
+    )
+    results["import_time_saved"] = (
+        results["eager"]["import_time"] - results["lazy"]["import_time"]
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the startup import time of eager and lazy command loading."
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.runs)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for mode in ("eager", "lazy"):
+        print(
+            f"{mode:>5}: {results[mode]['wall_time'] * 1000:.0f} ms wall time,"
+            f" {results[mode]['import_time'] * 1000:.0f} ms importing"
+            f" {results[mode]['modules']} modules"
+        )
+    print(f"Import time saved: {results['import_time_saved'] * 1000:.0f} ms")
+    print(f"Deferred packages: {', '.join(results['deferred_packages'])}")
+
+
+if __name__ == "__main__":
+    main()
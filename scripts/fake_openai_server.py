@@ -0,0 +1,285 @@
+"""A local stand-in for the OpenAI API, for running the agent offline.
+
+The server answers chat completion requests with a scripted sequence of commands
+in the agent's response format, answers summarization requests with a short
+summary and embedding requests with deterministic vectors. Response latency is
+drawn from a configurable distribution and token usage is estimated from the
+size of the request and response, so that the agent's metering works as usual.
+
+Run it standalone and point Auto-GPT at it with OPENAI_API_BASE_URL:
+
+    python -m scripts.fake_openai_server --port 8910 --latency uniform:0.5,2
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import itertools
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+EMBEDDING_DIMENSIONS = 1536
+SUMMARY_REQUEST_MARKER = "concise running summary"
+
+DEFAULT_SCRIPT = [
+    {
+        "name": "write_to_file",
+        "args": {"filename": "notes.txt", "text": "Some notes about the task."},
+    },
+    {"name": "read_file", "args": {"filename": "notes.txt"}},
+    {"name": "list_files", "args": {"directory": "."}},
+    {
+        "name": "append_to_file",
+        "args": {"filename": "notes.txt", "text": "\nMore notes."},
+    },
+]
+
+
+@dataclass
+class LatencyModel:
+    """A distribution of response latencies, in seconds.
+
+    Specified as `fixed:SECONDS`, `uniform:MIN,MAX` or `normal:MEAN,STDDEV`,
+    or as a plain number of seconds.
+    """
+
+    kind: str = "fixed"
+    params: tuple[float, ...] = (0.0,)
+
+    @classmethod
+    def parse(cls, spec: str) -> LatencyModel:
+        kind, _, params = spec.partition(":")
+        if not params:
+            return cls("fixed", (float(kind),))
+        values = tuple(float(p) for p in params.split(","))
+        expected = {"fixed": 1, "uniform": 2, "normal": 2}
+        if kind not in expected or len(values) != expected[kind]:
+            raise ValueError(f"Invalid latency specification: '{spec}'")
+        return cls(kind, values)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(*self.params))
+        return self.params[0]
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{','.join(str(p) for p in self.params)}"
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly 4 characters per token for English text
+    return max(1, len(text) // 4)
+
+
+def agent_reply(command: dict[str, Any], step: int) -> str:
+    """Format a command as an assistant reply in the agent's response format"""
+    return json.dumps(
+        {
+            "thoughts": {
+                "text": f"Step {step}: I will run {command['name']}.",
+                "reasoning": "This is the next step of the scripted benchmark.",
+                "plan": f"- run {command['name']}\n- continue with the next step",
+                "criticism": "None, this is a benchmark.",
+                "speak": f"Running {command['name']}.",
+            },
+            "command": command,
+        }
+    )
+
+
+class FakeOpenAIServer:
+    """Serves a fake OpenAI API on localhost from a background thread.
+
+    Args:
+        script: The commands to reply with, in order; repeated when exhausted
+        latency: The distribution of the latency added to every response
+        completion_tokens: A fixed number of completion tokens to report,
+            instead of an estimate
+        seed: The seed for the latency distribution
+        port: The port to listen on; 0 picks a free port
+    """
+
+    def __init__(
+        self,
+        script: Optional[list[dict[str, Any]]] = None,
+        latency: LatencyModel = LatencyModel(),
+        completion_tokens: Optional[int] = None,
+        seed: int = 0,
+        port: int = 0,
+    ):
+        self.script = script or DEFAULT_SCRIPT
+        self.latency = latency
+        self.completion_tokens = completion_tokens
+        self.n_requests = 0
+        self.total_latency = 0.0
+        self._steps = itertools.count()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> FakeOpenAIServer:
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fake-openai-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> FakeOpenAIServer:
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def _wait(self) -> None:
+        with self._lock:
+            latency = self.latency.sample(self._rng)
+            self.n_requests += 1
+            self.total_latency += latency
+        time.sleep(latency)
+
+    def chat_completion(self, request: dict[str, Any]) -> dict[str, Any]:
+        self._wait()
+        messages = request.get("messages", [])
+        prompt = "\n".join(str(m.get("content") or "") for m in messages)
+        if SUMMARY_REQUEST_MARKER in prompt:
+            content = "I have been running scripted benchmark commands."
+        else:
+            step = next(self._steps)
+            content = agent_reply(self.script[step % len(self.script)], step)
+
+        completion_tokens = self.completion_tokens or estimate_tokens(content)
+        prompt_tokens = estimate_tokens(prompt)
+        return {
+            "id": "chatcmpl-benchmark",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-3.5-turbo"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def embedding(self, request: dict[str, Any]) -> dict[str, Any]:
+        self._wait()
+        inputs = request.get("input", [])
+        if not isinstance(inputs, list) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        data = []
+        for i, text in enumerate(inputs):
+            seed = hashlib.sha256(str(text).encode()).digest()
+            rng = random.Random(seed)
+            vector = [rng.uniform(-1, 1) for _ in range(EMBEDDING_DIMENSIONS)]
+            data.append({"object": "embedding", "index": i, "embedding": vector})
+        n_tokens = sum(estimate_tokens(str(text)) for text in inputs)
+        return {
+            "object": "list",
+            "data": data,
+            "model": request.get("model", "text-embedding-ada-002"),
+            "usage": {"prompt_tokens": n_tokens, "total_tokens": n_tokens},
+        }
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if self.path.endswith("/chat/completions"):
+                    self._respond(200, server.chat_completion(request))
+                elif self.path.endswith("/embeddings"):
+                    self._respond(200, server.embedding(request))
+                else:
+                    self._respond(404, {"error": {"message": "Not found"}})
+
+            def do_GET(self):
+                if self.path.endswith("/models"):
+                    self._respond(
+                        200,
+                        {
+                            "object": "list",
+                            "data": [
+                                {"id": "gpt-3.5-turbo", "object": "model"},
+                                {"id": "gpt-4", "object": "model"},
+                            ],
+                        },
+                    )
+                else:
+                    self._respond(404, {"error": {"message": "Not found"}})
+
+            def _respond(self, status: int, body: dict[str, Any]) -> None:
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake OpenAI API locally.")
+    parser.add_argument("--port", type=int, default=8910)
+    parser.add_argument(
+        "--latency",
+        type=LatencyModel.parse,
+        default=LatencyModel(),
+        help="Response latency: SECONDS, fixed:SECONDS, uniform:MIN,MAX"
+        " or normal:MEAN,STDDEV",
+    )
+    parser.add_argument(
+        "--script",
+        type=str,
+        help="JSON file with the list of commands to reply with",
+    )
+    args = parser.parse_args()
+
+    script = None
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            script = json.load(f)
+
+    server = FakeOpenAIServer(script, args.latency, port=args.port)
+    print(f"Serving fake OpenAI API at {server.url}")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Micro-benchmarks of the pure-Python hot paths, using pytest-benchmark.
+
+The benchmarks are not part of the regular test run. To store a baseline on the
+current machine, and to compare a later run against it:
+
+    pytest tests/benchmarks --benchmark-autosave
+    pytest tests/benchmarks --benchmark-compare
+
+Baselines are stored in .benchmarks/ per machine. When comparing, a benchmark whose
+median regressed by more than DEFAULT_REGRESSION_TOLERANCE fails the run, unless
+a different tolerance is given with --benchmark-compare-fail (e.g. mean:10%).
+
+All fixtures are generated from a fixed seed, so that runs are comparable.
+"""
+import random
+from pathlib import Path
+
+import pytest
+import tiktoken
+from _pytest.config import Config
+from pytest_benchmark.utils import parse_compare_fail
+
+BENCHMARK_SEED = 42
+DEFAULT_REGRESSION_TOLERANCE = "median:20%"
+
+WORDS = (
+    "the agent reads a file and writes the result to memory before it plans its"
+    " next command while the user waits for a summary of what has been done so far"
+    " because every cycle adds tokens to the context window that must be counted"
+).split()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config: Config) -> None:
+    # pytest-benchmark reads its options when it is configured, which is after this
+    if config.getoption("benchmark_compare", None) and not config.getoption(
+        "benchmark_compare_fail", None
+    ):
+        config.option.benchmark_compare_fail = [
+            parse_compare_fail(DEFAULT_REGRESSION_TOLERANCE)
+        ]
+
+
+@pytest.fixture
+def rng() -> random.Random:
+    return random.Random(BENCHMARK_SEED)
+
+
+def make_sentences(rng: random.Random, n_chars: int) -> str:
+    """Generate English-like text of the given length"""
+    sentences = []
+    length = 0
+    while length < n_chars:
+        sentence = " ".join(rng.choices(WORDS, k=rng.randint(5, 25))).capitalize()
+        sentences.append(sentence + ".")
+        length += len(sentence) + 2
+        if rng.random() < 0.1:
+            sentences.append("\n\n")
+    return " ".join(sentences)[:n_chars]
+
+
+@pytest.fixture(scope="session")
+def text_1mb() -> str:
+    return make_sentences(random.Random(BENCHMARK_SEED), 1024 * 1024)
+
+
+@pytest.fixture(scope="session")
+def tokenizer() -> tiktoken.Encoding:
+    """The real tokenizer; benchmarks that need it are skipped if it can't be loaded"""
+    try:
+        return tiktoken.encoding_for_model("gpt-3.5-turbo")
+    except Exception as e:
+        pytest.skip(f"tiktoken encoding is not available: {e}")
+
+
+@pytest.fixture(scope="session")
+def benchmark_data_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return tmp_path_factory.mktemp("benchmark_data")
@@ -0,0 +1,33 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from autogpt.commands.file_operations import file_operations_state, text_checksum
+
+from .conftest import BENCHMARK_SEED
+
+
+@pytest.fixture(scope="module", params=[1_000, 100_000])
+def file_log(request, benchmark_data_dir: Path) -> Path:
+    n_operations = request.param
+    rng = random.Random(BENCHMARK_SEED)
+    log_path = benchmark_data_dir / f"file_logger_{n_operations}.txt"
+    lines = ["File Operation Logger\n"]
+    for i in range(n_operations):
+        path = f"dir_{rng.randrange(100)}/file_{rng.randrange(1000)}.txt"
+        operation = rng.choices(["write", "append", "delete"], [6, 3, 1])[0]
+        if operation == "delete":
+            # Only delete files that were written, like the agent would
+            lines.append(f"write: {path} #{text_checksum(str(i))}\n")
+            lines.append(f"delete: {path}\n")
+        else:
+            lines.append(f"{operation}: {path} #{text_checksum(str(i))}\n")
+    log_path.write_text("".join(lines), encoding="utf-8")
+    return log_path
+
+
+def test_file_operations_state(benchmark, file_log: Path):
+    state = benchmark(file_operations_state, str(file_log))
+
+    assert state
@@ -0,0 +1,38 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from autogpt.processing.html import extract_hyperlinks, extract_text, format_hyperlinks
+
+from .conftest import make_sentences
+
+
+@pytest.fixture
+def page_source(rng) -> str:
+    sections = []
+    for i in range(200):
+        links = " ".join(
+            f'<a href="/page/{i}/{j}">{make_sentences(rng, 30)}</a>' for j in range(5)
+        )
+        sections.append(
+            f"<div class='section'><h2>Section {i}</h2>"
+            f"<p>{make_sentences(rng, 1000)}</p><p>{links}</p>"
+            f"<script>var section = {i};</script><style>.s{i} {{}}</style></div>"
+        )
+    return f"<html><body>{''.join(sections)}</body></html>"
+
+
+def test_extract_text(benchmark, page_source: str):
+    text = benchmark(lambda: extract_text(BeautifulSoup(page_source, "html.parser")))
+
+    assert "Section 199" in text
+    assert "var section" not in text
+
+
+def test_extract_hyperlinks(benchmark, page_source: str):
+    soup = BeautifulSoup(page_source, "html.parser")
+
+    links = benchmark(
+        lambda: format_hyperlinks(extract_hyperlinks(soup, "https://example.com"))
+    )
+
+    assert len(links) == 1000
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from autogpt.config import Config
+from autogpt.json_utils.utilities import extract_json_from_response, validate_json
+
+from .conftest import make_sentences
+
+
+@pytest.fixture
+def assistant_reply(rng) -> str:
+    reply = {
+        "thoughts": {
+            "text": make_sentences(rng, 500),
+            "reasoning": make_sentences(rng, 500),
+            "plan": "\n".join(f"- {make_sentences(rng, 80)}" for _ in range(5)),
+            "criticism": make_sentences(rng, 300),
+            "speak": make_sentences(rng, 200),
+        },
+        "command": {
+            "name": "write_to_file",
+            "args": {"filename": "output.txt", "text": make_sentences(rng, 2000)},
+        },
+    }
+    return str(reply)
+
+
+def test_extract_json_from_response(benchmark, assistant_reply: str):
+    reply = benchmark(extract_json_from_response, assistant_reply)
+
+    assert reply["command"]["name"] == "write_to_file"
+
+
+def test_extract_json_from_json_response(benchmark, assistant_reply: str):
+    json_reply = json.dumps(extract_json_from_response(assistant_reply))
+
+    reply = benchmark(extract_json_from_response, json_reply)
+
+    assert reply["command"]["name"] == "write_to_file"
+
+
+def test_extract_json_from_code_block(benchmark, assistant_reply: str):
+    reply = benchmark(extract_json_from_response, f"```{assistant_reply}```")
+
+    assert reply["command"]["name"] == "write_to_file"
+
+
+def test_validate_json(benchmark, assistant_reply: str, config: Config):
+    reply = extract_json_from_response(assistant_reply)
+
+    assert benchmark(validate_json, reply, config)
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from autogpt.config import Config
+from autogpt.llm.base import Message
+from autogpt.memory.message_history import MessageHistory
+
+from .conftest import make_sentences
+
+
+@pytest.fixture(params=[10, 100, 1000])
+def history(request, rng) -> MessageHistory:
+    history = MessageHistory.for_model("gpt-3.5-turbo")
+    for cycle in range(request.param):
+        history.add("user", "Determine which next command to use")
+        reply = {
+            "thoughts": {"text": make_sentences(rng, 300), "plan": "- continue"},
+            "command": {"name": "read_file", "args": {"filename": f"{cycle}.txt"}},
+        }
+        history.add("assistant", json.dumps(reply), "ai_response")
+        history.add(
+            "system",
+            f"Command read_file returned: {make_sentences(rng, 500)}",
+            "action_result",
+        )
+    return history
+
+
+def test_per_cycle(benchmark, history: MessageHistory):
+    cycles = benchmark(lambda: list(history.per_cycle()))
+
+    assert len(cycles) == len(history) // 3
+
+
+def test_trim_messages(benchmark, history: MessageHistory, config: Config, mocker):
+    mocker.patch.object(
+        MessageHistory, "update_running_summary", return_value=Message("system", "")
+    )
+    # The most recent cycles are in the context, the rest is trimmed
+    context = history.messages[-30:]
+
+    def setup():
+        history.last_trimmed_index = 0
+        return (context, config), {}
+
+    _, trimmed = benchmark.pedantic(
+        history.trim_messages, setup=setup, rounds=20, warmup_rounds=1
+    )
+
+    assert all(message not in context for message in trimmed)
@@ -0,0 +1,32 @@
+import pytest
+import spacy
+
+from autogpt.config import Config
+from autogpt.processing.text import chunk_content, split_text
+
+
+@pytest.fixture
+def spacy_model(config: Config) -> str:
+    model = config.browse_spacy_language_model
+    if not spacy.util.is_package(model):
+        pytest.skip(f"spaCy model '{model}' is not installed")
+    return model
+
+
+def test_chunk_content_1mb(benchmark, tokenizer, text_1mb):
+    chunks = benchmark(
+        lambda: list(chunk_content(text_1mb, "gpt-3.5-turbo", max_chunk_length=2000))
+    )
+
+    assert len(chunks) > 1
+
+
+def test_split_text_1mb(benchmark, tokenizer, spacy_model, text_1mb, config: Config):
+    chunks = benchmark.pedantic(
+        lambda: list(
+            split_text(text_1mb, "gpt-3.5-turbo", config, max_chunk_length=2000)
+        ),
+        rounds=3,
+    )
+
+    assert len(chunks) > 1
@@ -0,0 +1,33 @@
+import pytest
+
+from autogpt.llm.base import Message
+from autogpt.llm.utils import count_message_tokens, count_string_tokens
+
+from .conftest import make_sentences
+
+
+@pytest.fixture
+def make_history(rng):
+    def make_history(n_messages: int) -> list[Message]:
+        roles = ["user", "assistant", "system"]
+        return [
+            Message(roles[i % 3], make_sentences(rng, rng.randint(100, 2000)))
+            for i in range(n_messages)
+        ]
+
+    return make_history
+
+
+@pytest.mark.parametrize("n_messages", [10, 100, 1000])
+def test_count_message_tokens(benchmark, tokenizer, make_history, n_messages):
+    messages = make_history(n_messages)
+
+    n_tokens = benchmark(count_message_tokens, messages, "gpt-3.5-turbo")
+
+    assert n_tokens > n_messages
+
+
+def test_count_string_tokens_1mb(benchmark, tokenizer, text_1mb):
+    n_tokens = benchmark(count_string_tokens, text_1mb, "gpt-3.5-turbo")
+
+    assert n_tokens > 0
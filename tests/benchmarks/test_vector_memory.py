@@ -0,0 +1,77 @@
+from typing import Iterator
+
+import numpy as np
+import pytest
+
+from autogpt.config import Config
+from autogpt.memory.vector import MemoryItem
+from autogpt.memory.vector.providers.base import VectorMemoryProvider
+
+from .conftest import BENCHMARK_SEED
+
+# Smaller than the 1536 dimensions of ada-002, to keep 100k items in memory
+EMBEDDING_DIMENSIONS = 256
+
+
+class InMemoryVectorProvider(VectorMemoryProvider):
+    """A plain list of memories, to benchmark the provider's search on its own"""
+
+    def __init__(self, items: list[MemoryItem]):
+        self.memories = items
+
+    def __iter__(self) -> Iterator[MemoryItem]:
+        return iter(self.memories)
+
+    def __contains__(self, x: MemoryItem) -> bool:
+        return x in self.memories
+
+    def __len__(self) -> int:
+        return len(self.memories)
+
+    def add(self, item: MemoryItem):
+        self.memories.append(item)
+
+    def discard(self, item: MemoryItem):
+        self.memories.remove(item)
+
+
+def random_embedding(rng: np.random.Generator) -> np.ndarray:
+    vector = rng.standard_normal(EMBEDDING_DIMENSIONS).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+@pytest.fixture(scope="module", params=[1_000, 10_000, 100_000])
+def memory(request) -> InMemoryVectorProvider:
+    rng = np.random.default_rng(BENCHMARK_SEED)
+    items = []
+    for i in range(request.param):
+        e_summary = random_embedding(rng)
+        items.append(
+            MemoryItem(
+                raw_content=f"Memory {i}",
+                summary=f"Summary of memory {i}",
+                chunks=[f"Memory {i}"],
+                chunk_summaries=[f"Summary of memory {i}"],
+                e_summary=e_summary,
+                e_chunks=[e_summary],
+                metadata={"source_type": "text_file", "location": f"file_{i}.txt"},
+            )
+        )
+    return InMemoryVectorProvider(items)
+
+
+def test_get_relevant(
+    benchmark, memory: InMemoryVectorProvider, config: Config, mocker
+):
+    e_query = random_embedding(np.random.default_rng(BENCHMARK_SEED + 1)).tolist()
+    mocker.patch(
+        "autogpt.memory.vector.providers.base.get_embedding", return_value=e_query
+    )
+
+    # Searching the largest index takes seconds, so keep the number of rounds low
+    relevant = benchmark.pedantic(
+        memory.get_relevant, ("What is in the files?", 5, config), rounds=3
+    )
+
+    assert len(relevant) == 5
+    assert relevant[0].score >= relevant[-1].score
@@ -1,4 +1,3 @@
-import os
 from functools import wraps
 from typing import Any, Callable, Optional
 
@@ -8,6 +7,7 @@ from tests.challenges.challenge_decorator.challenge import Challenge
 from tests.challenges.challenge_decorator.challenge_utils import create_challenge
 from tests.challenges.challenge_decorator.score_utils import (
     get_scores,
+    should_record_scores,
     update_new_score,
 )
 
@@ -51,7 +51,7 @@ def challenge() -> Callable[[Callable[..., Any]], Callable[..., None]]:
                         challenge.succeeded = False
                 else:
                     challenge.skipped = True
-                if os.environ.get("CI") == "true":
+                if should_record_scores():
                     new_max_level_beaten = get_new_max_level_beaten(
                         challenge, Challenge.BEAT_CHALLENGES
                     )
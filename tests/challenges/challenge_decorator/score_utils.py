@@ -6,6 +6,12 @@ from tests.challenges.challenge_decorator.challenge import Challenge
 
 CURRENT_SCORE_LOCATION = "../current_score"
 NEW_SCORE_LOCATION = "../new_score"
+# Set by the parallel runner, to give every worker a score file of its own
+NEW_SCORE_FILE_ENV = "CHALLENGE_NEW_SCORE_FILE"
+
+
+def should_record_scores() -> bool:
+    return os.environ.get("CI") == "true" or bool(os.environ.get(NEW_SCORE_FILE_ENV))
 
 
 def update_new_score(
@@ -55,5 +61,7 @@ def get_score_locations() -> Tuple[str, str]:
     filename_current_score = os.path.join(
         project_root, f"{CURRENT_SCORE_LOCATION}.json"
     )
-    filename_new_score = os.path.join(project_root, f"{NEW_SCORE_LOCATION}_{pid}.json")
+    filename_new_score = os.environ.get(NEW_SCORE_FILE_ENV) or os.path.join(
+        project_root, f"{NEW_SCORE_LOCATION}_{pid}.json"
+    )
     return filename_current_score, filename_new_score
@@ -0,0 +1,319 @@
+"""Run the challenges in parallel, every level in an interpreter of its own.
+
+Each level runs as a separate pytest process, so no singletons (logger, config,
+API manager, tracer, ...) are shared between levels, and every process gets its
+own base temp directory, which holds its workspace and file_logger.txt. Up to
+--workers processes run at the same time.
+
+The levels of a challenge share a VCR cassette, so they run one after the other
+unless cassettes are only played back (--record-mode none). Independent
+challenges always run in parallel.
+
+Every process reports its score in a file of its own. When all of them are done,
+the scores are merged into the current_score.json format:
+
+    python -m tests.challenges.parallel_runner --workers 8 --beat-challenges \\
+        --update-scores
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from tests.challenges.challenge_decorator.challenge_utils import CHALLENGE_PREFIX
+from tests.challenges.challenge_decorator.score_utils import NEW_SCORE_FILE_ENV
+
+CHALLENGES_DIRECTORY = Path(__file__).parent
+CURRENT_SCORE_FILE = CHALLENGES_DIRECTORY / "current_score.json"
+REPO_ROOT = CHALLENGES_DIRECTORY.parent.parent
+
+
+@dataclass
+class ChallengeUnit:
+    """A challenge and the levels to run, one after the other, in a single worker"""
+
+    node_id: str
+    category: str
+    name: str
+    levels: list[Optional[int]] = field(default_factory=lambda: [None])
+
+
+@dataclass
+class LevelResult:
+    node_id: str
+    level: Optional[int]
+    returncode: int
+    duration: float
+    score: dict[str, Any] = field(default_factory=dict)
+    output: str = ""
+
+    @property
+    def passed(self) -> bool:
+        return self.returncode == 0
+
+
+@dataclass
+class RunOptions:
+    beat_challenges: bool = False
+    record_mode: Optional[str] = None
+    pytest_args: list[str] = field(default_factory=list)
+
+
+def challenge_identifiers(node_id: str) -> tuple[str, str]:
+    """Get the category and name of a challenge, like the challenge decorator does"""
+    file_path, _, function_name = node_id.partition("::")
+    category = Path(file_path).parent.name
+    return category, function_name.replace(CHALLENGE_PREFIX, "", 1)
+
+
+def collect_challenges(paths: list[str]) -> list[str]:
+    """Get the node IDs of the challenges in the given paths"""
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", *paths],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    node_ids = [
+        line.strip()
+        for line in result.stdout.splitlines()
+        if "::" in line and not line.startswith(" ")
+    ]
+    # Challenges live in a directory per category; other tests don't
+    return [
+        node_id
+        for node_id in node_ids
+        if Path(node_id.partition("::")[0]).parent.resolve()
+        != CHALLENGES_DIRECTORY.resolve()
+    ]
+
+
+def plan_units(
+    node_ids: list[str],
+    current_score: dict[str, Any],
+    level: Optional[int] = None,
+    all_levels: bool = False,
+    split_levels: bool = False,
+) -> list[ChallengeUnit]:
+    """Divide the challenges into units of work that can run in parallel.
+
+    Args:
+        node_ids: The challenges to run
+        current_score: The scores, for the number of levels of every challenge
+        level: A specific level to run; by default the challenge decorator picks
+            the level based on the current score
+        all_levels: Whether to run every level of every challenge
+        split_levels: Whether the levels of a challenge can run in parallel
+
+    Returns:
+        list[ChallengeUnit]: The units of work, longest first
+    """
+    units = []
+    for node_id in node_ids:
+        category, name = challenge_identifiers(node_id)
+        if level is not None:
+            levels: list[Optional[int]] = [level]
+        elif all_levels:
+            max_level = current_score.get(category, {}).get(name, {}).get("max_level")
+            levels = list(range(1, (max_level or 1) + 1))
+        else:
+            levels = [None]
+
+        if split_levels:
+            units += [ChallengeUnit(node_id, category, name, [lvl]) for lvl in levels]
+        else:
+            units.append(ChallengeUnit(node_id, category, name, levels))
+
+    # Start the longest units first, so the pool isn't left waiting on them
+    return sorted(units, key=lambda unit: len(unit.levels), reverse=True)
+
+
+def run_level(
+    node_id: str, level: Optional[int], options: RunOptions, work_dir: Path
+) -> LevelResult:
+    """Run a single level of a challenge in a new pytest process"""
+    work_dir.mkdir(parents=True)
+    score_file = work_dir / "new_score.json"
+    command = [
+        sys.executable,
+        "-m",
+        "pytest",
+        node_id,
+        "-p",
+        "no:cacheprovider",
+        f"--basetemp={work_dir / 'tmp'}",
+    ]
+    if level is not None:
+        command.append(f"--level={level}")
+    if options.beat_challenges:
+        command.append("--beat-challenges")
+    if options.record_mode:
+        command.append(f"--record-mode={options.record_mode}")
+    command += options.pytest_args
+
+    started_at = time.perf_counter()
+    result = subprocess.run(
+        command,
+        cwd=REPO_ROOT,
+        env=os.environ | {NEW_SCORE_FILE_ENV: str(score_file)},
+        capture_output=True,
+        text=True,
+    )
+    duration = time.perf_counter() - started_at
+
+    score = json.loads(score_file.read_text()) if score_file.exists() else {}
+    return LevelResult(
+        node_id=node_id,
+        level=level,
+        returncode=result.returncode,
+        duration=duration,
+        score=score,
+        output=result.stdout + result.stderr,
+    )
+
+
+def run_unit(
+    unit: ChallengeUnit, options: RunOptions, work_dir: Path
+) -> list[LevelResult]:
+    return [
+        run_level(unit.node_id, level, options, work_dir / f"level_{level or 'auto'}")
+        for level in unit.levels
+    ]
+
+
+def run_parallel(
+    units: list[ChallengeUnit],
+    workers: int,
+    options: RunOptions,
+    work_dir: Path,
+) -> list[LevelResult]:
+    """Run the units in a pool of workers and return the results of all levels"""
+    results: list[LevelResult] = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(run_unit, unit, options, work_dir / f"unit_{i}")
+            for i, unit in enumerate(units)
+        ]
+        for future in as_completed(futures):
+            for result in future.result():
+                outcome = "passed" if result.passed else "failed"
+                print(
+                    f"{result.node_id} (level {result.level or 'auto'}):"
+                    f" {outcome} in {result.duration:.1f}s",
+                    flush=True,
+                )
+                results.append(result)
+    return results
+
+
+def aggregate_scores(
+    current_score: dict[str, Any], results: list[LevelResult]
+) -> dict[str, Any]:
+    """Merge the scores reported by all levels into the current score.
+
+    When several levels of a challenge ran, the highest level beaten counts. The
+    outcome does not depend on the order in which the levels finished.
+    """
+    score = copy.deepcopy(current_score)
+    reported: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for result in results:
+        for category, challenges in result.score.items():
+            for name, entry in challenges.items():
+                reported.setdefault((category, name), []).append(entry)
+
+    for (category, name), entries in sorted(reported.items()):
+        levels_beaten = [
+            e["max_level_beaten"] for e in entries if e["max_level_beaten"] is not None
+        ]
+        score.setdefault(category, {})[name] = {
+            "max_level_beaten": max(levels_beaten, default=None),
+            "max_level": max(e["max_level"] for e in entries),
+        }
+    return score
+
+
+def sort_score(score: dict[str, Any]) -> dict[str, Any]:
+    return {
+        key: sort_score(value) if isinstance(value, dict) else value
+        for key, value in sorted(score.items())
+    }
+
+
+def write_score(score: dict[str, Any], file_path: Path) -> None:
+    """Write a score file, replacing it at once so that it's never left partial"""
+    temp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(sort_score(score), indent=4) + "\n")
+    os.replace(temp_path, file_path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the challenges in parallel.")
+    parser.add_argument(
+        "paths", nargs="*", default=[str(CHALLENGES_DIRECTORY.relative_to(REPO_ROOT))]
+    )
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--beat-challenges", action="store_true")
+    parser.add_argument("--level", type=int, help="Run this level of every challenge")
+    parser.add_argument(
+        "--all-levels", action="store_true", help="Run every level of every challenge"
+    )
+    parser.add_argument(
+        "--record-mode",
+        type=str,
+        help="The VCR record mode; with 'none', levels also run in parallel",
+    )
+    parser.add_argument(
+        "--update-scores",
+        action="store_true",
+        help=f"Write the scores to {CURRENT_SCORE_FILE.name} instead of stdout",
+    )
+    args, pytest_args = parser.parse_known_args()
+
+    current_score = json.loads(CURRENT_SCORE_FILE.read_text())
+    units = plan_units(
+        collect_challenges(args.paths),
+        current_score,
+        level=args.level,
+        all_levels=args.all_levels,
+        split_levels=args.record_mode == "none",
+    )
+    options = RunOptions(args.beat_challenges, args.record_mode, pytest_args)
+
+    started_at = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="challenges_") as work_dir:
+        results = run_parallel(units, args.workers, options, Path(work_dir))
+    wall_time = time.perf_counter() - started_at
+
+    for result in results:
+        if not result.passed:
+            print(f"\n===== {result.node_id} (level {result.level or 'auto'}) =====")
+            print(result.output)
+
+    busy_time = sum(result.duration for result in results)
+    print(
+        f"Ran {len(results)} levels in {wall_time:.1f}s"
+        f" ({busy_time:.1f}s of work, {busy_time / max(wall_time, 1e-9):.1f}x)",
+        file=sys.stderr,
+    )
+
+    score = aggregate_scores(current_score, results)
+    if args.update_scores:
+        write_score(score, CURRENT_SCORE_FILE)
+    else:
+        print(json.dumps(sort_score(score), indent=4))
+
+    return 0 if all(result.passed for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
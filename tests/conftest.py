@@ -47,7 +47,10 @@ def temp_plugins_config_file():
 
 @pytest.fixture()
 def config(
-    temp_plugins_config_file: str, mocker: MockerFixture, workspace: Workspace
+    temp_plugins_config_file: str,
+    mocker: MockerFixture,
+    workspace: Workspace,
+    tmp_path: Path,
 ) -> Config:
     config = ConfigBuilder.build_config_from_env()
     if not os.environ.get("OPENAI_API_KEY"):
@@ -58,6 +61,8 @@ def config(
 
     config.plugins_dir = "tests/unit/data/test_plugins"
     config.plugins_config_file = temp_plugins_config_file
+    # Keep the plugins cache out of the test data
+    config.plugins_cache_file = str(tmp_path / "plugins_cache.json")
 
     # avoid circular dependency
     from autogpt.plugins.plugins_config import PluginsConfig
@@ -0,0 +1,78 @@
+import random
+
+import pytest
+from pytest_mock import MockerFixture
+
+from autogpt.logs import logger
+from autogpt.logs.tracing import Tracer
+from scripts.benchmark_agent_loop import cycle_metrics, run_benchmark, summarize
+from scripts.fake_openai_server import LatencyModel
+
+
+class CharTokenizer:
+    def encode(self, text: str, **kwargs) -> list[int]:
+        return [ord(c) for c in text]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(chr(t) for t in tokens)
+
+
+@pytest.fixture(autouse=True)
+def mock_tokenizer(mocker: MockerFixture):
+    mocker.patch("tiktoken.encoding_for_model", return_value=CharTokenizer())
+    mocker.patch("tiktoken.get_encoding", return_value=CharTokenizer())
+
+
+def test_latency_model_parse():
+    rng = random.Random(0)
+    assert LatencyModel.parse("0.5").sample(rng) == 0.5
+    assert 1 <= LatencyModel.parse("uniform:1,2").sample(rng) <= 2
+    assert LatencyModel.parse("normal:0,1").sample(rng) >= 0
+    with pytest.raises(ValueError):
+        LatencyModel.parse("uniform:1")
+
+
+def test_summarize():
+    stats = summarize([float(i) for i in range(1, 101)])
+    assert stats["p50"] == pytest.approx(50.5)
+    assert stats["p95"] == pytest.approx(95.05)
+    assert summarize([]) == {}
+
+
+def test_cycle_metrics():
+    tracer = Tracer()
+    tracer.enable()
+    durations_ms = {
+        "agent.cycle": 100,
+        "create_chat_completion": 40,
+        "get_embedding": 10,
+    }
+    with tracer.span("agent.cycle", cycle=1):
+        with tracer.span("chat_with_ai", tokens=500):
+            with tracer.span("create_chat_completion"):
+                pass
+        with tracer.span("get_embedding"):
+            pass
+    for span in tracer.spans:
+        span.end_ns = span.start_ns + durations_ms.get(span.name, 0) * 1_000_000
+
+    (metrics,) = cycle_metrics(tracer.spans, n_cycles=1)
+
+    assert metrics.llm_wait == pytest.approx(0.04)
+    assert metrics.embedding_wait == pytest.approx(0.01)
+    assert metrics.overhead == pytest.approx(0.05)
+    assert metrics.tokens_counted == 500
+
+
+def test_run_benchmark(config, mocker: MockerFixture, tmp_path):
+    mocker.patch.object(logger, "get_log_directory", return_value=str(tmp_path))
+
+    results = run_benchmark(cycles=3, latency=LatencyModel.parse("0.01"))
+
+    assert [c["cycle"] for c in results["cycles"]] == [1, 2, 3]
+    assert results["llm_requests"] >= 3
+    assert results["llm_wait"]["min"] >= 0.01
+    assert results["overhead"]["p95"] >= results["overhead"]["p50"] > 0
+    assert results["tokens"]["counted"] > 0
+    assert results["tokens"]["completion"] > 0
+    assert results["allocations"]["peak_traced_memory"] > 0
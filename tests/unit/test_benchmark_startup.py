@@ -0,0 +1,16 @@
+from scripts.benchmark_startup import ImportTimes
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     selenium.common
+import time:       250 |        350 |   selenium
+import time:        50 |        400 | autogpt.commands.web_selenium
+"""
+
+
+def test_parse_import_times():
+    imports = ImportTimes.parse(IMPORTTIME_OUTPUT)
+
+    assert imports.cumulative_us["autogpt.commands.web_selenium"] == 400
+    assert imports.total_us == 400
+    assert imports.top_level_packages() == {"selenium", "autogpt"}
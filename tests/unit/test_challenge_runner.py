@@ -0,0 +1,108 @@
+import json
+
+from pytest_mock import MockerFixture
+
+from tests.challenges import parallel_runner
+from tests.challenges.parallel_runner import (
+    ChallengeUnit,
+    LevelResult,
+    RunOptions,
+    aggregate_scores,
+    plan_units,
+    run_parallel,
+    write_score,
+)
+
+MEMORY_A = "tests/challenges/memory/test_memory_challenge_a.py::test_memory_challenge_a"
+WRITE_FILE = "tests/challenges/basic_abilities/test_write_file.py::test_write_file"
+
+CURRENT_SCORE = {
+    "memory": {"memory_challenge_a": {"max_level": 3, "max_level_beaten": 1}},
+    "basic_abilities": {"write_file": {"max_level": 2, "max_level_beaten": 1}},
+}
+
+
+def level_result(category: str, name: str, level: int, beaten: int | None):
+    return LevelResult(
+        node_id=name,
+        level=level,
+        returncode=0 if beaten else 1,
+        duration=1.0,
+        score={category: {name: {"max_level": 3, "max_level_beaten": beaten}}},
+    )
+
+
+def test_plan_units():
+    units = plan_units([WRITE_FILE, MEMORY_A], CURRENT_SCORE, all_levels=True)
+
+    assert [(u.category, u.name, u.levels) for u in units] == [
+        ("memory", "memory_challenge_a", [1, 2, 3]),
+        ("basic_abilities", "write_file", [1, 2]),
+    ]
+
+    units = plan_units([MEMORY_A], CURRENT_SCORE, all_levels=True, split_levels=True)
+    assert [u.levels for u in units] == [[1], [2], [3]]
+
+    units = plan_units([MEMORY_A], CURRENT_SCORE)
+    assert [u.levels for u in units] == [[None]]
+
+
+def test_aggregate_scores_takes_highest_level_beaten():
+    results = [
+        level_result("memory", "memory_challenge_a", 1, 1),
+        level_result("memory", "memory_challenge_a", 3, None),
+        level_result("memory", "memory_challenge_a", 2, 2),
+    ]
+
+    score = aggregate_scores(CURRENT_SCORE, results)
+
+    assert score["memory"]["memory_challenge_a"] == {
+        "max_level_beaten": 2,
+        "max_level": 3,
+    }
+    assert score["basic_abilities"] == CURRENT_SCORE["basic_abilities"]
+    assert aggregate_scores(CURRENT_SCORE, results[::-1]) == score
+    assert CURRENT_SCORE["memory"]["memory_challenge_a"]["max_level_beaten"] == 1
+
+
+def test_aggregate_scores_failed_challenge():
+    results = [level_result("memory", "memory_challenge_a", 1, None)]
+
+    score = aggregate_scores(CURRENT_SCORE, results)
+
+    assert score["memory"]["memory_challenge_a"]["max_level_beaten"] is None
+
+
+def test_write_score(tmp_path):
+    score_file = tmp_path / "current_score.json"
+
+    write_score(CURRENT_SCORE, score_file)
+
+    assert list(json.loads(score_file.read_text())) == ["basic_abilities", "memory"]
+    assert [p.name for p in tmp_path.iterdir()] == ["current_score.json"]
+
+
+def test_run_parallel_gives_every_level_its_own_directory(
+    mocker: MockerFixture, tmp_path
+):
+    run_level = mocker.patch.object(
+        parallel_runner,
+        "run_level",
+        side_effect=lambda node_id, level, options, work_dir: LevelResult(
+            node_id, level, 0, 0.0
+        ),
+    )
+    units = [
+        ChallengeUnit(MEMORY_A, "memory", "memory_challenge_a", [1, 2]),
+        ChallengeUnit(WRITE_FILE, "basic_abilities", "write_file", [1]),
+    ]
+
+    results = run_parallel(units, 2, RunOptions(), tmp_path)
+
+    assert sorted((r.node_id, r.level) for r in results) == [
+        (WRITE_FILE, 1),
+        (MEMORY_A, 1),
+        (MEMORY_A, 2),
+    ]
+    work_dirs = [call.args[3] for call in run_level.call_args_list]
+    assert len(set(work_dirs)) == 3
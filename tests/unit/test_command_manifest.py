@@ -0,0 +1,71 @@
+import sys
+
+import pytest
+
+from autogpt.main import COMMAND_CATEGORIES
+from autogpt.models.command import ConfigPredicate, LazyCommand
+from autogpt.models.command_manifest import CommandManifest
+from autogpt.models.command_registry import CommandRegistry
+
+MOCK_COMMANDS_MODULE = "tests.mocks.mock_commands"
+
+
+@pytest.fixture
+def manifest(tmp_path) -> CommandManifest:
+    manifest_file = tmp_path / "manifest.json"
+    CommandManifest.generate([MOCK_COMMANDS_MODULE]).save(manifest_file)
+    sys.modules.pop(MOCK_COMMANDS_MODULE, None)
+    return CommandManifest.load(manifest_file)
+
+
+def test_command_manifest_is_up_to_date():
+    """The manifest must be regenerated after changing a command module:
+    python -m autogpt.models.command_manifest"""
+    assert CommandManifest.load().modules == (
+        CommandManifest.generate(COMMAND_CATEGORIES).modules
+    )
+
+
+def test_import_commands_from_manifest_is_lazy(manifest: CommandManifest):
+    registry = CommandRegistry()
+
+    registry.import_commands(MOCK_COMMANDS_MODULE, manifest)
+
+    command = registry.get_command("function_based")
+    assert isinstance(command, LazyCommand)
+    assert command.description == "Function-based test command"
+    assert [p.name for p in command.parameters] == ["arg1", "arg2"]
+    assert MOCK_COMMANDS_MODULE not in sys.modules
+
+    assert registry.call("function_based", arg1=1, arg2="test") == "1 - test"
+    assert command.is_loaded
+    assert MOCK_COMMANDS_MODULE in sys.modules
+
+
+def test_import_commands_with_changed_module(manifest: CommandManifest):
+    manifest.modules[MOCK_COMMANDS_MODULE]["checksum"] = "outdated"
+    registry = CommandRegistry()
+
+    registry.import_commands(MOCK_COMMANDS_MODULE, manifest)
+
+    assert not isinstance(registry.get_command("function_based"), LazyCommand)
+    assert MOCK_COMMANDS_MODULE in sys.modules
+
+
+def test_command_manifest_stores_config_predicates(config, mocker):
+    manifest = CommandManifest.generate(["autogpt.commands.web_search"])
+
+    (google,) = [
+        c
+        for c in manifest.get_commands("autogpt.commands.web_search")  # type: ignore
+        if c.name == "google"
+    ]
+    assert google.enabled == ConfigPredicate(
+        "google_api_key", "google_custom_search_engine_id"
+    )
+    mocker.patch.multiple(
+        config, google_api_key="key", google_custom_search_engine_id=None
+    )
+    assert not google.enabled(config)
+    config.google_custom_search_engine_id = "engine"
+    assert google.enabled(config)
@@ -0,0 +1,190 @@
+import itertools
+import sys
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+
+from autogpt.agent.agent import Agent
+from autogpt.commands import execute_code
+from autogpt.commands.execute_code_utils import (
+    ExecutionResult,
+    HeadTailBuffer,
+    SandboxPool,
+    run_process,
+)
+
+
+class FakeContainer:
+    def __init__(self, container_id: str):
+        self.id = container_id
+        self.removed = False
+
+    def remove(self, force: bool = False):
+        self.removed = True
+
+
+class FakeContainers:
+    def __init__(self):
+        self.started: list[FakeContainer] = []
+        self.run_kwargs: list[dict] = []
+
+    def run(self, image, command, **kwargs):
+        container = FakeContainer(f"container-{len(self.started)}")
+        self.started.append(container)
+        self.run_kwargs.append(kwargs)
+        return container
+
+
+class FakeImages:
+    def get(self, name):
+        return name
+
+
+class FakeAPI:
+    """Fake low-level API client that "executes" commands by echoing them"""
+
+    def __init__(self):
+        self._ids = itertools.count()
+        self.execs: dict[str, tuple[str, list[str]]] = {}
+        self.output_factor = 1
+
+    def exec_create(self, container_id, cmd, workdir=None):
+        exec_id = f"exec-{next(self._ids)}"
+        self.execs[exec_id] = (container_id, cmd)
+        return {"Id": exec_id}
+
+    def exec_start(self, exec_id, stream=False):
+        _, cmd = self.execs[exec_id]
+        for _ in range(self.output_factor):
+            yield " ".join(cmd[4:]).encode() + b"\n"
+
+    def exec_inspect(self, exec_id):
+        return {"ExitCode": 0}
+
+
+class FakeDockerClient:
+    def __init__(self):
+        self.containers = FakeContainers()
+        self.images = FakeImages()
+        self.api = FakeAPI()
+
+
+@pytest.fixture
+def client():
+    return FakeDockerClient()
+
+
+@pytest.fixture
+def pool(client: FakeDockerClient, tmp_path):
+    pool = SandboxPool(str(tmp_path), client=client, size=2, max_runs=3)
+    yield pool
+    pool.shutdown()
+
+
+def test_sandbox_pool_reuses_warm_containers(pool: SandboxPool, client):
+    pool.warm_up().result()
+    assert len(client.containers.started) == 2
+    assert client.containers.run_kwargs[0]["volumes"][pool.workspace_path] == {
+        "bind": "/workspace",
+        "mode": "ro",
+    }
+
+    for _ in range(2):
+        result = pool.run(["python", "script.py"], timeout=5)
+        assert result.output == "python script.py\n"
+        assert result.exit_code == 0
+
+    pool.warm_up().result()
+    assert len(client.containers.started) == 2
+    for _, cmd in client.api.execs.values():
+        assert cmd[:4] == ["timeout", "-s", "KILL", "5"]
+
+
+def test_sandbox_pool_recycles_containers_after_max_runs(pool: SandboxPool, client):
+    pool.warm_up().result()
+    for _ in range(6):
+        pool.run(["python", "script.py"])
+        pool.warm_up().result()
+
+    # 2 containers with 3 runs each have been recycled
+    assert len(client.containers.started) == 4
+    assert sum(c.removed for c in client.containers.started) == 2
+
+
+def test_sandbox_pool_caps_output(pool: SandboxPool, client):
+    client.api.output_factor = 100
+
+    result = pool.run(["python", "script.py"], output_limit=100)
+
+    assert result.truncated
+    assert len(result.output) == 100
+    assert "[Output truncated]" in str(result)
+    # The container may still be running the script, so it must not be reused
+    assert client.containers.started[0].removed
+
+
+def test_head_tail_buffer():
+    buffer = HeadTailBuffer(head_size=4, tail_size=4)
+    for chunk in [b"ab", b"cdef", b"ghijkl"]:
+        buffer.write(chunk)
+
+    assert buffer.total == 12
+    assert buffer.getvalue() == "abcd\n... [4 bytes omitted] ...\nijkl"
+
+
+def test_run_process_uses_cwd(tmp_path):
+    result = run_process(
+        [sys.executable, "-c", "import os; print(os.getcwd())"], cwd=tmp_path
+    )
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == str(tmp_path)
+
+
+def test_run_process_bounds_output(tmp_path):
+    result = run_process(
+        [sys.executable, "-c", "print('x' * 1_000_000, end='')"],
+        cwd=tmp_path,
+        head_size=10,
+        tail_size=10,
+    )
+
+    assert result.stdout == "x" * 10 + "\n... [999980 bytes omitted] ...\n" + "x" * 10
+
+
+def test_run_process_times_out(tmp_path):
+    started_at = time.monotonic()
+    result = run_process(
+        [
+            sys.executable,
+            "-c",
+            "import time; print('started', flush=True); time.sleep(60)",
+        ],
+        cwd=tmp_path,
+        timeout=0.5,
+    )
+
+    assert time.monotonic() - started_at < 10
+    assert result.timed_out
+    assert result.returncode is None
+    assert result.stdout == "started\n"
+
+
+def test_execute_python_file_truncates_pool_output(agent: Agent, mocker: MockerFixture):
+    file_path = agent.workspace.get_path("script.py")
+    file_path.write_text("print('spam ' * 20000)")
+    mocker.patch.object(
+        execute_code, "we_are_running_in_a_docker_container", return_value=False
+    )
+    pool = mocker.Mock(image="python:3-alpine")
+    pool.run.return_value = ExecutionResult("spam " * 20000, 0)
+    mocker.patch.object(execute_code, "get_sandbox_pool", return_value=pool)
+    truncate_output = mocker.patch.object(
+        execute_code, "truncate_output", return_value="spam ... spam"
+    )
+
+    result = execute_code.execute_python_file(str(file_path), agent=agent)
+
+    assert result == "spam ... spam"
+    truncate_output.assert_called_once_with("spam " * 20000, agent)
@@ -2,7 +2,6 @@
 This set of unit tests is designed to test the file operations that autoGPT has access to.
 """
 
-import hashlib
 import os
 import re
 from io import TextIOWrapper
@@ -12,6 +11,7 @@ import pytest
 from pytest_mock import MockerFixture
 
 import autogpt.commands.file_operations as file_ops
+import autogpt.commands.file_operations_utils as file_ops_utils
 from autogpt.agent.agent import Agent
 from autogpt.config import Config
 from autogpt.memory.vector.memory_item import MemoryItem
@@ -124,13 +124,84 @@ def test_file_operations_state(test_file: TextIOWrapper):
     assert file_ops.file_operations_state(test_file.name) == expected_state
 
 
+def test_file_operations_index(test_file: TextIOWrapper):
+    test_file.write(
+        "File Operation Logger\n"
+        "write: path/to/file1.txt #checksum1\n"
+        "write: path/to/file2.txt #checksum2\n"
+    )
+    test_file.flush()
+
+    index = file_ops.FileOperationsIndex(test_file.name)
+    assert index.state == {
+        "path/to/file1.txt": "checksum1",
+        "path/to/file2.txt": "checksum2",
+    }
+
+    # Only complete lines are consumed
+    test_file.write("delete: path/to/file1.txt\nappend: path/to/file2.txt")
+    test_file.flush()
+    assert index.state == {"path/to/file2.txt": "checksum2"}
+
+    test_file.write(" #checksum3\n")
+    test_file.close()
+    assert index.state == file_ops.file_operations_state(test_file.name)
+    assert index.state == {"path/to/file2.txt": "checksum3"}
+
+
+def test_file_operations_index_rebuilds_truncated_log(test_file: TextIOWrapper):
+    test_file.write("write: path/to/file1.txt #checksum1\n")
+    test_file.flush()
+    index = file_ops.FileOperationsIndex(test_file.name)
+    assert index.state == {"path/to/file1.txt": "checksum1"}
+
+    test_file.seek(0)
+    test_file.truncate()
+    test_file.write("write: path/2.txt #c2\n")
+    test_file.close()
+    assert index.state == {"path/2.txt": "c2"}
+
+
+def test_file_operations_index_replays_tail_after_snapshot(
+    test_file: TextIOWrapper, mocker: MockerFixture
+):
+    test_file.write(
+        "write: path/to/file1.txt #checksum1\n" "write: path/to/file2.txt #checksum2\n"
+    )
+    test_file.flush()
+    index = file_ops.FileOperationsIndex(test_file.name, snapshot_interval=2)
+    assert index.snapshot_path.exists()
+    snapshot_offset = index._offset
+
+    test_file.write("delete: path/to/file1.txt\n")
+    test_file.close()
+
+    parse_log_line = mocker.spy(file_ops, "parse_log_line")
+    restored_index = file_ops.FileOperationsIndex(test_file.name)
+    assert restored_index.state == {"path/to/file2.txt": "checksum2"}
+    assert parse_log_line.call_count == 1
+    assert restored_index._offset > snapshot_offset
+
+    # A snapshot that doesn't match the log is ignored
+    with open(test_file.name, "w") as f:
+        f.write("write: path/to/file3.txt #checksum3\n")
+    assert file_ops.FileOperationsIndex(test_file.name).state == {
+        "path/to/file3.txt": "checksum3"
+    }
+
+
 def test_is_duplicate_operation(agent: Agent, mocker: MockerFixture):
     # Prepare a fake state dictionary for the function to use
     state = {
         "path/to/file1.txt": "checksum1",
         "path/to/file2.txt": "checksum2",
     }
-    mocker.patch.object(file_ops, "file_operations_state", lambda _: state)
+    mocker.patch.object(
+        file_ops.FileOperationsIndex,
+        "state",
+        new_callable=mocker.PropertyMock,
+        return_value=state,
+    )
 
     # Test cases with write operations
     assert (
@@ -197,6 +268,52 @@ def test_read_file(
     assert content.replace("\r", "") == file_content
 
 
+def test_read_file_reuses_memory_of_unchanged_file(
+    mock_MemoryItem_from_text,
+    test_file_with_content_path: Path,
+    file_content,
+    agent: Agent,
+    mocker: MockerFixture,
+):
+    from_text_file = mocker.spy(file_ops.MemoryItem, "from_text_file")
+    read_textual_file = mocker.spy(file_ops, "read_textual_file")
+
+    for _ in range(3):
+        content = file_ops.read_file(test_file_with_content_path, agent=agent)
+        assert content.replace("\r", "") == file_content
+    assert from_text_file.call_count == 1
+    assert read_textual_file.call_count == 1
+
+    # Touching the file without changing it requires a read, but no new memory
+    os.utime(test_file_with_content_path, ns=(0, 0))
+    file_ops.read_file(test_file_with_content_path, agent=agent)
+    assert from_text_file.call_count == 1
+    assert read_textual_file.call_count == 2
+
+
+def test_read_file_cache_invalidated_by_file_commands(
+    mock_MemoryItem_from_text,
+    test_file_with_content_path: Path,
+    agent: Agent,
+    mocker: MockerFixture,
+):
+    from_text_file = mocker.spy(file_ops.MemoryItem, "from_text_file")
+    file_ops.read_file(test_file_with_content_path, agent=agent)
+
+    file_ops.write_to_file(str(test_file_with_content_path), "New text\n", agent=agent)
+    assert file_ops.read_file(test_file_with_content_path, agent=agent) == "New text\n"
+
+    file_ops.append_to_file(test_file_with_content_path, "More text\n", agent=agent)
+    assert (
+        file_ops.read_file(test_file_with_content_path, agent=agent)
+        == "New text\nMore text\n"
+    )
+    assert from_text_file.call_count == 3
+
+    file_ops.delete_file(str(test_file_with_content_path), agent=agent)
+    assert "Error:" in file_ops.read_file(test_file_with_content_path, agent=agent)
+
+
 def test_read_file_not_found(agent: Agent):
     filename = "does_not_exist.txt"
     content = file_ops.read_file(filename, agent=agent)
@@ -271,17 +388,82 @@ def test_append_to_file_uses_checksum_from_appended_file(
     with open(agent.config.file_logger_path, "r", encoding="utf-8") as f:
         log_contents = f.read()
 
-    digest = hashlib.md5()
-    digest.update(append_text.encode("utf-8"))
-    checksum1 = digest.hexdigest()
-    digest.update(append_text.encode("utf-8"))
-    checksum2 = digest.hexdigest()
+    checksum1 = file_ops.text_checksum(append_text)
+    checksum2 = file_ops.text_checksum(append_text + append_text)
     assert log_contents == (
         f"append: {test_file_name} #{checksum1}\n"
         f"append: {test_file_name} #{checksum2}\n"
     )
 
 
+def test_text_hasher_is_incremental():
+    text_a, text_b = "\0First part ✓\n", "second part\n"
+    hasher = file_ops.text_hasher(text_a)
+    hasher.update(text_b.encode("utf-8"))
+    assert hasher.hexdigest() == file_ops.text_checksum(text_a + text_b)
+    assert file_ops.text_checksum(text_a) != file_ops.text_checksum(text_a[1:])
+
+
+def test_write_to_file_reordered_records(test_file_name: Path, agent: Agent):
+    record_1 = "a" * 126 + "\n"
+    record_2 = "b" * 126 + "\n"
+    file_ops.write_to_file(str(test_file_name), record_1 + record_2, agent=agent)
+
+    result = file_ops.write_to_file(
+        str(test_file_name), record_2 + record_1, agent=agent
+    )
+
+    assert result == "File written to successfully."
+    with open(agent.workspace.get_path(test_file_name), encoding="utf-8") as f:
+        assert f.read() == record_2 + record_1
+
+
+def test_append_to_file_does_not_rehash_file(
+    test_file_name: Path, agent: Agent, mocker: MockerFixture
+):
+    file_ops.write_to_file(str(test_file_name), "Initial content.\n", agent=agent)
+    file_hasher = mocker.spy(file_ops, "file_hasher")
+
+    for i in range(3):
+        file_ops.append_to_file(test_file_name, f"Line {i}\n", agent=agent)
+
+    assert file_hasher.call_count == 0
+    state = file_ops.file_operations_state(agent.config.file_logger_path)
+    assert state[str(test_file_name)] == file_ops.file_checksum(
+        agent.workspace.get_path(test_file_name)
+    )
+
+
+def test_append_to_unlogged_file_hashes_it_once(
+    test_file_name: Path, agent: Agent, mocker: MockerFixture
+):
+    # e.g. a file from before a restart, whose hash state is not in memory
+    file_path = agent.workspace.get_path(test_file_name)
+    file_path.write_text("Unlogged content.\n" * 1000, encoding="utf-8")
+    file_hasher = mocker.spy(file_ops, "file_hasher")
+
+    for i in range(5):
+        file_ops.append_to_file(test_file_name, f"Line {i}\n", agent=agent)
+
+    assert file_hasher.call_count == 1
+    state = file_ops.file_operations_state(agent.config.file_logger_path)
+    assert state[str(test_file_name)] == file_ops.file_checksum(file_path)
+
+
+def test_append_to_file_rehashes_externally_modified_file(
+    test_file_name: Path, agent: Agent
+):
+    file_path = agent.workspace.get_path(test_file_name)
+    file_ops.append_to_file(test_file_name, "Logged text.\n", agent=agent)
+    with open(file_path, "a", encoding="utf-8") as f:
+        f.write("Unlogged text.\n")
+
+    file_ops.append_to_file(test_file_name, "More logged text.\n", agent=agent)
+
+    state = file_ops.file_operations_state(agent.config.file_logger_path)
+    assert state[str(test_file_name)] == file_ops.file_checksum(file_path)
+
+
 def test_delete_file(test_file_with_content_path: Path, agent: Agent):
     result = file_ops.delete_file(str(test_file_with_content_path), agent=agent)
     assert result == "File deleted successfully."
@@ -333,3 +515,92 @@ def test_list_files(workspace: Workspace, test_directory: Path, agent: Agent):
     non_existent_file = "non_existent_file.txt"
     files = file_ops.list_files("", agent=agent)
     assert non_existent_file not in files
+
+
+@pytest.fixture()
+def file_tree(workspace: Workspace) -> Path:
+    root = workspace.get_path("tree")
+    for path in [
+        "a.txt",
+        "b.py",
+        "sub/c.py",
+        "sub/deeper/d.py",
+        "sub/deeper/e.log",
+        "node_modules/pkg/index.js",
+        ".hidden/f.txt",
+        "build/out.bin",
+    ]:
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(path)
+    (root / ".gitignore").write_text("# build output\nbuild/\n*.log\n!keep.log\n")
+    (root / "sub" / "keep.log").write_text("keep")
+    return root
+
+
+def test_list_files_ignore_rules(file_tree: Path, agent: Agent):
+    files = file_ops.list_files(str(file_tree), agent=agent)
+    assert files == [
+        os.path.join("tree", *p.split("/"))
+        for p in ["a.txt", "b.py", "sub/c.py", "sub/deeper/d.py", "sub/keep.log"]
+    ]
+
+
+def test_ignore_rules_are_not_shared():
+    rules = file_ops_utils.IgnoreRules()
+    rules.rules.append(((), file_ops_utils.IgnoreRule.parse("*.log")))
+
+    assert file_ops_utils.IgnoreRules().rules == []
+
+
+def test_list_files_pattern_and_depth(file_tree: Path, agent: Agent):
+    files = file_ops.list_files(str(file_tree), agent=agent, pattern="*.py")
+    assert files == [
+        os.path.join("tree", "b.py"),
+        os.path.join("tree", "sub", "c.py"),
+        os.path.join("tree", "sub", "deeper", "d.py"),
+    ]
+
+    files = file_ops.list_files(
+        str(file_tree), agent=agent, pattern="*.py", max_depth=1
+    )
+    assert files == [os.path.join("tree", "b.py"), os.path.join("tree", "sub", "c.py")]
+
+
+def test_list_files_pagination(file_tree: Path, agent: Agent):
+    all_files = file_ops.list_files(str(file_tree), agent=agent)
+
+    listed = []
+    cursor = None
+    for _ in range(len(all_files)):
+        page = file_ops.list_files(
+            str(file_tree), agent=agent, cursor=cursor, page_size=2
+        )
+        if page and "cursor '" in page[-1]:
+            cursor = page[-1].split("cursor '")[1].rstrip("')")
+            listed += page[:-1]
+        else:
+            listed += page
+            break
+    assert listed == all_files
+
+    # A cursor stays valid if files are added before it
+    (file_tree / "0.txt").write_text("new")
+    page = file_ops.list_files(
+        str(file_tree), agent=agent, cursor=all_files[1], page_size=10
+    )
+    assert page == all_files[2:]
+
+
+def test_list_files_index_invalidation(
+    file_tree: Path, agent: Agent, mocker: MockerFixture
+):
+    scan_directory = mocker.spy(file_ops_utils, "scan_directory")
+    file_ops.list_files(str(file_tree), agent=agent)
+    n_scans = scan_directory.call_count
+    file_ops.list_files(str(file_tree), agent=agent)
+    assert scan_directory.call_count == n_scans
+
+    file_ops.write_to_file(str(file_tree / "sub" / "new.py"), "new", agent=agent)
+    files = file_ops.list_files(str(file_tree), agent=agent, pattern="*.py")
+    assert os.path.join("tree", "sub", "new.py") in files
+    assert scan_directory.call_count > n_scans
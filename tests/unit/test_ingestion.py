@@ -0,0 +1,167 @@
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from autogpt.config import Config
+from autogpt.memory.vector import JSONFileMemory
+from autogpt.processing.ingestion import IngestionManifest, IngestionPipeline
+
+
+class CharTokenizer:
+    def encode(self, text: str) -> list[int]:
+        return [ord(c) for c in text]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(chr(t) for t in tokens)
+
+
+@pytest.fixture(autouse=True)
+def mock_tokenizer(mocker: MockerFixture):
+    mocker.patch(
+        "autogpt.processing.text.tiktoken.encoding_for_model",
+        return_value=CharTokenizer(),
+    )
+
+
+@pytest.fixture(autouse=True)
+def mock_summarize_text(mocker: MockerFixture):
+    return mocker.patch(
+        "autogpt.memory.vector.memory_item.summarize_text",
+        side_effect=lambda text, config, **kwargs: (f"Summary of '{text}'", None),
+    )
+
+
+@pytest.fixture(autouse=True)
+def mock_get_embedding(mocker: MockerFixture):
+    return mocker.patch(
+        "autogpt.memory.vector.memory_item.get_embedding",
+        side_effect=lambda input, config: (
+            [[float(len(text))] for text in input]
+            if isinstance(input, list)
+            else [float(len(input))]
+        ),
+    )
+
+
+@pytest.fixture
+def memory(mocker: MockerFixture, config: Config):
+    memory = JSONFileMemory(config)
+    memory.clear()
+    mocker.spy(memory, "add_many")
+    return memory
+
+
+@pytest.fixture
+def source_files(tmp_path: Path) -> list[str]:
+    files = []
+    for i in range(5):
+        file = tmp_path / f"file_{i}.txt"
+        file.write_text(f"content of file {i}")
+        files.append(str(file))
+    return files
+
+
+def make_pipeline(memory, config: Config, manifest_path: Path) -> IngestionPipeline:
+    pipeline = IngestionPipeline(
+        memory,
+        config,
+        max_chunk_length=10,
+        overlap=2,
+        parse_workers=2,
+        llm_workers=2,
+        batch_size=2,
+        use_processes=False,
+    )
+    pipeline.manifest = IngestionManifest(manifest_path, pipeline.params)
+    return pipeline
+
+
+def test_ingestion_pipeline_batches_writes(
+    memory, config: Config, source_files: list[str], tmp_path: Path
+):
+    stats = make_pipeline(memory, config, tmp_path / "manifest.jsonl").run(source_files)
+
+    assert stats.files_ingested == 5
+    assert stats.n_tokens > 0 and stats.tokens_per_second > 0
+    assert memory.add_many.call_count == 3
+    ingested = {
+        item.metadata["location"]
+        for call in memory.add_many.call_args_list
+        for item in call.args[0]
+    }
+    assert ingested == set(source_files)
+
+
+def test_ingestion_pipeline_resumes_from_manifest(
+    memory, config: Config, source_files: list[str], tmp_path: Path
+):
+    manifest_path = tmp_path / "manifest.jsonl"
+    make_pipeline(memory, config, manifest_path).run(source_files[:3])
+    Path(source_files[0]).write_text("changed content")
+
+    stats = make_pipeline(memory, config, manifest_path).run(source_files)
+
+    assert stats.files_ingested == 3
+    assert stats.files_skipped == 2
+    assert sorted(m.metadata["location"] for m in memory) == sorted(source_files)
+    assert "changed content" in [m.raw_content for m in memory]
+
+
+def test_ingestion_pipeline_reuses_unchanged_chunks(
+    memory, config: Config, tmp_path: Path, mock_summarize_text
+):
+    manifest_path = tmp_path / "manifest.jsonl"
+    source_file = tmp_path / "file.txt"
+    source_file.write_text("aaaaaaaaaabbbbbbbbcccccccc")
+    make_pipeline(memory, config, manifest_path).run([str(source_file)])
+    (original,) = memory
+    mock_summarize_text.reset_mock()
+
+    source_file.write_text("aaaaaaaaaabbbbbbbbcccccccX")
+    stats = make_pipeline(memory, config, manifest_path).run([str(source_file)])
+
+    (updated,) = memory
+    assert updated.chunks[:2] == original.chunks[:2]
+    assert updated.e_chunks[:2] == original.e_chunks[:2]
+    assert stats.n_reused_chunks == 2
+    summarized = [call.args[0] for call in mock_summarize_text.call_args_list]
+    assert summarized[0] == updated.chunks[2]
+    assert updated.chunks[0] not in summarized
+
+
+def test_ingestion_pipeline_purges_deleted_files(
+    memory, config: Config, source_files: list[str], tmp_path: Path
+):
+    manifest_path = tmp_path / "manifest.jsonl"
+    make_pipeline(memory, config, manifest_path).run(source_files)
+    Path(source_files[0]).unlink()
+
+    stats = make_pipeline(memory, config, manifest_path).run(
+        source_files[1:], purge_deleted_in=str(tmp_path)
+    )
+
+    assert stats.files_purged == 1
+    assert sorted(m.metadata["location"] for m in memory) == source_files[1:]
+    manifest = IngestionManifest(
+        manifest_path, make_pipeline(memory, config, manifest_path).params
+    )
+    assert set(manifest.hashes) == set(source_files[1:])
+
+
+def test_ingestion_pipeline_records_failures(
+    memory, config: Config, source_files: list[str], tmp_path: Path
+):
+    manifest_path = tmp_path / "manifest.jsonl"
+    missing_file = str(tmp_path / "missing.txt")
+
+    stats = make_pipeline(memory, config, manifest_path).run(
+        source_files + [missing_file]
+    )
+
+    assert stats.files_ingested == 5
+    assert list(stats.files_failed) == [missing_file]
+    manifest = IngestionManifest(
+        manifest_path, make_pipeline(memory, config, manifest_path).params
+    )
+    assert set(manifest.hashes) == set(source_files)
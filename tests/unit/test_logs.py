@@ -1,6 +1,19 @@
+import json
+import logging
+import time
+
 import pytest
 
-from autogpt.logs import remove_color_codes
+from autogpt.llm.base import Message
+from autogpt.logs import (
+    MESSAGE_LOG_FILE_NAME,
+    LogCycleHandler,
+    logger,
+    remove_color_codes,
+)
+from autogpt.logs.handlers import ConsoleRenderer, TypingConsoleHandler
+from autogpt.logs.log_cycle import CycleLogWriter
+from autogpt.logs.message_log import MessageLog
 
 
 @pytest.mark.parametrize(
@@ -26,3 +39,124 @@ from autogpt.logs import remove_color_codes
 )
 def test_remove_color_codes(raw_text, clean_text):
     assert remove_color_codes(raw_text) == clean_text
+
+
+def test_log_cycle_writes_in_background(tmp_path, mocker):
+    mocker.patch.object(logger, "get_log_directory", return_value=str(tmp_path))
+    writer = CycleLogWriter()
+    handler = LogCycleHandler(writer)
+    history = [{"role": "user", "content": "Grüße"}]
+
+    handler.log_cycle("Test Agent", "20230101", 1, history, "history.json")
+    handler.log_cycle("Test Agent", "20230101", 1, "A summary", "summary.txt")
+    writer.close()
+
+    cycle_dir = tmp_path / "DEBUG" / "20230101_Test Agent" / "001"
+    assert json.loads((cycle_dir / "0_history.json").read_text("utf-8")) == history
+    assert json.loads((cycle_dir / "1_summary.txt").read_text("utf-8")) == "A summary"
+
+
+def test_cycle_log_writer_flush(tmp_path):
+    writer = CycleLogWriter(max_queue_size=2)
+    for i in range(10):
+        writer.submit(str(tmp_path / "logs" / f"{i}.json"), {"i": i})
+    writer.flush()
+
+    assert len(list((tmp_path / "logs").iterdir())) == 10
+    writer.close()
+
+
+def test_message_log_round_trip(tmp_path, mocker):
+    mocker.patch.object(logger, "get_log_directory", return_value=str(tmp_path))
+    writer = CycleLogWriter()
+    handler = LogCycleHandler(writer)
+    system = Message("system", "You are Test Agent")
+    history = [Message("user", "Do something"), Message("assistant", "Done")]
+
+    handler.log_message_history("Test Agent", "20230101", 1, history[:1])
+    handler.log_message_context("Test Agent", "20230101", 1, [system, *history[:1]])
+    handler.log_message_history("Test Agent", "20230101", 2, history)
+    handler.log_message_context("Test Agent", "20230101", 2, [system, *history])
+    writer.close()
+
+    log_file = tmp_path / "DEBUG" / "20230101_Test Agent" / MESSAGE_LOG_FILE_NAME
+    events = [json.loads(line) for line in log_file.read_text("utf-8").splitlines()]
+    # Every message is logged only once
+    assert [e["message"] for e in events if e["event"] == "message"] == [
+        history[0].raw(),
+        system.raw(),
+        history[1].raw(),
+    ]
+
+    message_log = MessageLog.load(log_file)
+    assert message_log.cycles == [1, 2]
+    assert message_log.history(1) == [history[0].raw()]
+    assert message_log.history() == [m.raw() for m in history]
+    assert message_log.context(1) == [system.raw(), history[0].raw()]
+    assert message_log.context(2) == [system.raw(), *(m.raw() for m in history)]
+
+
+def test_message_log_resets_rewritten_history(tmp_path, mocker):
+    mocker.patch.object(logger, "get_log_directory", return_value=str(tmp_path))
+    writer = CycleLogWriter()
+    handler = LogCycleHandler(writer)
+    history = [Message("user", "A"), Message("assistant", "B")]
+
+    handler.log_message_history("Test Agent", "20230101", 1, history)
+    handler.log_message_history("Test Agent", "20230101", 2, history[1:])
+    writer.close()
+
+    log_file = tmp_path / "DEBUG" / "20230101_Test Agent" / MESSAGE_LOG_FILE_NAME
+    message_log = MessageLog.load(log_file)
+    assert "reset" in message_log.history_events[-1]
+    assert message_log.history(1) == [m.raw() for m in history]
+    assert message_log.history(2) == [history[1].raw()]
+
+
+def test_message_log_is_truncated_on_new_run(tmp_path, mocker):
+    mocker.patch.object(logger, "get_log_directory", return_value=str(tmp_path))
+    mocker.patch.dict("os.environ", {"OVERWRITE_DEBUG": "1"})
+    writer = CycleLogWriter()
+    first_run = [Message("user", "First run")]
+    second_run = [Message("user", "Second run")]
+
+    LogCycleHandler(writer).log_message_history("Test Agent", "1", 1, first_run)
+    handler = LogCycleHandler(writer)
+    handler.log_message_history("Test Agent", "2", 1, second_run)
+    handler.log_message_context("Test Agent", "2", 1, second_run)
+    writer.close()
+
+    log_file = tmp_path / "DEBUG" / "auto_gpt" / MESSAGE_LOG_FILE_NAME
+    message_log = MessageLog.load(log_file)
+    assert message_log.cycles == [1]
+    assert message_log.history() == [second_run[0].raw()]
+    assert message_log.context(1) == [second_run[0].raw()]
+
+
+def test_typing_console_handler_does_not_block(capsys):
+    renderer = ConsoleRenderer()
+    handler = TypingConsoleHandler(renderer)
+    record = logging.LogRecord("test", logging.INFO, "", 0, "word " * 50, None, None)
+
+    started_at = time.perf_counter()
+    handler.emit(record)
+    assert time.perf_counter() - started_at < 0.1
+
+    handler.flush()
+    assert capsys.readouterr().out == " ".join(["word"] * 50) + "\n"
+    assert renderer.blocked_time < 1
+    assert renderer.summary().startswith(f"{renderer.blocked_time * 1000:.1f} ms")
+
+
+def test_console_renderer_collapses_backlog(capsys):
+    renderer = ConsoleRenderer(max_backlog=1)
+    messages = [f"message {i} " + "word " * 20 for i in range(10)]
+    for message in messages:
+        renderer.submit(message)
+    renderer.flush(animate=True)
+
+    assert capsys.readouterr().out == "".join(
+        " ".join(message.split()) + "\n" for message in messages
+    )
+    assert renderer.n_collapsed >= 8
+    assert renderer.n_animated + renderer.n_collapsed == len(messages)
@@ -0,0 +1,38 @@
+import pytest
+from pytest_mock import MockerFixture
+
+import autogpt.memory.vector.memory_item as memory_item
+from autogpt.config import Config
+from autogpt.memory.vector.memory_item import MemoryItem
+
+
+@pytest.fixture(autouse=True)
+def mock_summarize_and_embed(mocker: MockerFixture):
+    mocker.patch.object(
+        memory_item, "summarize_text", side_effect=lambda text, *a, **k: (text, None)
+    )
+    mocker.patch.object(
+        memory_item,
+        "get_embedding",
+        side_effect=lambda input, config: (
+            [[0.1, 0.2]] * len(input) if isinstance(input, list) else [0.1, 0.2]
+        ),
+    )
+
+
+def test_from_text_chunks_does_not_share_metadata(config: Config):
+    item_a = MemoryItem.from_text_chunks("A", ["A"], "text_file", config)
+    item_b = MemoryItem.from_text_chunks("B", ["B"], "text_file", config)
+
+    assert item_a.metadata is not item_b.metadata
+    assert item_a.metadata["chunk_hashes"] != item_b.metadata["chunk_hashes"]
+
+
+def test_from_text_chunks_does_not_modify_given_metadata(config: Config):
+    metadata = {"location": "file.txt"}
+
+    item = MemoryItem.from_text_chunks("A", ["A"], "text_file", config, metadata)
+
+    assert metadata == {"location": "file.txt"}
+    assert item.metadata["location"] == "file.txt"
+    assert item.metadata["source_type"] == "text_file"
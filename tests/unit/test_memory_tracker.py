@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from autogpt.agent import Agent
+from autogpt.logs import logger
+from autogpt.logs.memory_tracker import MemoryTracker
+
+
+@pytest.fixture
+def tracker():
+    tracker = MemoryTracker(growth_warning_threshold=1024 * 1024).start()
+    yield tracker
+    tracker.stop()
+
+
+def test_memory_tracker_reports_growth(tracker: MemoryTracker, mocker):
+    warn = mocker.patch.object(logger, "warn")
+    leak = []
+    tracker.add_counter("leak", lambda: len(leak))
+
+    assert tracker.on_cycle(0).label == "Startup"
+    leak.extend(bytearray(1024) for _ in range(4096))
+    report = tracker.on_cycle(1)
+
+    assert str(report).startswith("Cycle 1: ")
+    assert report.growth >= 4 * 1024 * 1024
+    assert __file__ in report.top_growth[0].location
+    assert report.object_counts == {"leak": 4096}
+    warn.assert_called_once()
+    assert "(cycle 1)" in warn.call_args.args[0]
+
+    warn.reset_mock()
+    report = tracker.on_cycle(2)
+    assert report.growth < 1024 * 1024
+    warn.assert_not_called()
+
+
+def test_memory_tracker_counts_agent_objects(
+    tracker: MemoryTracker, agent: Agent, tmp_path
+):
+    agent.history.add("user", "Hello")
+    agent.history.add("assistant", "Hi")
+
+    report = tracker.on_cycle(1, agent)
+
+    assert report.object_counts["history.messages"] == 2
+    assert report.object_counts["history.chars"] == 7
+    assert report.object_counts["memory.items"] == len(agent.memory)
+
+    tracker.save(tmp_path / "memory.jsonl")
+    (line,) = (tmp_path / "memory.jsonl").read_text().splitlines()
+    assert json.loads(line)["cycle"] == 1
@@ -0,0 +1,104 @@
+import pytest
+
+from autogpt.config import Config
+from autogpt.models.base_open_ai_plugin import BaseOpenAIPlugin
+from autogpt.plugins.hooks import PluginHooks
+from autogpt.plugins.lazy_plugin import LazyPlugin
+
+
+class PostCommandPlugin(BaseOpenAIPlugin):
+    def __init__(self):
+        super().__init__(
+            {
+                "manifest": {
+                    "name_for_model": "PostCommand",
+                    "schema_version": "1.0",
+                    "description_for_model": "Handles post_command",
+                },
+                "client": None,
+                "openapi_spec": None,
+            }
+        )
+        self.can_handle_calls = 0
+
+    def can_handle_post_command(self) -> bool:
+        self.can_handle_calls += 1
+        return True
+
+    def post_command(self, command_name: str, response: str) -> str:
+        return f"{response} (post-processed)"
+
+
+@pytest.fixture
+def plugin() -> PostCommandPlugin:
+    return PostCommandPlugin()
+
+
+def test_handlers_are_resolved_once(plugin: PostCommandPlugin):
+    hooks = PluginHooks([plugin])
+
+    assert hooks.handlers("post_command") == [plugin]
+    assert hooks.handlers("post_command") == [plugin]
+    assert hooks.handlers("pre_command") == []
+    assert plugin.can_handle_calls == 1
+
+    hooks.invalidate("post_command")
+    assert hooks.handlers("post_command") == [plugin]
+    assert plugin.can_handle_calls == 2
+
+
+def test_handlers_of_added_plugin_after_invalidate(plugin: PostCommandPlugin):
+    plugins = []
+    hooks = PluginHooks(plugins)
+    assert hooks.handlers("post_command") == []
+
+    plugins.append(plugin)
+    hooks.invalidate()
+
+    assert hooks.handlers("post_command") == [plugin]
+
+
+def test_lazy_plugin_is_created_when_hook_is_dispatched():
+    plugin = LazyPlugin("PostCommandPlugin", lambda: PostCommandPlugin)
+    hooks = PluginHooks([plugin])
+    assert not plugin.lazy_is_loaded
+
+    assert hooks.handlers("post_command") == [plugin]
+    assert plugin.lazy_is_loaded
+
+
+def test_run_records_timings(plugin: PostCommandPlugin):
+    hooks = PluginHooks([plugin])
+
+    for handler in hooks.handlers("post_command"):
+        with hooks.run("post_command", handler):
+            result = handler.post_command("write_file", "done")
+
+    assert result == "done (post-processed)"
+    timing = hooks.timings[("post_command", "PostCommandPlugin")]
+    assert timing.calls == 1
+    assert timing.total_time == timing.max_time > 0
+    assert hooks.summary().startswith("PostCommandPlugin.post_command: 1 calls")
+
+
+def test_plugin_over_budget_is_no_longer_called(plugin: PostCommandPlugin):
+    hooks = PluginHooks([plugin], time_budget=0.0, max_budget_overruns=2)
+
+    for _ in range(2):
+        handlers = hooks.handlers("post_command")
+        assert handlers == [plugin]
+        with hooks.run("post_command", plugin):
+            plugin.post_command("write_file", "done")
+
+    assert hooks.handlers("post_command") == []
+    assert hooks.timings[("post_command", "PostCommandPlugin")].budget_overruns == 2
+
+
+def test_config_plugin_hooks_follow_plugins(config: Config, plugin):
+    hooks = config.plugin_hooks
+    assert config.plugin_hooks is hooks
+
+    config.plugins = [plugin]
+
+    assert config.plugin_hooks is not hooks
+    assert config.plugin_hooks.handlers("post_command") == [plugin]
@@ -1,9 +1,21 @@
 import os
+import shutil
+from pathlib import Path
 
+import pytest
+import requests
 import yaml
+from pytest_mock import MockerFixture
 
+from autogpt import plugins
 from autogpt.config.config import Config
-from autogpt.plugins import inspect_zip_for_modules, scan_plugins
+from autogpt.plugins import (
+    PLUGIN_REQUEST_TIMEOUT,
+    fetch_openai_plugins_manifest_and_spec,
+    inspect_zip_for_modules,
+    scan_plugins,
+)
+from autogpt.plugins.lazy_plugin import LazyPlugin
 from autogpt.plugins.plugin_config import PluginConfig
 from autogpt.plugins.plugins_config import PluginsConfig
 
@@ -59,6 +71,95 @@ def test_scan_plugins_not_enabled(config: Config):
     assert "AutoGPTPVicuna" not in plugin_class_names
 
 
+def test_scan_plugins_defers_instantiation(config: Config):
+    plugins_config = config.plugins_config
+    plugins_config.plugins["AutoGPTPVicuna"] = PluginConfig(
+        name="AutoGPTPVicuna", enabled=True
+    )
+
+    (plugin,) = scan_plugins(config)
+
+    assert isinstance(plugin, LazyPlugin)
+    assert not plugin.lazy_is_loaded
+    assert plugin.__class__.__name__ == "AutoGPTPVicuna"
+    assert not plugin.lazy_is_loaded
+    assert plugin._name == "Auto-GPT-Vicuna"
+    assert plugin.lazy_is_loaded
+
+
+def test_scan_plugins_caches_plugin_classes(
+    config: Config, mocker: MockerFixture, tmp_path
+):
+    shutil.copy(f"{PLUGINS_TEST_DIR}/{PLUGIN_TEST_ZIP_FILE}", tmp_path)
+    config.plugins_dir = str(tmp_path)
+    config.plugins_config.plugins["AutoGPTPVicuna"] = PluginConfig(
+        name="AutoGPTPVicuna", enabled=True
+    )
+    scan_plugins(config)
+    assert Path(config.plugins_cache_file).exists()
+
+    inspect_zip = mocker.spy(plugins, "inspect_zip_for_modules")
+    result = scan_plugins(config)
+
+    assert [plugin.__class__.__name__ for plugin in result] == ["AutoGPTPVicuna"]
+    inspect_zip.assert_not_called()
+
+    # A changed plugin is inspected again
+    with open(tmp_path / PLUGIN_TEST_ZIP_FILE, "ab") as f:
+        f.write(b"\0")
+    result = scan_plugins(config)
+
+    assert [plugin.__class__.__name__ for plugin in result] == ["AutoGPTPVicuna"]
+    inspect_zip.assert_called_once()
+
+
+def test_scan_plugins_caches_in_plugins_dir_by_default(config: Config, tmp_path):
+    shutil.copy(f"{PLUGINS_TEST_DIR}/{PLUGIN_TEST_ZIP_FILE}", tmp_path)
+    config.plugins_dir = str(tmp_path)
+    config.plugins_cache_file = None
+    config.plugins_config.plugins["AutoGPTPVicuna"] = PluginConfig(
+        name="AutoGPTPVicuna", enabled=True
+    )
+    scan_plugins(config)
+
+    assert (tmp_path / ".plugins_cache.json").exists()
+
+
+def test_fetch_openai_plugins_with_timeout(
+    config: Config, mocker: MockerFixture, tmp_path
+):
+    config.plugins_dir = str(tmp_path)
+    config.plugins_openai = ["https://a.example.com", "https://b.example.com"]
+    get = mocker.patch.object(
+        requests, "get", side_effect=requests.exceptions.Timeout("timed out")
+    )
+
+    assert fetch_openai_plugins_manifest_and_spec(config) == {}
+    assert get.call_count == 2
+    for call in get.call_args_list:
+        assert call.kwargs["timeout"] == PLUGIN_REQUEST_TIMEOUT
+
+
+@pytest.mark.parametrize(
+    "response_json",
+    [
+        {"side_effect": ValueError("Expecting value")},
+        {"return_value": {"api": {"type": "openapi"}}},
+        {"return_value": {"schema_version": "v1"}},
+    ],
+)
+def test_fetch_openai_plugins_with_invalid_manifest(
+    config: Config, mocker: MockerFixture, tmp_path, response_json: dict
+):
+    config.plugins_dir = str(tmp_path)
+    config.plugins_openai = ["https://a.example.com"]
+    response = mocker.Mock(status_code=200)
+    response.json = mocker.Mock(**response_json)
+    mocker.patch.object(requests, "get", return_value=response)
+
+    assert fetch_openai_plugins_manifest_and_spec(config) == {}
+
+
 def test_inspect_zip_for_modules():
     result = inspect_zip_for_modules(str(f"{PLUGINS_TEST_DIR}/{PLUGIN_TEST_ZIP_FILE}"))
     assert result == [PLUGIN_TEST_INIT_PY]
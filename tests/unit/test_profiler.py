@@ -0,0 +1,67 @@
+import time
+
+from pytest_mock import MockerFixture
+
+from autogpt.logs import logger
+from autogpt.logs.profiler import SamplingProfiler
+
+
+def busy_wait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def execute_command(command_name: str) -> None:
+    busy_wait(0.2)
+
+
+def chat_with_ai() -> None:
+    busy_wait(0.1)
+
+
+class FakeAgent:
+    cycle_count = 3
+
+    def start_interaction_loop(self):
+        chat_with_ai()
+        execute_command(command_name="write_to_file")
+
+
+def test_profiler_tags_samples(tmp_path):
+    with SamplingProfiler(interval=0.002) as profiler:
+        FakeAgent().start_interaction_loop()
+
+    phases = {key.phase for key in profiler.samples}
+    assert {"prompt_build", "command"} <= phases
+    assert {key.cycle for key in profiler.samples if key.phase != "agent"} == {3}
+    assert {key.command for key in profiler.samples if key.phase == "command"} == {
+        "write_to_file"
+    }
+
+    collapsed = profiler.collapsed_stacks()
+    assert any(
+        line.startswith("cycle 3;command;write_to_file;")
+        and f"{__name__}:execute_command;" in line
+        for line in collapsed
+    )
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in collapsed)
+
+    summary = profiler.summary()
+    assert "prompt_build" in summary
+    assert "write_to_file" in summary
+
+    paths = profiler.save(tmp_path)
+    assert all(path.exists() for path in paths)
+
+
+def test_profiler_stop_and_save_logs_summary(tmp_path, mocker: MockerFixture):
+    info = mocker.patch.object(logger, "info")
+    profiler = SamplingProfiler(interval=0.002).start()
+    busy_wait(0.05)
+
+    profiler.stop_and_save(tmp_path, "test")
+
+    assert (tmp_path / "test.summary.txt").exists()
+    assert info.call_args_list[0].args == (f"\n{profiler.summary()}", "CPU PROFILE:")
+    assert str(tmp_path / "test.collapsed") in info.call_args_list[1].args[0]
@@ -0,0 +1,94 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from autogpt.config.ai_config import AIConfig
+from autogpt.llm import prompt_cache
+from autogpt.llm.prompt_cache import PromptCache
+from autogpt.models.command import Command, CommandParameter
+from autogpt.models.command_registry import CommandRegistry
+
+MODEL = "gpt-3.5-turbo"
+
+
+@pytest.fixture
+def command() -> Command:
+    return Command(
+        name="example",
+        description="Example command",
+        method=lambda arg1: arg1,
+        parameters=[CommandParameter("arg1", "int", "Argument 1", True)],
+    )
+
+
+@pytest.fixture
+def count_tokens(mocker: MockerFixture):
+    """Count characters instead of tokens, to not depend on the tokenizer"""
+    mocker.patch.object(
+        prompt_cache,
+        "count_message_tokens",
+        side_effect=lambda message, model: len(message.content) + 7,
+    )
+    return mocker.patch.object(
+        prompt_cache,
+        "count_openai_functions_tokens",
+        side_effect=lambda functions, model: 10 * len(functions),
+    )
+
+
+def test_command_registry_version(command: Command):
+    registry = CommandRegistry()
+    assert registry.version == 0
+
+    registry.register(command)
+    assert registry.version == 1
+
+    registry.unregister(command)
+    assert registry.version == 2
+
+
+def test_ai_config_version():
+    ai_config = AIConfig("Name", "Role", ["Goal"])
+    version = ai_config.version
+
+    ai_config.ai_goals = ["Goal", "Another goal"]
+    assert ai_config.version == version + 1
+
+    ai_config.unrelated = True
+    assert ai_config.version == version + 1
+
+
+def test_prompt_cache_reuses_static_prompt(count_tokens, command: Command):
+    registry = CommandRegistry()
+    registry.register(command)
+    ai_config = AIConfig("Name", "Role", ["Goal"])
+    cache = PromptCache()
+
+    prompt = cache.get("System prompt", MODEL, registry, ai_config, True)
+
+    assert prompt.system_message.content == "System prompt"
+    assert prompt.system_tokens == len("System prompt") + 7
+    assert [f.name for f in prompt.functions] == ["example"]
+    assert prompt.functions_tokens == 10
+    assert cache.get("System prompt", MODEL, registry, ai_config, True) is prompt
+    assert (cache.hits, cache.misses) == (1, 1)
+    count_tokens.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda registry, ai_config, command: registry.unregister(command),
+        lambda registry, ai_config, command: setattr(ai_config, "ai_role", "Other"),
+    ],
+)
+def test_prompt_cache_is_invalidated_by_changes(count_tokens, command, change):
+    registry = CommandRegistry()
+    registry.register(command)
+    ai_config = AIConfig("Name", "Role", ["Goal"])
+    cache = PromptCache()
+    prompt = cache.get("System prompt", MODEL, registry, ai_config, True)
+
+    change(registry, ai_config, command)
+
+    assert cache.get("System prompt", MODEL, registry, ai_config, True) is not prompt
+    assert cache.misses == 2
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from autogpt.config import Config
+from autogpt.json_utils.response_parser import (
+    PARSE_FAILED,
+    PARSED_AFTER_REPAIR,
+    PARSED_AS_JSON,
+    PARSED_AS_PYTHON_LITERAL,
+    get_response_validator,
+    load_response_schema,
+    parse_response,
+)
+from autogpt.json_utils.utilities import LLM_DEFAULT_RESPONSE_FORMAT, validate_json
+
+REPLY = {
+    "thoughts": {"text": "thought", "reasoning": "reasoning", "speak": "speak"},
+    "command": {"name": "google", "args": {"query": "true, false and null"}},
+    "done": False,
+    "result": None,
+}
+
+
+@pytest.mark.parametrize(
+    "response_content, method, repairs",
+    [
+        (json.dumps(REPLY), PARSED_AS_JSON, []),
+        (f"```json\n{json.dumps(REPLY)}\n```", PARSED_AFTER_REPAIR, ["code_block"]),
+        (
+            f"Here is my reply:\n{json.dumps(REPLY)}\nLet me know!",
+            PARSED_AFTER_REPAIR,
+            ["surrounding_text"],
+        ),
+        (
+            json.dumps(REPLY, indent=2).replace('"\n', '",\n').replace("}\n", "},\n"),
+            PARSED_AFTER_REPAIR,
+            ["trailing_commas"],
+        ),
+        (str(REPLY), PARSED_AS_PYTHON_LITERAL, []),
+        (f"```{REPLY}```", PARSED_AS_PYTHON_LITERAL, ["code_block"]),
+    ],
+)
+def test_parse_response(response_content: str, method: str, repairs: list[str]):
+    parsed = parse_response(response_content)
+
+    assert parsed.ok
+    assert parsed.content == REPLY
+    assert parsed.method == method
+    assert parsed.repairs == repairs
+
+
+@pytest.mark.parametrize(
+    "response_content", ["", "I can't do that", "[1, 2, 3]", '{"text": "unclosed}']
+)
+def test_parse_response_failed(response_content: str):
+    parsed = parse_response(response_content)
+
+    assert not parsed.ok
+    assert parsed.method == PARSE_FAILED
+    assert parsed.content == {}
+    assert parsed.error
+
+
+def test_response_validator_is_compiled_once_per_variant():
+    validator = get_response_validator(LLM_DEFAULT_RESPONSE_FORMAT, False)
+
+    assert get_response_validator(LLM_DEFAULT_RESPONSE_FORMAT, False) is validator
+    functions_validator = get_response_validator(LLM_DEFAULT_RESPONSE_FORMAT, True)
+    assert functions_validator is not validator
+    assert "command" not in functions_validator.schema["properties"]
+    assert "command" in validator.schema["properties"]
+
+
+def test_load_response_schema_returns_a_copy():
+    schema = load_response_schema(LLM_DEFAULT_RESPONSE_FORMAT, False)
+    schema["required"].clear()
+
+    assert load_response_schema(LLM_DEFAULT_RESPONSE_FORMAT, False)["required"]
+
+
+def test_validate_json_with_openai_functions(config: Config, mocker):
+    reply = {"thoughts": {k: "..." for k in ("text", "reasoning", "plan")}}
+    reply["thoughts"] |= {"criticism": "...", "speak": "..."}
+
+    mocker.patch.object(config, "openai_functions", True)
+    assert validate_json(reply, config)
+
+    mocker.patch.object(config, "openai_functions", False)
+    assert not validate_json(reply, config)
@@ -1,13 +1,23 @@
 import json
 import tempfile
-from unittest import TestCase
+from unittest import TestCase, mock
 from xml.etree import ElementTree
 
 import docx
 import yaml
 from bs4 import BeautifulSoup
 
-from autogpt.commands.file_operations_utils import is_file_binary_fn, read_textual_file
+from autogpt.commands.file_operations_utils import (
+    BINARY_SNIFF_LENGTH,
+    CHARSET_SAMPLE_SIZE,
+    ParserStrategy,
+    TXTParser,
+    charset_normalizer,
+    encoding_cache,
+    is_file_binary_fn,
+    read_textual_file,
+    read_textual_file_segments,
+)
 from autogpt.logs import logger
 
 plain_text_str = "Hello, world!"
@@ -148,3 +158,77 @@ class TestConfig(TestCase):
             self.assertIn(plain_text_str, loaded_text)
             should_be_binary = file_extension in binary_files_extensions
             self.assertEqual(should_be_binary, is_file_binary_fn(created_filepath))
+
+    def test_docx_segments(self):
+        with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".docx") as f:
+            document = docx.Document()
+            document.add_paragraph("First paragraph")
+            document.add_paragraph("Second paragraph")
+            document.save(f.name)
+
+        segments = list(read_textual_file_segments(f.name, logger))
+        self.assertEqual(["First paragraph", "Second paragraph"], segments)
+        self.assertEqual("".join(segments), read_textual_file(f.name, logger))
+
+    def test_parser_without_read_raises(self):
+        class IncompleteParser(ParserStrategy):
+            pass
+
+        for read in (
+            IncompleteParser().read,
+            lambda path: list(IncompleteParser().read_segments(path)),
+        ):
+            with self.assertRaisesRegex(NotImplementedError, "IncompleteParser"):
+                read("file.txt")
+
+    def test_binary_sniffing_reads_prefix_only(self):
+        with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".log") as f:
+            f.write(b"a" * BINARY_SNIFF_LENGTH + b"\x00")
+        self.assertFalse(is_file_binary_fn(f.name))
+
+        with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".log") as f:
+            f.write(b"a\x00" + b"a" * BINARY_SNIFF_LENGTH)
+        self.assertTrue(is_file_binary_fn(f.name))
+
+    def test_txt_parser_encodings(self):
+        text = "Grüße, world!"
+        for data in [
+            text.encode("utf-8"),
+            text.encode("utf-8-sig"),
+            text.encode("utf-16"),
+            text.encode("utf-32"),
+        ]:
+            with tempfile.NamedTemporaryFile(mode="wb", delete=False) as f:
+                f.write(data)
+            self.assertEqual(text, TXTParser().read(f.name))
+
+    def test_txt_parser_detects_other_encodings_once(self):
+        encoding_cache.clear()
+        text = "Les élèves étaient très contents de leur journée à la plage. " * 2000
+        with tempfile.NamedTemporaryFile(mode="wb", delete=False) as f:
+            f.write(text.encode("cp1252"))
+
+        # Detection on a sample must give the same result as on the whole file
+        expected_text = str(charset_normalizer.from_path(f.name).best())
+        with mock.patch.object(
+            charset_normalizer, "from_bytes", wraps=charset_normalizer.from_bytes
+        ) as from_bytes:
+            self.assertEqual(expected_text, TXTParser().read(f.name))
+            self.assertEqual(expected_text, TXTParser().read(f.name))
+
+        from_bytes.assert_called_once()
+        self.assertEqual(CHARSET_SAMPLE_SIZE, len(from_bytes.call_args.args[0]))
+
+    def test_txt_parser_detects_encoding_after_ascii_prefix(self):
+        encoding_cache.clear()
+        ascii_text = "The quick brown fox jumps over the lazy dog.\n" * 3000
+        text = ascii_text + "Les élèves étaient très contents de leur journée.\n" * 50
+        with tempfile.NamedTemporaryFile(mode="wb", delete=False) as f:
+            f.write(text.encode("cp1252"))
+        self.assertGreater(len(ascii_text), CHARSET_SAMPLE_SIZE)
+
+        # Detection on a sample must give the same result as on the whole file
+        expected_text = str(charset_normalizer.from_path(f.name).best())
+        result = TXTParser().read(f.name)
+        self.assertEqual(expected_text, result)
+        self.assertNotIn("\ufffd", result)
@@ -0,0 +1,55 @@
+import pytest
+
+from autogpt.processing.text import chunk_text_stream, truncate_text
+
+
+class CharTokenizer:
+    """Tokenizer stand-in that maps every character to one token"""
+
+    def encode(self, text: str) -> list[int]:
+        return [ord(c) for c in text]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(chr(t) for t in tokens)
+
+
+@pytest.fixture(autouse=True)
+def char_tokenizer(mocker):
+    mocker.patch(
+        "autogpt.processing.text.tiktoken.encoding_for_model",
+        return_value=CharTokenizer(),
+    )
+
+
+def test_chunk_text_stream_splits_across_segments():
+    chunks = list(
+        chunk_text_stream(
+            ["abcd", "efgh", "ij"], "gpt-3.5-turbo", max_chunk_length=4, overlap=1
+        )
+    )
+
+    assert chunks == [("abcd", 4), ("defg", 4), ("ghij", 4)]
+
+
+def test_chunk_text_stream_skips_trailing_overlap():
+    chunks = list(
+        chunk_text_stream(["abcde"], "gpt-3.5-turbo", max_chunk_length=4, overlap=2)
+    )
+
+    assert chunks == [("abcd", 4), ("cde", 3)]
+    assert list(
+        chunk_text_stream(["abcdef"], "gpt-3.5-turbo", max_chunk_length=4, overlap=2)
+    ) == [("abcd", 4), ("cdef", 4)]
+
+
+def test_chunk_text_stream_short_text():
+    assert list(chunk_text_stream(["ab", "c"], "gpt-3.5-turbo", 10)) == [("abc", 3)]
+    assert list(chunk_text_stream([], "gpt-3.5-turbo", 10)) == []
+
+
+def test_truncate_text_keeps_head_and_tail():
+    assert truncate_text("abcdefghij", "gpt-3.5-turbo", 10) == "abcdefghij"
+    assert (
+        truncate_text("abcdefghij", "gpt-3.5-turbo", 4)
+        == "ab\n... [6 tokens omitted] ...\nij"
+    )
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from autogpt.logs.tracing import NOOP_SPAN, Tracer
+
+
+@pytest.fixture
+def tracer() -> Tracer:
+    tracer = Tracer()
+    tracer.enable()
+    return tracer
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+
+    @tracer.traced()
+    def f():
+        tracer.current_span().set_attribute("key", "value")
+        return 1
+
+    with tracer.span("outer", key="value") as span:
+        assert span is NOOP_SPAN
+        assert f() == 1
+
+    assert tracer.spans == []
+
+
+def test_spans_are_nested(tracer: Tracer):
+    @tracer.traced("inner")
+    def inner():
+        tracer.current_span().set_attribute("command", "test")
+
+    cycle_span = tracer.span("cycle", cycle=1).start()
+    with tracer.span("outer"):
+        inner()
+    cycle_span.end()
+
+    inner_span, outer_span, cycle = tracer.spans
+    assert inner_span.parent_id == outer_span.span_id
+    assert outer_span.parent_id == cycle.span_id
+    assert cycle.parent_id is None
+    assert inner_span.attributes == {"command": "test"}
+    assert cycle.attributes == {"cycle": 1}
+    assert cycle.duration_ms >= outer_span.duration_ms >= inner_span.duration_ms
+    assert tracer.current_span() is NOOP_SPAN
+
+
+def test_span_records_error(tracer: Tracer):
+    with pytest.raises(ValueError):
+        with tracer.span("failing"):
+            raise ValueError()
+
+    assert tracer.spans[0].attributes["error"] == "ValueError"
+
+
+def test_tracer_exports(tracer: Tracer, tmp_path):
+    with tracer.span("outer", model="gpt-4"):
+        with tracer.span("inner"):
+            pass
+
+    tracer.export(tmp_path / "trace.json")
+    tracer.export(tmp_path / "trace.jsonl")
+
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    assert [e["name"] for e in trace["traceEvents"]] == ["inner", "outer"]
+    assert trace["traceEvents"][1]["ph"] == "X"
+    assert trace["traceEvents"][1]["args"] == {"model": "gpt-4"}
+
+    lines = (tmp_path / "trace.jsonl").read_text().splitlines()
+    spans = [json.loads(line) for line in lines]
+    assert spans[0]["parent_id"] == spans[1]["id"]
+    assert spans[1]["attributes"] == {"model": "gpt-4"}
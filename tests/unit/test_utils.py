@@ -6,6 +6,7 @@ import requests
 
 from autogpt.config import Config
 from autogpt.json_utils.utilities import extract_json_from_response, validate_json
+from autogpt.logs import logger
 from autogpt.utils import (
     get_bulletin_from_web,
     get_current_git_branch,
@@ -206,3 +207,26 @@ def test_extract_json_from_response_wrapped_in_code_block(valid_json_response: d
     assert (
         extract_json_from_response(emulated_response_from_openai) == valid_json_response
     )
+
+
+@pytest.mark.parametrize(
+    "response, expected_log",
+    [
+        ("{'a': True}", "Parsed JSON response as python_literal"),
+        ('Reply: {"a": 1,}', "after repairing: surrounding_text, trailing_commas"),
+    ],
+)
+def test_extract_json_from_response_logs_slow_parse(response, expected_log, mocker):
+    debug = mocker.patch.object(logger, "debug")
+
+    assert extract_json_from_response(response)
+
+    assert expected_log in debug.call_args.args[0]
+
+
+def test_extract_json_from_response_does_not_log_fast_parse(mocker):
+    debug = mocker.patch.object(logger, "debug")
+
+    assert extract_json_from_response('{"a": 1}') == {"a": 1}
+
+    debug.assert_not_called()
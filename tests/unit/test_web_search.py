@@ -4,7 +4,38 @@ import pytest
 from googleapiclient.errors import HttpError
 
 from autogpt.agent.agent import Agent
-from autogpt.commands.web_search import google, safe_google_results, web_search
+from autogpt.commands.web_search import (
+    google,
+    safe_google_results,
+    web_search,
+    web_search_batch,
+)
+from autogpt.commands.web_search_utils import (
+    SearchBackend,
+    SearchResultCache,
+    search,
+    search_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_search_cache():
+    search_cache.clear()
+    yield
+    search_cache.clear()
+
+
+class StubSearchBackend(SearchBackend):
+    def __init__(self, name: str, results: dict[str, list[dict]]):
+        self.name = name
+        self.results = results
+        self.calls = []
+
+    def search(self, query: str, num_results: int) -> list[dict]:
+        self.calls.append(query)
+        if query not in self.results:
+            raise RuntimeError(f"No stub results for '{query}'")
+        return self.results[query][:num_results]
 
 
 @pytest.mark.parametrize(
@@ -41,7 +72,7 @@ def test_google_search(
     mock_ddg = mocker.Mock()
     mock_ddg.return_value = return_value
 
-    mocker.patch("autogpt.commands.web_search.DDGS.text", mock_ddg)
+    mocker.patch("autogpt.commands.web_search_utils.DDGS.text", mock_ddg)
     actual_output = web_search(query, agent=agent, num_results=num_results)
     expected_output = safe_google_results(expected_output)
     assert actual_output == expected_output
@@ -134,3 +165,97 @@ def test_google_official_search_errors(
     mock_googleapiclient.side_effect = error
     actual_output = google(query, agent=agent, num_results=num_results)
     assert actual_output == safe_google_results(expected_output)
+
+
+def test_search_merges_and_deduplicates_by_url():
+    backend_a = StubSearchBackend(
+        "a",
+        {
+            "q1": [
+                {"href": "https://example.com/1"},
+                {"href": "https://example.com/2"},
+            ],
+            "q2": [
+                {"href": "https://example.com/2"},
+                {"href": "https://example.com/3"},
+            ],
+        },
+    )
+    backend_b = StubSearchBackend(
+        "b",
+        {
+            "q1": [
+                {"link": "https://example.com/1"},
+                {"link": "https://example.com/4"},
+            ],
+            "q2": [],
+        },
+    )
+
+    results = search(["q1", "q2"], [backend_a, backend_b], cache=SearchResultCache())
+
+    assert [r.get("href") or r.get("link") for r in results] == [
+        "https://example.com/1",
+        "https://example.com/2",
+        "https://example.com/4",
+        "https://example.com/3",
+    ]
+
+
+def test_search_skips_failing_backend():
+    working = StubSearchBackend("working", {"q": [{"href": "https://example.com"}]})
+    failing = StubSearchBackend("failing", {})
+
+    results = search(["q"], [working, failing], cache=SearchResultCache())
+
+    assert results == [{"href": "https://example.com"}]
+    assert failing.calls == ["q"]
+
+
+def test_search_runs_every_query_on_backends_iterator():
+    backend = StubSearchBackend(
+        "stub",
+        {
+            "q1": [{"href": "https://example.com/1"}],
+            "q2": [{"href": "https://example.com/2"}],
+        },
+    )
+
+    results = search(["q1", "q2"], iter([backend]), cache=SearchResultCache())
+
+    assert len(results) == 2
+    assert sorted(backend.calls) == ["q1", "q2"]
+
+
+def test_search_caches_per_backend_and_query(mocker):
+    backend = StubSearchBackend("stub", {"q": [{"href": "https://example.com"}]})
+    cache = SearchResultCache(ttl=60)
+
+    search(["q", "q"], [backend], cache=cache)
+    search(["q"], [backend], cache=cache)
+    assert backend.calls == ["q"]
+
+    # Expire the cached entry
+    mocker.patch(
+        "autogpt.commands.web_search_utils.time.monotonic", return_value=10**9
+    )
+    search(["q"], [backend], cache=cache)
+    assert backend.calls == ["q", "q"]
+
+
+def test_web_search_batch(mocker, agent: Agent):
+    backend = StubSearchBackend(
+        "stub",
+        {
+            "test1": [{"href": "https://example.com/1"}],
+            "test2": [{"href": "https://example.com/1"}],
+        },
+    )
+    mocker.patch(
+        "autogpt.commands.web_search.get_search_backends", return_value=[backend]
+    )
+
+    actual_output = web_search_batch("test1\ntest2\n", agent=agent)
+
+    assert json.loads(actual_output) == [{"href": "https://example.com/1"}]
+    assert sorted(backend.calls) == ["test1", "test2"]